@@ -7,15 +7,24 @@ This script provides comprehensive monitoring and alerting for the automated pos
 import os
 import sys
 import json
+import sqlite3
 import requests
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Add the shared src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from devto.session import api_base_url, get_session
+from posting.sqlite_state import SqlitePostedArticles
+from posting.state import open_state_store, state_backend
+
 # Configuration
 STATE_FILE = "dev_posting_state.json"
 CONFIG_FILE = ".github/workflows/posting_config.json"
 BLOG_CONTENT_DIR = "blog_content"
-DEV_API_URL = "https://dev.to/api/articles"
+DEV_API_BASE_URL = api_base_url()
+DEV_API_URL = f"{DEV_API_BASE_URL}/articles"
 
 class HealthChecker:
     def __init__(self):
@@ -32,6 +41,18 @@ class HealthChecker:
             if self.status == "HEALTHY":
                 self.status = "WARNING"
     
+    def load_state(self):
+        """Load the posting state read-only from the configured backend (None if there is none yet)"""
+        if state_backend() == "sqlite":
+            store = open_state_store(STATE_FILE, read_only=True)
+            return store.load() if os.path.exists(store.state_file) else None
+
+        if not os.path.exists(STATE_FILE):
+            return None
+        # The snapshot plus the replayed journal, as the posting scripts see it; the
+        # store only takes the shared lock if it is free, so a posting run is never held up
+        return open_state_store(STATE_FILE).load()
+
     def check_environment(self):
         """Check basic environment and file structure"""
         print("🔍 Checking environment...")
@@ -94,13 +115,11 @@ class HealthChecker:
         """Check state file integrity and content"""
         print("🔍 Checking state integrity...")
         
-        if not os.path.exists(STATE_FILE):
-            print("ℹ️ No state file exists - will be created on first run")
-            return
-        
         try:
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
+            state = self.load_state()
+            if state is None:
+                print("ℹ️ No state file exists - will be created on first run")
+                return
             
             # Check required fields
             required_fields = ["last_post_time", "posted_articles", "current_index", "total_posts"]
@@ -109,7 +128,7 @@ class HealthChecker:
                     self.add_issue("WARNING", f"Missing field in state file: {field}")
             
             # Check data types
-            if not isinstance(state.get("posted_articles"), list):
+            if not isinstance(state.get("posted_articles"), (list, SqlitePostedArticles)):
                 self.add_issue("CRITICAL", "Invalid 'posted_articles' format in state file")
             
             if not isinstance(state.get("current_index"), int):
@@ -133,6 +152,8 @@ class HealthChecker:
             
         except json.JSONDecodeError:
             self.add_issue("CRITICAL", "State file is corrupted (invalid JSON)")
+        except sqlite3.DatabaseError as e:
+            self.add_issue("CRITICAL", f"State database is corrupted: {e}")
         except Exception as e:
             self.add_issue("WARNING", f"Error reading state file: {e}")
     
@@ -148,7 +169,7 @@ class HealthChecker:
         try:
             # Test with a simple GET request to user endpoint
             headers = {"api-key": api_key}
-            response = requests.get("https://dev.to/api/users/me", headers=headers, timeout=10)
+            response = get_session().get(f"{DEV_API_BASE_URL}/users/me", headers=headers, timeout=10)
             
             if response.status_code == 200:
                 user_data = response.json()
@@ -172,13 +193,11 @@ class HealthChecker:
         """Check if posting is happening at expected frequency"""
         print("🔍 Checking posting frequency...")
         
-        if not os.path.exists(STATE_FILE):
-            print("ℹ️ No posting history to analyze")
-            return
-        
         try:
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
+            state = self.load_state()
+            if state is None:
+                print("ℹ️ No posting history to analyze")
+                return
             
             posted_articles = state.get("posted_articles", [])
             if not posted_articles:
@@ -202,13 +221,14 @@ class HealthChecker:
                 except ValueError:
                     self.add_issue("WARNING", "Invalid date format in last_post_time")
             
-            # Check posting rate over last week
+            # Check posting rate over last week (an indexed query with the SQLite backend)
             if len(posted_articles) >= 7:
-                recent_posts = posted_articles[-14:]  # Last 14 posts (should be ~1 week at 2/day)
+                week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+                recent_posts = posted_articles.posted_since(week_ago)  # ~14 expected at 2/day
                 if len(recent_posts) < 10:  # Less than ~5 days of posting
                     self.add_issue("WARNING", "Posting frequency appears to be below expected rate")
                 else:
-                    print(f"✅ Posting frequency normal - {len(recent_posts)} recent posts")
+                    print(f"✅ Posting frequency normal - {len(recent_posts)} posts in the last week")
             
         except Exception as e:
             self.add_issue("WARNING", f"Error analyzing posting frequency: {e}")
@@ -6,46 +6,73 @@ Run this to check the status and health of the posting workflow
 
 import os
 import json
+import sqlite3
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Add the shared src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from posting.locking import state_lock
+from posting.state import open_state_store, state_backend
+
 def check_state_file():
     """Check if state file exists and is valid"""
     state_file = "dev_posting_state.json"
     backup_file = "dev_posting_state_backup.json"
     
     print("=== State File Health ===")
-    
-    # Check primary state file
-    if os.path.exists(state_file):
-        try:
-            with open(state_file, 'r') as f:
-                state = json.load(f)
-            print(f"✓ Primary state file: VALID")
-            print(f"  - Posted articles: {len(state.get('posted_articles', []))}")
-            print(f"  - Current index: {state.get('current_index', 0)}")
-            print(f"  - Total posts: {state.get('total_posts', 0)}")
-            print(f"  - Last post: {state.get('last_post_time', 'Never')}")
-            return True
-        except json.JSONDecodeError:
-            print(f"✗ Primary state file: CORRUPTED")
-    else:
-        print(f"✗ Primary state file: MISSING")
-    
-    # Check backup state file
-    if os.path.exists(backup_file):
-        try:
-            with open(backup_file, 'r') as f:
-                state = json.load(f)
-            print(f"✓ Backup state file: VALID")
-            return True
-        except json.JSONDecodeError:
-            print(f"✗ Backup state file: CORRUPTED")
+
+    if state_backend() == "sqlite":
+        return check_state_database(state_file)
+    
+    # Report a posting run in progress without waiting for it; the state file
+    # is replaced atomically, so reading it during a run is safe
+    with state_lock(state_file).shared(timeout=0, required=False) as locked:
+        if not locked:
+            print("  - A posting run is in progress")
+
+    # Load like the posting scripts do: the snapshot (or its backup) with the
+    # journal replayed, so changes made since the last checkpoint are counted
+    store = open_state_store(state_file, backup_file=backup_file)
+    state = store.load()
+    if store.loaded_from is None:
+        print(f"✗ Primary state file: {'CORRUPTED' if os.path.exists(state_file) else 'MISSING'}")
+        print(f"✗ Backup state file: {'CORRUPTED' if os.path.exists(backup_file) else 'MISSING'}")
+        return False
+
+    if store.loaded_from == state_file:
+        print(f"✓ Primary state file: VALID")
     else:
-        print(f"✗ Backup state file: MISSING")
-    
-    return False
+        print(f"✗ Primary state file: {'CORRUPTED' if os.path.exists(state_file) else 'MISSING'}")
+        print(f"✓ Backup state file: VALID")
+    print(f"  - Posted articles: {len(state['posted_articles'])}")
+    print(f"  - Current index: {state.get('current_index', 0)}")
+    print(f"  - Total posts: {state.get('total_posts', 0)}")
+    print(f"  - Last post: {state.get('last_post_time') or 'Never'}")
+    return True
+
+def check_state_database(state_file):
+    """Check the SQLite state database (DEV_STATE_BACKEND=sqlite) without loading the history"""
+    store = open_state_store(state_file, read_only=True)
+    if not os.path.exists(store.state_file):
+        print(f"✗ State database: MISSING")
+        return False
+
+    try:
+        state = store.load()
+        print(f"✓ State database: VALID")
+        print(f"  - Posted articles: {len(state['posted_articles'])}")
+        print(f"  - Current index: {state.get('current_index', 0)}")
+        print(f"  - Total posts: {state.get('total_posts', 0)}")
+        print(f"  - Last post: {state.get('last_post_time') or 'Never'}")
+        return True
+    except sqlite3.DatabaseError as e:
+        print(f"✗ State database: CORRUPTED ({e})")
+        return False
+    finally:
+        store.close()
 
 def check_config_file():
     """Check configuration file"""
@@ -28,23 +28,63 @@ import os
 import sys
 import json
 import time
-import random
+import argparse
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
+# Add the shared src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from devto.inventory import ArticleInventory, find_recent_article
+from devto.ratelimit import DEFAULT_BUDGETS, parse_retry_after
+from devto.session import api_base_url, configure_session, get_session
+from posting.manifest import find_blog_posts
+from posting.metadata import content_metadata
+from posting.pipeline import PreparationPipeline
+from posting.retry import RetryScheduler, TransientPostingError
+from posting.rotation import RotationPlan
+from posting.idempotency import CreateJournal, article_fingerprint
+from posting.locking import LockTimeout
+from posting.metrics import RunMetrics
+from posting.profiling import add_profile_arguments, profiled
+from posting.selector import DEFAULT_AGE_WEIGHT, DEFAULT_RECENCY_WEIGHT, CategoryBalancedSelector
+from posting.state import open_state_store
+
 # Configuration
 STATE_FILE = "dev_posting_state.json"
-BLOG_CONTENT_DIR = "blog_content"
-CONFIG_FILE = ".github/workflows/posting_config.json"
-DEV_API_URL = "https://dev.to/api/articles"
+BACKUP_STATE_FILE = "dev_posting_state_backup.json"
+STATE_JOURNAL_FILE = "dev_posting_state.journal"
+BLOG_CONTENT_DIR = os.environ.get("DEV_BLOG_CONTENT_DIR", "blog_content")
+CONFIG_FILE = os.environ.get("DEV_POSTING_CONFIG", ".github/workflows/posting_config.json")
+INVENTORY_FILE = "devto_inventory.json"
+MANIFEST_FILE = "blog_content_manifest.json"
+DEV_API_BASE_URL = api_base_url()   # DEV_API_BASE_URL points the run at another server, e.g. the emulator
+DEV_API_URL = f"{DEV_API_BASE_URL}/articles"
 API_KEY = os.environ.get("DEV_TO_API_KEY", "")
 
-# Rate limiting configuration
-MAX_RETRIES = 5
-INITIAL_RETRY_DELAY = 5  # seconds
-MAX_RETRY_DELAY = 120    # seconds
-ATTEMPT_DELAY = 10       # seconds between post attempts
+# Run metrics: per-phase timings, event counts and API totals, written when the run ends
+METRICS_FILE = os.environ.get("DEV_METRICS_FILE", "dev_posting_metrics.json")
+PROMETHEUS_FILE = os.environ.get("DEV_METRICS_PROMETHEUS_FILE", "")   # optional node_exporter textfile
+run_metrics = RunMetrics()
+
+# One posting run at a time per state file (action, local scheduler, other accounts' runners)
+RUN_LOCK_TIMEOUT = 10 * 60   # seconds to wait for a concurrent run to finish
+
+# Remote inventory configuration
+INVENTORY_TTL = 3600     # seconds before the cached DEV.to inventory is revalidated
+
+# Retry configuration: failed posts are rescheduled, never slept on
+RETRY_BASE_DELAY = 10           # seconds before the first retry
+RETRY_MAX_DELAY = 6 * 60 * 60   # cap on the exponential backoff
+
+# Batch configuration: posts are prepared in a worker pool, then sent one by one
+DEFAULT_MAX_POSTS_PER_RUN = 1
+DEFAULT_PREPARATION_WORKERS = 4
+
+# Selection: "balanced" interleaves categories, "rotation" walks the rotation plan in order
+SELECTION_STRATEGIES = ("balanced", "rotation")
+DEFAULT_SELECTION_STRATEGY = "balanced"
 
 # Popular DEV.to tags by category
 POPULAR_TAGS = {
@@ -102,6 +142,7 @@ POPULAR_TAGS = {
 # Default tags if category not found
 DEFAULT_TAGS = ["pdf", "tutorial", "productivity", "webdev"]
 
+@run_metrics.timed("validate_environment")
 def validate_environment():
     """Validate environment and prerequisites"""
     print("🔍 Validating environment...")
@@ -164,6 +205,24 @@ def validate_config(config):
     if not isinstance(retry_attempts, int) or retry_attempts < 1 or retry_attempts > 50:
         errors.append("'retry_attempts' must be an integer between 1 and 50")
         config["retry_attempts"] = 15
+
+    max_posts_per_run = config.get("max_posts_per_run")
+    if not isinstance(max_posts_per_run, int) or max_posts_per_run < 1 or max_posts_per_run > 10:
+        errors.append("'max_posts_per_run' must be an integer between 1 and 10")
+        config["max_posts_per_run"] = DEFAULT_MAX_POSTS_PER_RUN
+
+    workers = config.get("preparation_workers")
+    if not isinstance(workers, int) or workers < 1 or workers > 16:
+        errors.append("'preparation_workers' must be an integer between 1 and 16")
+        config["preparation_workers"] = DEFAULT_PREPARATION_WORKERS
+
+    if config.get("selection_strategy") not in SELECTION_STRATEGIES:
+        errors.append(f"'selection_strategy' must be one of {', '.join(SELECTION_STRATEGIES)}")
+        config["selection_strategy"] = DEFAULT_SELECTION_STRATEGY
+
+    if not isinstance(config.get("category_weights"), dict):
+        errors.append("'category_weights' must be an object mapping categories to weights")
+        config["category_weights"] = {}
     
     if errors:
         print("⚠️ Configuration validation errors:")
@@ -173,14 +232,23 @@ def validate_config(config):
     
     return config
 
+@run_metrics.timed("config_load")
 def load_config():
     """Load posting configuration"""
     default_config = {
         "enabled": True,
         "max_daily_posts": 2,
         "retry_attempts": 15,
+        "max_posts_per_run": DEFAULT_MAX_POSTS_PER_RUN,
+        "preparation_workers": DEFAULT_PREPARATION_WORKERS,
+        "selection_strategy": DEFAULT_SELECTION_STRATEGY,
+        "category_weights": {},
+        "recency_weight": DEFAULT_RECENCY_WEIGHT,
+        "age_weight": DEFAULT_AGE_WEIGHT,
         "emergency_reset": False,
         "last_emergency_reset": "",
+        "http_pool_size": 10,
+        "rate_limits": DEFAULT_BUDGETS,
         "notes": "Configuration file for DEV.to posting workflow"
     }
     
@@ -200,91 +268,49 @@ def load_config():
             return default_config
     return default_config
 
+# Posting state store (JSON snapshot + journal, or SQLite with DEV_STATE_BACKEND=sqlite):
+# changes are persisted as they happen and checkpointed by save_state()
+state_store = open_state_store(STATE_FILE, backup_file=BACKUP_STATE_FILE, journal_file=STATE_JOURNAL_FILE)
+
+# Persisted posting order; state["current_index"] is a cursor into it
+rotation_plan = RotationPlan(state_store)
+
+# Every create is journaled before it is sent, so a timed-out create is checked for, not re-sent blindly
+create_journal = CreateJournal(state_store)
+
+@run_metrics.timed("state_load")
 def load_state():
     """Load posting state from file or create default if not exists"""
-    # Try to load the primary state file
-    if os.path.exists(STATE_FILE):
-        try:
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
-                print(f"Loaded primary state file: {len(state.get('posted_articles', []))} articles posted")
-                return state
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error loading primary state file: {e}")
-            # Try to load backup
-            backup_file = "dev_posting_state_backup.json"
-            if os.path.exists(backup_file):
-                try:
-                    with open(backup_file, 'r') as f:
-                        state = json.load(f)
-                        print(f"Loaded backup state file: {len(state.get('posted_articles', []))} articles posted")
-                        # Save the backup as primary
-                        save_state(state)
-                        return state
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Error loading backup state file: {e}")
-    
-    # If we get here, no valid state file exists, create default
-    print("Creating default state")
-    state = {
-        "last_post_time": "",
-        "posted_articles": [],
-        "current_index": 0,
-        "total_posts": 0
-    }
-    save_state(state)
+    state = state_store.load()
+    if state_store.loaded_from == state_store.state_file:
+        print(f"Loaded primary state file: {len(state['posted_articles'])} articles posted")
+    elif state_store.loaded_from:
+        print(f"Loaded backup state file: {len(state['posted_articles'])} articles posted")
+    else:
+        print("Creating default state")
     return state
 
+@run_metrics.timed("state_save")
 def save_state(state):
-    """Save posting state to file with backup"""
+    """Checkpoint the posting state: write the snapshot and backup atomically if anything changed"""
     try:
-        # Save primary state file
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
-        
-        # Create backup copy
-        backup_file = "dev_posting_state_backup.json"
-        with open(backup_file, 'w') as f:
-            json.dump(state, f, indent=2)
-        
-        print(f"State saved: {len(state.get('posted_articles', []))} articles posted, index {state.get('current_index', 0)}")
+        if state_store.flush(state):
+            print(f"State saved: {len(state.get('posted_articles', []))} articles posted, index {state.get('current_index', 0)}")
     except Exception as e:
         print(f"Error saving state: {e}")
-        # Continue execution even if state save fails
+        # Continue execution even if state save fails; the journal still holds the changes
 
+@run_metrics.timed("discovery")
 def find_all_blog_posts(blog_dir):
-    """Find all blog post markdown files in the directory structure"""
-    blog_posts = []
-
-    # Walk through all directories in the blog content directory
-    for root, dirs, files in os.walk(blog_dir):
-        for file in files:
-            if file == "blog_post.md":
-                # Get the full path to the blog post
-                post_path = os.path.join(root, file)
-
-                # Extract category and topic from path
-                path_parts = Path(post_path).parts
-                if len(path_parts) >= 3:
-                    category = path_parts[-3]  # e.g., 10_ocr_text_recognition
-                    topic = path_parts[-2]     # e.g., 01_ocr_technology
-
-                    blog_posts.append({
-                        "path": post_path,
-                        "category": category,
-                        "topic": topic
-                    })
+    """Find all blog posts through the content manifest (path, category, topic, title, hash)"""
+    blog_posts = find_blog_posts(blog_dir, manifest_file=MANIFEST_FILE)
 
     print(f"Found {len(blog_posts)} blog posts")
     return blog_posts
 
 def extract_title_from_content(content):
-    """Extract the title from the blog post content (first h1)"""
-    lines = content.split('\n')
-    for line in lines:
-        if line.startswith('# '):
-            return line[2:].strip()
-    return "RevisePDF Blog Post"  # Default title if none found
+    """Extract the title from the blog post content (front matter title or first h1)"""
+    return content_metadata(content)["title"]
 
 def get_tags_for_category(category):
     """Get appropriate tags for the category"""
@@ -306,57 +332,77 @@ def get_tags_for_category(category):
     return DEFAULT_TAGS
 
 def make_api_request(url, headers, data, operation_name="API request"):
-    """Make an API request with exponential backoff for rate limiting"""
-    retry_count = 0
-    retry_delay = INITIAL_RETRY_DELAY
-
-    while retry_count < MAX_RETRIES:
-        try:
-            # Add timeout handling for network requests
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-
-            # Check if we hit rate limits
-            if response.status_code == 429:
-                retry_count += 1
-                if retry_count >= MAX_RETRIES:
-                    print(f"Maximum retries reached for {operation_name}. Giving up.")
-                    return response
-
-                # Get retry-after header if available, otherwise use exponential backoff
-                retry_after = response.headers.get('Retry-After')
-                if retry_after and retry_after.isdigit():
-                    wait_time = int(retry_after)
-                else:
-                    wait_time = min(retry_delay * (2 ** retry_count), MAX_RETRY_DELAY)
-
-                print(f"Rate limit hit. Waiting {wait_time} seconds before retry {retry_count}/{MAX_RETRIES}...")
-                time.sleep(wait_time)
-            elif 500 <= response.status_code < 600:
-                # Server error - retry with exponential backoff
-                retry_count += 1
-                if retry_count >= MAX_RETRIES:
-                    print(f"Maximum retries reached for {operation_name} due to server errors. Giving up.")
-                    return response
-
-                wait_time = min(retry_delay * (2 ** retry_count), MAX_RETRY_DELAY)
-                print(f"Server error {response.status_code}. Waiting {wait_time} seconds before retry {retry_count}/{MAX_RETRIES}...")
-                time.sleep(wait_time)
-            else:
-                # Not a rate limit or server error, return the response
-                return response
-
-        except requests.exceptions.RequestException as e:
-            retry_count += 1
-            if retry_count >= MAX_RETRIES:
-                print(f"Maximum retries reached for {operation_name}. Error: {str(e)}")
-                raise
-
-            wait_time = min(retry_delay * (2 ** retry_count), MAX_RETRY_DELAY)
-            print(f"Request error: {str(e)}. Retrying in {wait_time} seconds... ({retry_count}/{MAX_RETRIES})")
-            time.sleep(wait_time)
+    """Make a single API request; transient failures are raised for the retry scheduler instead of slept on"""
+    try:
+        # Add timeout handling for network requests
+        response = get_session().post(url, headers=headers, json=data, timeout=30)
+    except requests.exceptions.RequestException as e:
+        raise TransientPostingError(f"Request error during {operation_name}: {str(e)}")
+
+    # Check if we hit rate limits; the rate limiter has already paused the write budget
+    if response.status_code == 429:
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        raise TransientPostingError(f"Rate limit hit during {operation_name}", retry_after=retry_after)
+
+    if 500 <= response.status_code < 600:
+        raise TransientPostingError(f"Server error {response.status_code} during {operation_name}")
+
+    # Not a rate limit or server error, return the response
+    return response
+
+@run_metrics.timed("payload_build")
+def prepare_post(blog_post):
+    """Read, validate and build the DEV.to payload for a blog post (safe to run in a worker thread)"""
+    # Read the blog post content
+    with open(blog_post["path"], 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Extract title, tags, series and canonical URL (front matter or first h1)
+    metadata = content_metadata(content)
+    title = metadata["title"]
+
+    # Validate content before posting
+    validate_content(content, title)
+
+    canonical_url = metadata["canonical_url"] or f"https://www.revisepdf.com/blog/{blog_post['category']}/{blog_post['topic']}"
+
+    # Front matter tags win over the category tags
+    tags = metadata["tags"] or get_tags_for_category(blog_post["category"])
+
+    # Prepare the article data
+    article = {
+        "article": {
+            "title": title,
+            "published": True,
+            "body_markdown": content,
+            "tags": tags,
+            "canonical_url": canonical_url
+        }
+    }
+    if metadata["series"]:
+        article["article"]["series"] = metadata["series"]
+
+    return {
+        "post": blog_post,
+        "title": title,
+        "content": content,
+        "tags": tags,
+        "canonical_url": canonical_url,
+        "article": article
+    }
 
-    # This should not be reached, but just in case
-    raise Exception(f"Failed to complete {operation_name} after {MAX_RETRIES} retries")
+def report_preparation_error(blog_post, error):
+    """Print why a blog post could not be prepared for posting"""
+    if isinstance(error, FileNotFoundError):
+        print(f"Blog post file not found: {blog_post.get('path')}")
+    elif isinstance(error, UnicodeDecodeError):
+        print(f"Error reading blog post file (encoding issue): {blog_post.get('path')}")
+    elif isinstance(error, KeyError):
+        print(f"Missing required data in blog post: {error}")
+    elif isinstance(error, ValueError):
+        print(f"Content validation failed: {error}")
+    else:
+        print(f"Unexpected error preparing blog post: {str(error)}")
 
 def post_to_dev(blog_post, state):
     """Post a blog article to DEV.to with rate limiting and exponential backoff"""
@@ -365,41 +411,36 @@ def post_to_dev(blog_post, state):
         return False
 
     try:
-        # Read the blog post content
-        with open(blog_post["path"], 'r', encoding='utf-8') as f:
-            content = f.read()
+        prepared = prepare_post(blog_post)
+    except Exception as e:
+        report_preparation_error(blog_post, e)
+        return False
 
-        # Extract title from content
-        title = extract_title_from_content(content)
+    return send_prepared_post(prepared, state)
 
-        # Validate content before posting
-        try:
-            validate_content(content, title)
-        except ValueError as e:
-            print(f"Content validation failed: {e}")
-            return False
+@run_metrics.timed("publish")
+def send_prepared_post(prepared, state):
+    """Send a prepared article to DEV.to; transient failures are raised for the retry scheduler"""
+    if not API_KEY:
+        print("Error: DEV_TO_API_KEY environment variable not set")
+        return False
 
-        # Check if this article has already been posted (by path or canonical URL)
-        canonical_url = f"https://www.revisepdf.com/blog/{blog_post['category']}/{blog_post['topic']}"
-        for posted in state["posted_articles"]:
-            if posted["path"] == blog_post["path"] or posted.get("canonical_url") == canonical_url:
-                print(f"Article already posted: {title}")
-                # Mark as successful to move to next article
-                return True
+    blog_post = prepared["post"]
+    title = prepared["title"]
+    canonical_url = prepared["canonical_url"]
 
-        # Get tags for the category
-        tags = get_tags_for_category(blog_post["category"])
+    try:
+        # Check if this article has already been posted (by path or canonical URL)
+        if state["posted_articles"].contains(path=blog_post["path"], canonical_url=canonical_url):
+            print(f"Article already posted: {title}")
+            # Mark as successful to move to next article
+            return True
 
-        # Prepare the article data
-        article = {
-            "article": {
-                "title": title,
-                "published": True,
-                "body_markdown": content,
-                "tags": tags,
-                "canonical_url": canonical_url
-            }
-        }
+        # An earlier create of this article may have gone through before it timed out
+        fingerprint = article_fingerprint(prepared["article"])
+        pending = create_journal.find(state, fingerprint, path=blog_post["path"])
+        if pending and confirm_pending_create(pending, blog_post, state):
+            return True
 
         # Post to DEV.to with rate limiting
         headers = {
@@ -407,26 +448,30 @@ def post_to_dev(blog_post, state):
             "Content-Type": "application/json"
         }
 
+        # Journal the create before sending it; it stays pending if the outcome is unknown
+        record = create_journal.begin(state, fingerprint, blog_post, title, canonical_url)
         response = make_api_request(
             DEV_API_URL,
             headers=headers,
-            data=article,
+            data=prepared["article"],
             operation_name=f"posting article '{title}'"
         )
 
         if response.status_code == 201:
             print(f"Successfully posted: {title}")
+            remember_posted_article(response.json())
 
             # Update state
-            state["last_post_time"] = datetime.now().isoformat()
-            state["posted_articles"].append({
+            state_store.update(state, last_post_time=datetime.now().isoformat())
+            state_store.append_posted(state, {
                 "title": title,
                 "path": blog_post["path"],
                 "posted_at": datetime.now().isoformat(),
                 "dev_id": response.json().get("id", ""),
-                "canonical_url": canonical_url
+                "canonical_url": canonical_url,
+                "fingerprint": fingerprint
             })
-            save_state(state)
+            create_journal.complete(state, record)
             return True
         elif response.status_code == 422 and "Canonical url has already been taken" in response.text:
             print(f"Canonical URL conflict for: {title}")
@@ -435,11 +480,13 @@ def post_to_dev(blog_post, state):
                 "article": {
                     "title": title,
                     "published": True,
-                    "body_markdown": content,
-                    "tags": tags
+                    "body_markdown": prepared["content"],
+                    "tags": prepared["tags"]
                     # No canonical_url to avoid conflicts
                 }
             }
+            if prepared["article"]["article"].get("series"):
+                article_no_canonical["article"]["series"] = prepared["article"]["article"]["series"]
             
             retry_response = make_api_request(
                 DEV_API_URL,
@@ -450,134 +497,177 @@ def post_to_dev(blog_post, state):
             
             if retry_response.status_code == 201:
                 print(f"Successfully posted without canonical URL: {title}")
-                state["last_post_time"] = datetime.now().isoformat()
-                state["posted_articles"].append({
+                remember_posted_article(retry_response.json())
+                state_store.update(state, last_post_time=datetime.now().isoformat())
+                state_store.append_posted(state, {
                     "title": title,
                     "path": blog_post["path"],
                     "posted_at": datetime.now().isoformat(),
                     "dev_id": retry_response.json().get("id", ""),
-                    "note": "Posted without canonical URL due to conflict"
+                    "note": "Posted without canonical URL due to conflict",
+                    "fingerprint": fingerprint
                 })
-                save_state(state)
+                create_journal.complete(state, record)
                 return True
             else:
                 print(f"Failed to post even without canonical URL: {retry_response.status_code} - {retry_response.text}")
-                save_state(state)
+                create_journal.complete(state, record)
                 return False
         else:
             print(f"Failed to post article: {response.status_code} - {response.text}")
-            # Save state even on failure to maintain consistency
-            save_state(state)
+            # Rejected outright, so nothing was created
+            create_journal.complete(state, record)
             return False
 
-    except FileNotFoundError:
-        print(f"Blog post file not found: {blog_post['path']}")
-        return False
-    except UnicodeDecodeError:
-        print(f"Error reading blog post file (encoding issue): {blog_post['path']}")
-        return False
-    except KeyError as e:
-        print(f"Missing required data in blog post: {e}")
-        return False
+    except TransientPostingError:
+        # Let the caller schedule a retry
+        raise
     except Exception as e:
         print(f"Unexpected error posting to DEV.to: {str(e)}")
-        # Always save state to maintain consistency
-        try:
-            save_state(state)
-        except:
-            pass
         return False
 
-def devto_article_exists(title, canonical_url, api_key):
-    """Check DEV.to for an article with the same title or canonical URL."""
-    import requests
-    headers = {"api-key": api_key}
+def confirm_pending_create(pending, blog_post, state):
+    """Check the newest DEV.to articles for a create whose outcome is unknown; record it if it went through"""
     try:
-        # Get all articles for the user (paginated)
-        page = 1
-        while True:
-            resp = requests.get(f"https://dev.to/api/articles/me?per_page=100&page={page}", headers=headers, timeout=10)
-            if resp.status_code != 200:
-                break
-            articles = resp.json()
-            if not articles:
-                break
-            for article in articles:
-                if article.get("canonical_url") == canonical_url or article.get("title") == title:
-                    return article
-            page += 1
-    except Exception as e:
-        print(f"Error checking DEV.to for duplicates: {e}")
-    return None
-
-def get_next_blog_post(blog_posts, state):
-    """Get the next blog post to publish based on the current index, prioritizing unposted articles"""
-    if not blog_posts:
-        print("No blog posts found")
-        return None
-
-    # Update total posts count if needed
-    if state["total_posts"] != len(blog_posts):
-        state["total_posts"] = len(blog_posts)
-
-    # Get the next post
-    if state["current_index"] >= len(blog_posts):
-        # Start over from the beginning
-        state["current_index"] = 0
-
-    # Try to find an unposted article starting from the current index
-    original_index = state["current_index"]
-    checked_count = 0
-
-    while checked_count < len(blog_posts):
-        next_post = blog_posts[state["current_index"]]
-
-        # Increment the index for next time
-        state["current_index"] = (state["current_index"] + 1) % len(blog_posts)
-        checked_count += 1
-
-        # Check if this post has already been posted
-        if not is_already_posted(next_post, state):
-            print(f"Found unposted article at index {original_index}")
-            save_state(state)
-            return next_post
-
-    # If we've checked all posts and they're all posted, just return the next one
-    # (we'll handle this case in the main function)
-    next_post = blog_posts[original_index]
-    state["current_index"] = (original_index + 1) % len(blog_posts)
-    save_state(state)
+        article = find_recent_article(
+            API_KEY,
+            title=pending["title"],
+            canonical_url=pending.get("canonical_url"),
+            since=pending["sent_at"],
+            base_url=DEV_API_BASE_URL
+        )
+    except requests.exceptions.RequestException as e:
+        # Sending again without knowing could duplicate the article
+        raise TransientPostingError(f"Could not check for the earlier create of '{pending['title']}': {str(e)}")
 
-    return next_post
+    if article is None:
+        print(f"Earlier attempt to post '{pending['title']}' did not create it; sending it again")
+        return False
 
+    print(f"Earlier attempt created '{article.get('title')}' (DEV.to id {article.get('id')}); recording it instead of posting again")
+    remember_posted_article(article)
+    state_store.update(state, last_post_time=datetime.now().isoformat())
+    state_store.append_posted(state, {
+        "title": article.get("title") or pending["title"],
+        "path": blog_post["path"],
+        "posted_at": article.get("published_at") or datetime.now().isoformat(),
+        "dev_id": article.get("id", ""),
+        "canonical_url": article.get("canonical_url"),
+        "fingerprint": pending["fingerprint"]
+    })
+    create_journal.complete(state, pending)
+    return True
+
+# DEV.to article inventory, fetched at most once per run
+_remote_inventory = None
+
+@run_metrics.timed("inventory")
+def get_remote_inventory(api_key):
+    """Load the DEV.to article inventory once per run, revalidating the cached copy if stale"""
+    global _remote_inventory
+    if _remote_inventory is None:
+        _remote_inventory = ArticleInventory(
+            api_key, cache_file=INVENTORY_FILE, ttl=INVENTORY_TTL, base_url=DEV_API_BASE_URL
+        )
+        _remote_inventory.load()
+        try:
+            new_count = _remote_inventory.refresh()
+            print(f"DEV.to inventory: {len(_remote_inventory.articles)} articles ({new_count} new)")
+            _remote_inventory.save()
+        except Exception as e:
+            # The cached snapshot is kept as it was, and the local history still applies
+            print(f"Error refreshing DEV.to inventory, keeping the cached copy ({len(_remote_inventory.articles)} articles): {e}")
+    return _remote_inventory
+
+def remember_posted_article(article):
+    """Add a freshly created article to the DEV.to inventory so later checks see it"""
+    if _remote_inventory is not None and article.get("id"):
+        _remote_inventory.add(article, newest=True)
+        _remote_inventory.save()
+
+def devto_article_exists(title, canonical_url, api_key, since=None):
+    """Check DEV.to for an article with the same title or canonical URL, published since the given ISO time."""
+    return get_remote_inventory(api_key).find(title=title, canonical_url=canonical_url, since=since)
+
+def iter_unposted_posts(blog_posts, state):
+    """Lazily yield (index, post) for unposted articles, starting at the current index.
+
+    Each post is checked at most once, against the posted index first, and nothing
+    past the last post the caller consumes is checked.
+    """
+    total = len(blog_posts)
+    if not total:
+        return
+
+    start = state["current_index"] if 0 <= state["current_index"] < total else 0
+    for offset in range(total):
+        index = (start + offset) % total
+        blog_post = blog_posts[index]
+        if not is_already_posted(blog_post, state):
+            yield index, blog_post
+
+@run_metrics.timed("selection")
+def select_unposted_posts(blog_posts, state, limit, exclude=(), selector=None):
+    """Take up to limit unposted articles, skipping excluded paths.
+
+    With a CategoryBalancedSelector the articles come in category-balanced order and
+    the selector is only updated once they are posted; otherwise they come from the
+    rotation and state["current_index"] is left just after the last selected post.
+
+    Returns (selected, found_any): the selected (index, post) pairs, and whether any
+    unposted article was seen at all (excluded ones included).
+    """
+    selected = []
+    found_any = False
+    if limit <= 0:
+        return selected, found_any
+
+    if selector is not None:
+        candidates = selector.candidates(state, blog_posts, lambda blog_post: is_already_posted(blog_post, state))
+    else:
+        candidates = iter_unposted_posts(blog_posts, state)
+
+    for index, blog_post in candidates:
+        found_any = True
+        if blog_post["path"].replace("\\", "/") in exclude:
+            continue
+        selected.append((index, blog_post))
+        if selector is None:
+            state["current_index"] = (index + 1) % len(blog_posts)
+            state_store.mark_dirty()
+        print(f"Found unposted article at index {index}")
+        if len(selected) >= limit:
+            break
+    return selected, found_any
+
+@run_metrics.timed("dedup")
 def is_already_posted(blog_post, state):
     """Check if a blog post has already been posted to DEV.to (local state + DEV.to API)"""
-    canonical_url = f"https://www.revisepdf.com/blog/{blog_post["category"]}/{blog_post["topic"]}"
+    canonical_url = f"https://www.revisepdf.com/blog/{blog_post['category']}/{blog_post['topic']}"
     title = blog_post.get("title")
     # Check local state
-    for posted in state["posted_articles"]:
-        if posted["path"] == blog_post["path"] or posted.get("canonical_url") == canonical_url:
-            return True
+    if state["posted_articles"].contains(path=blog_post["path"], canonical_url=canonical_url):
+        return True
     # Check DEV.to API
     api_key = os.environ.get("DEV_TO_API_KEY", "")
     if api_key:
-        article = devto_article_exists(title, canonical_url, api_key)
+        # Articles from before the current cycle were cleared from the history on purpose
+        article = devto_article_exists(title, canonical_url, api_key, since=state.get("cycle_started_at"))
         if article:
             # Add to state if not present
-            if not any(posted.get("dev_id") == article["id"] for posted in state["posted_articles"]):
-                state["posted_articles"].append({
+            if not state["posted_articles"].contains(dev_id=article["id"]):
+                state_store.append_posted(state, {
                     "title": article["title"],
                     "path": blog_post["path"],
                     "posted_at": article["published_at"],
                     "dev_id": article["id"],
                     "canonical_url": article.get("canonical_url")
                 })
-                save_state(state)
             return True
     return False
 
 def main():
-    """Main function to post an article to DEV.to"""
+    """Main function to post up to max_posts_per_run articles to DEV.to"""
     print("Running DEV.to posting action")
     
     try:
@@ -592,18 +682,19 @@ def main():
             print("Posting is disabled in configuration. Exiting.")
             sys.exit(0)
 
+        # Share one pooled keep-alive connection and one rate-limit budget across all DEV.to calls
+        configure_session(
+            pool_size=config.get("http_pool_size", 10),
+            rate_limits=config.get("rate_limits")
+        )
+
         # Load the latest state
         state = load_state()
         
         # Check for emergency reset
         if config.get("emergency_reset", False):
             print("Emergency reset requested. Clearing all state and starting fresh.")
-            state = {
-                "last_post_time": "",
-                "posted_articles": [],
-                "current_index": 0,
-                "total_posts": 0
-            }
+            state_store.reset(state, last_post_time="", current_index=0, total_posts=0)
             # Update config to disable emergency reset after use
             config["emergency_reset"] = False
             config["last_emergency_reset"] = datetime.now().isoformat()
@@ -616,79 +707,135 @@ def main():
         
         if not blog_posts:
             print("No blog posts found. Exiting gracefully.")
+            save_state(state)
             sys.exit(0)
 
+        # Rotate in the persisted plan order, which is the same on every runner
+        with run_metrics.span("rotation"):
+            blog_posts = rotation_plan.sync(state, blog_posts)
+
         # Update total posts in state
-        state["total_posts"] = len(blog_posts)
-        save_state(state)
+        if state["total_posts"] != len(blog_posts):
+            state["total_posts"] = len(blog_posts)
+            state_store.mark_dirty()
 
         # Get retry attempts from config
         max_attempts = config.get("retry_attempts", 15)
-        posted_new_article = False
+        retry_scheduler = RetryScheduler(
+            state_store,
+            base_delay=RETRY_BASE_DELAY,
+            max_delay=RETRY_MAX_DELAY,
+            max_attempts=max_attempts
+        )
 
-        # Pre-filter blog posts to find ones that haven't been posted yet
-        unposted_blog_posts = []
-        for post in blog_posts:
-            if not is_already_posted(post, state):
-                unposted_blog_posts.append(post)
+        # Up to max_posts_per_run posts are published per run (catch-up)
+        posts_per_run = config.get("max_posts_per_run", DEFAULT_MAX_POSTS_PER_RUN)
+        candidates = []
 
-        print(f"Found {len(unposted_blog_posts)} unposted blog posts out of {len(blog_posts)} total")
+        # Posts whose earlier attempt failed take priority once their retry is due
+        for job in retry_scheduler.due(state):
+            if len(candidates) >= posts_per_run:
+                break
+            # Only the local state here: an earlier create that may have gone through
+            # is checked for by its fingerprint when the retry is sent
+            if state["posted_articles"].contains(path=job["post"]["path"]):
+                retry_scheduler.clear(state, job["post"])
+                continue
+            candidates.append(job["post"])
+            run_metrics.count("retries")
+            print(f"Retrying {job['post']['path']} (attempt {job['attempts'] + 1}/{max_attempts}, last error: {job['last_error']})")
+
+        # Category-balanced (heap) or plain rotation selection
+        selector = None
+        if config.get("selection_strategy", DEFAULT_SELECTION_STRATEGY) == "balanced":
+            selector = CategoryBalancedSelector(
+                state_store,
+                category_weights=config.get("category_weights"),
+                recency_weight=config.get("recency_weight", DEFAULT_RECENCY_WEIGHT),
+                age_weight=config.get("age_weight", DEFAULT_AGE_WEIGHT)
+            )
 
-        if not unposted_blog_posts:
+        # Lazy pass that stops at the first unposted article(s).
+        # Posts waiting in the retry queue are left to their scheduled retry
+        exclude = {post["path"].replace("\\", "/") for post in candidates} | set(state.get("retry_queue") or {})
+        selected, found_any = select_unposted_posts(blog_posts, state, posts_per_run - len(candidates), exclude, selector)
+        if not found_any and not candidates:
             print("All blog posts have been posted. Starting over from the beginning.")
-            # Reset the current index to start over
-            state["current_index"] = 0
-            # Reset the posted_articles list to allow reposting
-            state["posted_articles"] = []
-            save_state(state)
+            # Reset the current index and the posted_articles list to allow reposting. Articles
+            # already on DEV.to from before now no longer count as posted, or every post would
+            # match the account again and each run would start over without posting
+            state_store.reset(state, current_index=0, cycle_started_at=datetime.now().isoformat())
             print("Cleared posting history to allow reposting of all articles")
-            # Use all blog posts since we're starting over
-            unposted_blog_posts = blog_posts
+            selected, _ = select_unposted_posts(blog_posts, state, posts_per_run, exclude, selector)
+
+        # Rotation index to rewind to if a fresh candidate is left unattempted
+        rotation_index = {}
+        for index, blog_post in selected:
+            candidates.append(blog_post)
+            rotation_index[blog_post["path"]] = index
 
-        # Get the next blog post to publish ONCE
-        next_post = get_next_blog_post(blog_posts, state)
-        if not next_post:
+        if not candidates:
             print("No blog post available to publish")
             save_state(state)
             sys.exit(0)
 
-        print(f"Found unposted article at index {state['current_index']-1}")
-        save_state(state)
+        print(f"Posting {len(candidates)} article(s) this run (limit {posts_per_run})")
 
-        for attempt in range(max_attempts):
-            try:
-                print(f"Attempt {attempt+1}/{max_attempts} to post a new article")
-
-                # Post to DEV.to (using the same post for all retry attempts)
-                success = post_to_dev(next_post, state)
+        # Prepare every candidate concurrently; the POSTs themselves go out one by one
+        # through the shared rate limiter. A transient failure is scheduled for a later
+        # run instead of holding the runner in time.sleep()
+        pipeline = PreparationPipeline(
+            prepare_post,
+            workers=config.get("preparation_workers", DEFAULT_PREPARATION_WORKERS)
+        )
+        posted_count = 0
+        for position, (blog_post, prepared, error) in enumerate(pipeline.run(candidates)):
+            if error is not None:
+                report_preparation_error(blog_post, error)
+                retry_scheduler.clear(state, blog_post)
+                run_metrics.count("failed")
+                # Move past it, or the selector offers the same post on every run
+                if selector is not None:
+                    selector.record_skipped(state, blog_posts, blog_post)
+                print("Warning: Failed to prepare article and the failure is not retryable.")
+                continue
 
+            try:
+                success = send_prepared_post(prepared, state)
+            except TransientPostingError as e:
+                run_metrics.count("transient_failures")
+                job = retry_scheduler.schedule(state, blog_post, e, retry_after=e.retry_after)
+                if job:
+                    print(f"Transient failure: {e}. Retry {job['attempts'] + 1}/{max_attempts} scheduled for {job['next_attempt_at']}")
+                else:
+                    print(f"Transient failure: {e}. Giving up after {max_attempts} attempts")
+                    if selector is not None:
+                        selector.record_skipped(state, blog_posts, blog_post)
+
+                # Leave the remaining candidates for the next run
+                remaining = [post for post in candidates[position + 1:] if post["path"] in rotation_index]
+                if remaining:
+                    state_store.update(state, current_index=rotation_index[remaining[0]["path"]])
+                if position + 1 < len(candidates):
+                    run_metrics.count("deferred", len(candidates) - position - 1)
+                    print(f"Deferring {len(candidates) - position - 1} remaining article(s) to the next run")
+                break
+            else:
+                retry_scheduler.clear(state, blog_post)
                 if success:
-                    # Successfully posted or handled the article
-                    posted_new_article = True
+                    posted_count += 1
+                    run_metrics.count("posted")
+                    if selector is not None:
+                        selector.record_posted(state, blog_posts, blog_post)
                     print(f"Successfully posted new article. Current index: {state['current_index']}/{state['total_posts']}")
-                    break
                 else:
-                    print(f"Failed to post article (attempt {attempt+1}/{max_attempts})")
-
-                    # Add a delay between attempts to avoid rate limiting
-                    if attempt < max_attempts - 1:
-                        print(f"Waiting {ATTEMPT_DELAY} seconds before retrying...")
-                        time.sleep(ATTEMPT_DELAY)
+                    run_metrics.count("failed")
+                    if selector is not None:
+                        selector.record_skipped(state, blog_posts, blog_post)
+                    print("Warning: Failed to post article and the failure is not retryable.")
 
-            except Exception as e:
-                print(f"Error during posting attempt {attempt+1}: {e}")
-                # Save state even on error
-                save_state(state)
-                
-                # Add delay and continue to next attempt
-                if attempt < max_attempts - 1:
-                    print(f"Waiting {ATTEMPT_DELAY} seconds before retry...")
-                    time.sleep(ATTEMPT_DELAY)
-                continue
+        print(f"Posted {posted_count} of {len(candidates)} article(s) this run")
 
-        if not posted_new_article:
-            print("Warning: Could not find any new articles to post after multiple attempts.")
-            
         # Always save state before exiting
         save_state(state)
         print("State saved successfully. Workflow will continue next time.")
@@ -705,9 +852,48 @@ def main():
         print("Exiting gracefully to ensure workflow continues.")
         sys.exit(0)
 
+def write_run_metrics(exit_code):
+    """Write the run metrics (JSON, and the Prometheus textfile if configured); never fails the run"""
+    try:
+        report = run_metrics.write_json(METRICS_FILE, exit_code=exit_code)
+        if PROMETHEUS_FILE:
+            run_metrics.write_prometheus(PROMETHEUS_FILE, report=report)
+        phases = ", ".join(f"{name} {phase['seconds']:.2f}s" for name, phase in report["phases"].items())
+        print(f"Run metrics written to {METRICS_FILE}: {report['duration']:.2f}s total ({phases}), "
+              f"{report['http']['requests']} API calls, {report['http']['bytes_sent']} bytes sent, "
+              f"{report['sleep']['total']:.2f}s sleeping")
+    except Exception as e:
+        print(f"Error writing run metrics: {e}")
+
 if __name__ == "__main__":
-    # Validate environment before starting
-    validate_environment()
+    parser = argparse.ArgumentParser(description="Post the next blog articles to DEV.to")
+    # Profiles are written next to the run metrics
+    add_profile_arguments(parser, default_dir=os.path.dirname(os.path.abspath(METRICS_FILE)))
+    args = parser.parse_args()
 
-    # Run the main posting logic
-    main()
+    exit_code = 0
+    try:
+        with profiled(args.profile, args.profile_dir, name="dev_posting_profile"):
+            # Validate environment before starting
+            validate_environment()
+
+            # Run the main posting logic, holding the state lock so concurrent runs cannot pick the same post
+            try:
+                lock_requested = time.monotonic()
+                with state_store.lock.exclusive(timeout=RUN_LOCK_TIMEOUT):
+                    run_metrics.add_sleep(time.monotonic() - lock_requested, "state_lock")
+                    main()
+            except LockTimeout as e:
+                run_metrics.add_sleep(time.monotonic() - lock_requested, "state_lock")
+                holder = e.holder or {}
+                print(f"Another posting run holds the state lock (pid {holder.get('pid')} on {holder.get('host')} "
+                      f"since {holder.get('acquired_at')}). Exiting gracefully.")
+                sys.exit(0)
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        raise
+    except BaseException:
+        exit_code = 1
+        raise
+    finally:
+        write_run_metrics(exit_code)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Multi-account runner for the DEV.to posting action.
+Each account profile has its own API key, content directory, config and
+state directory. Every profile runs post_to_dev_action.py in its own worker
+process, with the state directory as its working directory, so state,
+journal, manifest and inventory files never mix between accounts. The local
+scheduler, post_to_dev.py, is not covered: it posts for one account.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Configuration
+PROFILES_FILE = ".github/workflows/posting_tenants.json"
+DEFAULT_CONFIG_FILE = ".github/workflows/posting_config.json"
+ACTION_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "post_to_dev_action.py")
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TENANT_TIMEOUT = 30 * 60   # seconds before a stuck account is killed
+DEFAULT_STATE_ROOT = "tenants"
+
+def load_profiles(profiles_file):
+    """Load the account profiles, resolving their paths against the current directory"""
+    with open(profiles_file, 'r') as f:
+        data = json.load(f)
+
+    defaults = data.get("defaults", {})
+    profiles = []
+    seen = set()
+    for entry in data.get("profiles", []):
+        profile = dict(defaults, **entry)
+        name = profile.get("name")
+        if not name or name in seen:
+            print(f"Skipping profile with a missing or duplicate name: {entry}")
+            continue
+        seen.add(name)
+
+        profile.setdefault("api_key_env", f"DEV_TO_API_KEY_{name.upper().replace('-', '_')}")
+        profile.setdefault("content_dir", "blog_content")
+        profile.setdefault("state_dir", os.path.join(DEFAULT_STATE_ROOT, name))
+        # Workers run in the state directory, where the action's relative default
+        # config path does not exist and it would fall back to enabled=True
+        profile.setdefault("config_file", DEFAULT_CONFIG_FILE)
+        for key in ("content_dir", "state_dir", "config_file"):
+            profile[key] = os.path.abspath(profile[key])
+        if not os.path.exists(profile["config_file"]):
+            print(f"Skipping profile {name}: config file not found: {profile['config_file']}")
+            continue
+        profiles.append(profile)
+
+    return profiles, data.get("max_workers", DEFAULT_MAX_WORKERS)
+
+def tenant_environment(profile):
+    """Build the environment of a tenant's worker process"""
+    env = dict(os.environ)
+    # Never let one account's key leak into another account's process
+    env.pop("DEV_TO_API_KEY", None)
+    api_key = os.environ.get(profile["api_key_env"], "")
+    if api_key:
+        env["DEV_TO_API_KEY"] = api_key
+
+    env["DEV_BLOG_CONTENT_DIR"] = profile["content_dir"]
+    env["DEV_POSTING_CONFIG"] = profile["config_file"]
+    if profile.get("state_backend"):
+        env["DEV_STATE_BACKEND"] = profile["state_backend"]
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+def run_tenant(profile):
+    """Run the posting action for one account in its own process"""
+    os.makedirs(profile["state_dir"], exist_ok=True)
+    start = time.monotonic()
+    try:
+        result = subprocess.run(
+            [sys.executable, ACTION_SCRIPT],
+            cwd=profile["state_dir"],
+            env=tenant_environment(profile),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=profile.get("timeout", DEFAULT_TENANT_TIMEOUT)
+        )
+        returncode, output = result.returncode, result.stdout
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout.decode("utf-8", errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+        returncode, output = None, output + f"\nTimed out after {e.timeout} seconds"
+    return {
+        "name": profile["name"],
+        "returncode": returncode,
+        "output": output,
+        "duration": time.monotonic() - start,
+    }
+
+def main():
+    """Run every enabled account profile, up to max_workers at a time"""
+    parser = argparse.ArgumentParser(description="Post to DEV.to for several accounts")
+    parser.add_argument("--profiles", default=PROFILES_FILE, help="The account profiles file")
+    parser.add_argument("--workers", type=int, help="How many accounts to run at once")
+    parser.add_argument("--only", nargs="+", help="Only run these profiles")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.profiles):
+        print(f"CRITICAL ERROR: Profiles file not found: {args.profiles}")
+        sys.exit(1)
+
+    profiles, max_workers = load_profiles(args.profiles)
+    profiles = [
+        profile for profile in profiles
+        if profile.get("enabled", True) and (not args.only or profile["name"] in args.only)
+    ]
+    if not profiles:
+        print("No enabled profiles to run")
+        return
+
+    workers = max(1, min(args.workers or max_workers, len(profiles)))
+    print(f"Running {len(profiles)} accounts with {workers} workers")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_tenant, profile) for profile in profiles]
+        for future in as_completed(futures):
+            result = future.result()
+            # Print each account's output as one block so parallel runs stay readable
+            for line in result["output"].splitlines():
+                print(f"[{result['name']}] {line}")
+            status = "ok" if result["returncode"] == 0 else f"failed ({result['returncode']})"
+            print(f"[{result['name']}] {status} in {result['duration']:.1f}s")
+            if result["returncode"] != 0:
+                failed.append(result["name"])
+
+    if failed:
+        print(f"{len(failed)} of {len(profiles)} accounts failed: {', '.join(sorted(failed))}")
+        sys.exit(1)
+    print(f"All {len(profiles)} accounts completed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks of the DEV.to posting action.
+Runs scenarios that are easy to get wrong, and slow to notice in production,
+against the local DEV.to emulator on small synthetic corpora, and exits with
+status 1 if any of them fails.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from datetime import datetime
+
+from posting_benchmark import (ACTION_DIR, API_KEY, BENCHMARK_CONFIG, DevToEmulator, generate_corpus,
+                               generate_history, worker_environment)
+from posting.rotation import RotationPlan
+from posting.selector import CategoryBalancedSelector
+from posting.state import default_state, open_state_store
+
+# Configuration
+CHECK_POSTS = 30
+CHECK_CATEGORIES = 3
+CHECK_POST_SIZE = 500
+CHECK_TIMEOUT = 5 * 60
+CYCLE_RUNS = 3
+BROKEN_RUNS = 5
+POST_INTERVAL = 12 * 60 * 60    # seconds between simulated posts
+SHARE_TOLERANCE = 0.1           # allowed relative error of a category's share
+# Posts that fail for good, with the message each failure prints: one rejected before
+# sending, one rejected by DEV.to with a 422 (more than four tags)
+BROKEN_POSTS = [
+    ("# Short", "Content too short"),
+    ("---\ntitle: Too Many Tags\ntags: pdf, ocr, scan, merge, split, sign\n---\n\n" + "Body text. " * 40,
+     "Tag list exceed"),
+]
+# (categories, weight of the first category, posts made); whole rounds, since stride scheduling
+# can leave a category up to one turn behind in the middle of a round
+WEIGHT_SCENARIOS = [(3, 3, 60), (50, 5, 216)]
+
+def run_action(run_dir, env):
+    """Run the posting action once in run_dir and return its output"""
+    result = subprocess.run(
+        [sys.executable, os.path.join(ACTION_DIR, "post_to_dev_action.py")],
+        cwd=run_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=CHECK_TIMEOUT
+    )
+    if result.returncode != 0:
+        raise AssertionError(f"the action exited with {result.returncode}:\n{result.stdout[-2000:]}")
+    return result.stdout
+
+def load_posted(run_dir):
+    """Return the posted_articles of the state left in run_dir"""
+    with open(os.path.join(run_dir, "dev_posting_state.json"), 'r') as f:
+        return json.load(f)["posted_articles"]
+
+def check_fully_posted_corpus_cycles(emulator, work_dir):
+    """Once every post is on DEV.to, each run still posts one, and the history is cleared only once"""
+    content_dir, entries = generate_corpus(os.path.join(work_dir, "corpus"), CHECK_POSTS, CHECK_CATEGORIES,
+                                           CHECK_POST_SIZE, seed=1)
+    articles, build_state = generate_history(entries, 1.0, seed=1)
+
+    for strategy in ("balanced", "rotation"):
+        emulator.reset()
+        run_dir = os.path.join(work_dir, f"cycle_{strategy}")
+        shutil.rmtree(run_dir, ignore_errors=True)
+        os.makedirs(run_dir)
+        with open(os.path.join(run_dir, "dev_posting_state.json"), 'w') as f:
+            json.dump(build_state(emulator.seed(API_KEY, articles)), f)
+        config_file = os.path.join(run_dir, "posting_config.json")
+        with open(config_file, 'w') as f:
+            json.dump(dict(BENCHMARK_CONFIG, selection_strategy=strategy), f)
+        env = worker_environment(content_dir, config_file, emulator.base_url)
+
+        paths = []
+        for run in range(1, CYCLE_RUNS + 1):
+            output = run_action(run_dir, env)
+            posted = load_posted(run_dir)
+            resets = output.count("Starting over from the beginning")
+            if "No blog post available" in output or len(posted) != run:
+                raise AssertionError(f"{strategy}: run {run} left {len(posted)} posted articles, expected {run}:\n"
+                                     f"{output[-2000:]}")
+            if resets != (1 if run == 1 else 0):
+                raise AssertionError(f"{strategy}: run {run} cleared the history {resets} time(s)")
+            paths.append(posted[-1]["path"])
+        if len(set(paths)) != len(paths):
+            raise AssertionError(f"{strategy}: the new cycle posted the same article twice: {paths}")
+
+def check_failing_posts_are_skipped(emulator, work_dir):
+    """A post that fails for good is tried once, and the runs after it post the following articles"""
+    content_dir, entries = generate_corpus(os.path.join(work_dir, "broken_corpus"), CHECK_POSTS, CHECK_CATEGORIES,
+                                           CHECK_POST_SIZE, seed=2)
+    # The first post of each category is the one selection reaches first
+    broken = {}
+    for entry, (content, message) in zip(entries, BROKEN_POSTS):
+        with open(entry["path"], 'w', encoding='utf-8') as f:
+            f.write(content)
+        broken[entry["path"]] = message
+
+    for strategy in ("balanced", "rotation"):
+        emulator.reset()
+        run_dir = os.path.join(work_dir, f"broken_{strategy}")
+        shutil.rmtree(run_dir, ignore_errors=True)
+        os.makedirs(run_dir)
+        config_file = os.path.join(run_dir, "posting_config.json")
+        with open(config_file, 'w') as f:
+            json.dump(dict(BENCHMARK_CONFIG, selection_strategy=strategy), f)
+        env = worker_environment(content_dir, config_file, emulator.base_url)
+
+        output = "".join(run_action(run_dir, env) for _ in range(BROKEN_RUNS))
+        for path, message in broken.items():
+            if output.count(message) > 1:
+                raise AssertionError(f"{strategy}: {path} failed {output.count(message)} times, it should be tried once")
+        posted = [entry["path"] for entry in load_posted(run_dir)]
+        if len(posted) < BROKEN_RUNS - len(broken) or set(posted) & set(broken):
+            raise AssertionError(f"{strategy}: {BROKEN_RUNS} runs posted {posted}")
+
+def simulate_balanced_selection(work_dir, categories, weight, posts):
+    """Post through a CategoryBalancedSelector with the first category weighted; return the posts per category"""
+    blog_posts = [
+        {"path": f"/content/{c:02d}_category/{t:03d}_topic/blog_post.md", "category": f"{c:02d}_category",
+         "topic": f"{t:03d}_topic"}
+        for c in range(1, categories + 1) for t in range(posts)
+    ]
+    store = open_state_store(os.path.join(work_dir, "dev_posting_state.json"), backend="json")
+    state = default_state()
+    clock = {"now": datetime(2025, 1, 1).timestamp()}
+    selector = CategoryBalancedSelector(store, category_weights={"01_category": weight}, clock=lambda: clock["now"])
+
+    ordered = RotationPlan(store).sync(state, blog_posts)
+    counts = {}
+    for _ in range(posts):
+        clock["now"] += POST_INTERVAL
+        _, blog_post = next(selector.candidates(state, ordered, lambda post: state["posted_articles"].contains(path=post["path"])))
+        store.append_posted(state, {"title": blog_post["topic"], "path": blog_post["path"],
+                                    "posted_at": datetime.fromtimestamp(clock["now"]).isoformat()})
+        selector.record_posted(state, ordered, blog_post)
+        counts[blog_post["category"]] = counts.get(blog_post["category"], 0) + 1
+    return counts
+
+def check_category_weights(emulator, work_dir):
+    """A category with weight k gets about k times the posts of a category with weight 1"""
+    for categories, weight, posts in WEIGHT_SCENARIOS:
+        run_dir = os.path.join(work_dir, f"weights_{categories}_{weight}")
+        shutil.rmtree(run_dir, ignore_errors=True)
+        os.makedirs(run_dir)
+        counts = simulate_balanced_selection(run_dir, categories, weight, posts)
+        expected = posts * weight / (weight + categories - 1)
+        heavy = counts.get("01_category", 0)
+        if abs(heavy - expected) > expected * SHARE_TOLERANCE:
+            raise AssertionError(f"{categories} categories, weight {weight}: the weighted category got {heavy} "
+                                 f"of {posts} posts, expected about {expected:.0f} ({sorted(counts.items())})")
+
+CHECKS = [
+    check_fully_posted_corpus_cycles,
+    check_failing_posts_are_skipped,
+    check_category_weights,
+]
+
+def main():
+    """Run every check and report the failures"""
+    parser = argparse.ArgumentParser(description="Check the behaviour of the DEV.to posting action")
+    parser.add_argument("--work-dir", help="Where the corpora and runs are kept; a temporary directory by default")
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="devto_checks_")
+    failures = []
+    with DevToEmulator(port=0) as emulator:
+        for check in CHECKS:
+            try:
+                check(emulator, work_dir)
+                print(f"PASS {check.__name__}")
+            except AssertionError as e:
+                failures.append(check.__name__)
+                print(f"FAIL {check.__name__}: {e}")
+    if not args.work_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if failures:
+        print(f"{len(failures)} check(s) failed: {', '.join(failures)}")
+        sys.exit(1)
+    print("All checks passed")
+
+if __name__ == "__main__":
+    main()
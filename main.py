@@ -9,10 +9,8 @@ from dotenv import load_dotenv
 # Add the src directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
-# Import the necessary functions
-from src.test_post import create_test_post
-from src.create_blog_post import create_blog_post
-from src.publish_post import publish_post, list_drafts
+# The command modules are imported by run_command, so each command loads only what it needs
+from src.posting.profiling import add_profile_arguments, profiled
 
 
 def main():
@@ -29,6 +27,7 @@ def main():
 
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="RevisePDF Content Automation for Dev.to")
+    add_profile_arguments(parser)
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
     # Test post command
@@ -53,7 +52,21 @@ def main():
 
     args = parser.parse_args()
 
+    with profiled(args.profile, args.profile_dir, name=f"main_{args.command or 'help'}"):
+        run_command(args, parser)
+
+
+def run_command(args, parser):
+    """
+    Run the command chosen on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        parser (argparse.ArgumentParser): The parser, for the help text.
+    """
     if args.command == "test":
+        from src.test_post import create_test_post
+
         # Create a test post
         print("Creating a test post on Dev.to...")
         response = create_test_post()
@@ -68,6 +81,8 @@ def main():
             print("Error: Either --content-file or --content must be provided.")
             sys.exit(1)
 
+        from src.create_blog_post import create_blog_post
+
         print(f"Creating blog post: {args.title}")
         response = create_blog_post(
             title=args.title,
@@ -88,6 +103,8 @@ def main():
         else:
             print("Failed to create blog post.")
     elif args.command == "list":
+        from src.publish_post import list_drafts
+
         drafts = list_drafts()
         if drafts:
             print("Draft posts:")
@@ -111,6 +128,8 @@ def main():
             print("Error: Either --filename or --id must be provided.")
             sys.exit(1)
 
+        from src.publish_post import publish_post
+
         response = publish_post(
             filename=args.filename,
             post_id=args.id
@@ -12,34 +12,55 @@ This script handles:
 import os
 import sys
 import json
-import time
-import random
 import logging
+import argparse
 import requests
-import schedule
-import markdown
 from datetime import datetime, timedelta
-from pathlib import Path
 from dotenv import load_dotenv
 
+# Add the shared src directory to the path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from devto.inventory import find_recent_article
+from devto.ratelimit import DEFAULT_BUDGETS, parse_retry_after
+from devto.session import BASE_URL_ENV, DEFAULT_BASE_URL, DEFAULT_POOL_SIZE, api_base_url, configure_session, get_session
+from posting.manifest import ContentManifest, find_blog_posts
+from posting.idempotency import CreateJournal, article_fingerprint
+from posting.locking import LockTimeout
+from posting.metadata import content_metadata
+from posting.profiling import add_profile_arguments, profiled
+from posting.reload import ReloadingFile
+from posting.retry import RetryScheduler, TransientPostingError
+from posting.rotation import RotationPlan
+from posting.selector import DEFAULT_AGE_WEIGHT, DEFAULT_RECENCY_WEIGHT, CategoryBalancedSelector
+from posting.state import open_state_store
+from posting.timetable import PostingTimetable, sleep_until
+from posting.watcher import DEFAULT_POLL_INTERVAL, ContentWatcher
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("dev_posting.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger("dev_poster")
 
 # Configuration
-CONFIG_FILE = "dev_posting_config.json"
+CONFIG_FILE = os.environ.get("DEV_POSTING_CONFIG", "dev_posting_config.json")
 STATE_FILE = "dev_posting_state.json"
+MANIFEST_FILE = "blog_content_manifest.json"
 API_KEY = os.environ.get("DEV_TO_API_KEY", "")
+RELOAD_CHECK_INTERVAL = 300  # seconds between config/state/content change checks while idle
+RUN_LOCK_TIMEOUT = 10 * 60   # seconds to wait for another posting run (e.g. the GitHub Action) to finish
+
+# Posting state store (journaled JSON, or SQLite with DEV_STATE_BACKEND=sqlite)
+state_store = open_state_store(STATE_FILE)
+
+# Failed posts are queued in the state and retried by the scheduler loop
+retry_scheduler = RetryScheduler(state_store)
+
+# Persisted posting order; state["current_index"] is a cursor into it
+rotation_plan = RotationPlan(state_store)
+
+# Creates are journaled before they are sent, so a timed-out create is checked for, not re-sent blindly
+create_journal = CreateJournal(state_store)
 
 # Popular DEV.to tags by category
 POPULAR_TAGS = {
@@ -101,77 +122,53 @@ def load_config():
     """Load configuration from file or create default if not exists"""
     if os.path.exists(CONFIG_FILE):
         with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
+            config = json.load(f)
     else:
         # Default configuration
         config = {
             "weekday_times": ["13:00", "18:30"],  # 13:00 and 18:30 BST on weekdays
             "weekend_times": ["03:00", "07:00"],  # 03:00 and 07:00 BST on weekends
             "blog_content_dir": "blog_content",
-            "dev_api_url": "https://dev.to/api/articles",
+            "dev_api_url": f"{DEFAULT_BASE_URL}/articles",
             "cycle_posts": True,
             "post_delay_min": 5,
-            "post_delay_max": 15
+            "post_delay_max": 15,
+            "selection_strategy": "balanced",  # or "rotation" for plain round-robin
+            "category_weights": {},
+            "watch_content": True,  # inotify on Linux, polling elsewhere
+            "content_poll_interval": DEFAULT_POLL_INTERVAL,
+            "http_pool_size": DEFAULT_POOL_SIZE,  # pooled keep-alive connections to DEV.to
+            "rate_limits": DEFAULT_BUDGETS
         }
         with open(CONFIG_FILE, 'w') as f:
             json.dump(config, f, indent=2)
-        return config
+
+    # DEV_API_BASE_URL (e.g. the local emulator) wins over the configured endpoint
+    if os.environ.get(BASE_URL_ENV):
+        config["dev_api_url"] = f"{api_base_url()}/articles"
+    return config
 
 def load_state():
     """Load posting state from file or create default if not exists"""
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, 'r') as f:
-            return json.load(f)
-    else:
-        # Default state
-        state = {
-            "last_post_time": "",
-            "posted_articles": [],
-            "current_index": 0,
-            "total_posts": 0
-        }
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
-        return state
+    state = state_store.load()
+    # Create the default state file on first run
+    save_state(state)
+    return state
 
 def save_state(state):
-    """Save posting state to file"""
-    with open(STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    """Save posting state to file if it changed since the last save"""
+    state_store.flush(state)
 
 def find_all_blog_posts(blog_dir):
-    """Find all blog post markdown files in the directory structure"""
-    blog_posts = []
-
-    # Walk through all directories in the blog content directory
-    for root, dirs, files in os.walk(blog_dir):
-        for file in files:
-            if file == "blog_post.md":
-                # Get the full path to the blog post
-                post_path = os.path.join(root, file)
-
-                # Extract category and topic from path
-                path_parts = Path(post_path).parts
-                if len(path_parts) >= 3:
-                    category = path_parts[-3]  # e.g., 10_ocr_text_recognition
-                    topic = path_parts[-2]     # e.g., 01_ocr_technology
-
-                    blog_posts.append({
-                        "path": post_path,
-                        "category": category,
-                        "topic": topic
-                    })
+    """Find all blog posts through the content manifest (path, category, topic, title, hash)"""
+    blog_posts = find_blog_posts(blog_dir, manifest_file=MANIFEST_FILE)
 
     logger.info(f"Found {len(blog_posts)} blog posts")
     return blog_posts
 
 def extract_title_from_content(content):
-    """Extract the title from the blog post content (first h1)"""
-    lines = content.split('\n')
-    for line in lines:
-        if line.startswith('# '):
-            return line[2:].strip()
-    return "RevisePDF Blog Post"  # Default title if none found
+    """Extract the title from the blog post content (front matter title or first h1)"""
+    return content_metadata(content)["title"]
 
 def get_tags_for_category(category):
     """Get appropriate tags for the category"""
@@ -193,7 +190,7 @@ def get_tags_for_category(category):
     return DEFAULT_TAGS
 
 def post_to_dev(blog_post, config, state):
-    """Post a blog article to DEV.to"""
+    """Post a blog article to DEV.to, raising TransientPostingError for retryable failures"""
     if not API_KEY:
         logger.error("DEV_TO_API_KEY environment variable not set")
         return False
@@ -203,11 +200,12 @@ def post_to_dev(blog_post, config, state):
         with open(blog_post["path"], 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Extract title from content
-        title = extract_title_from_content(content)
+        # Extract title, tags, series and canonical URL (front matter or first h1)
+        metadata = content_metadata(content)
+        title = metadata["title"]
 
-        # Get tags for the category
-        tags = get_tags_for_category(blog_post["category"])
+        # Front matter tags win over the category tags
+        tags = metadata["tags"] or get_tags_for_category(blog_post["category"])
 
         # Prepare the article data
         article = {
@@ -216,9 +214,17 @@ def post_to_dev(blog_post, config, state):
                 "published": True,
                 "body_markdown": content,
                 "tags": tags,
-                "canonical_url": f"https://www.revisepdf.com/blog/{blog_post['category']}/{blog_post['topic']}"
+                "canonical_url": metadata["canonical_url"] or f"https://www.revisepdf.com/blog/{blog_post['category']}/{blog_post['topic']}"
             }
         }
+        if metadata["series"]:
+            article["article"]["series"] = metadata["series"]
+
+        # An earlier create of this article may have gone through before it timed out
+        fingerprint = article_fingerprint(article)
+        pending = create_journal.find(state, fingerprint, path=blog_post["path"])
+        if pending and confirm_pending_create(pending, blog_post, state):
+            return True
 
         # Post to DEV.to
         headers = {
@@ -226,43 +232,122 @@ def post_to_dev(blog_post, config, state):
             "Content-Type": "application/json"
         }
 
-        response = requests.post(
-            config["dev_api_url"],
-            headers=headers,
-            json=article
-        )
+        record = create_journal.begin(state, fingerprint, blog_post, title, article["article"]["canonical_url"])
+        try:
+            response = get_session().post(
+                config["dev_api_url"],
+                headers=headers,
+                json=article
+            )
+        except requests.exceptions.RequestException as e:
+            raise TransientPostingError(f"Request failed: {str(e)}")
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientPostingError(
+                f"HTTP {response.status_code}: {response.text}",
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
 
         if response.status_code == 201:
             logger.info(f"Successfully posted: {title}")
 
             # Update state
-            state["last_post_time"] = datetime.now().isoformat()
-            state["posted_articles"].append({
+            state_store.update(state, last_post_time=datetime.now().isoformat())
+            state_store.append_posted(state, {
                 "title": title,
                 "path": blog_post["path"],
                 "posted_at": datetime.now().isoformat(),
-                "dev_id": response.json().get("id", "")
+                "dev_id": response.json().get("id", ""),
+                "fingerprint": fingerprint
             })
+            create_journal.complete(state, record)
             save_state(state)
             return True
         else:
             logger.error(f"Failed to post article: {response.status_code} - {response.text}")
+            # Rejected outright, so nothing was created
+            create_journal.complete(state, record)
             return False
 
+    except TransientPostingError:
+        raise
     except Exception as e:
         logger.error(f"Error posting to DEV.to: {str(e)}")
         return False
 
-def get_next_blog_post(blog_posts, state):
-    """Get the next blog post to publish based on the current index"""
+def confirm_pending_create(pending, blog_post, state):
+    """Check the newest DEV.to articles for a create whose outcome is unknown; record it if it went through"""
+    try:
+        article = find_recent_article(
+            API_KEY,
+            title=pending["title"],
+            canonical_url=pending.get("canonical_url"),
+            since=pending["sent_at"]
+        )
+    except requests.exceptions.RequestException as e:
+        # Sending again without knowing could duplicate the article
+        raise TransientPostingError(f"Could not check for the earlier create of '{pending['title']}': {str(e)}")
+
+    if article is None:
+        logger.info(f"Earlier attempt to post '{pending['title']}' did not create it; sending it again")
+        return False
+
+    logger.info(f"Earlier attempt created '{article.get('title')}' (DEV.to id {article.get('id')}); recording it")
+    state_store.update(state, last_post_time=datetime.now().isoformat())
+    state_store.append_posted(state, {
+        "title": article.get("title") or pending["title"],
+        "path": blog_post["path"],
+        "posted_at": article.get("published_at") or datetime.now().isoformat(),
+        "dev_id": article.get("id", ""),
+        "fingerprint": pending["fingerprint"]
+    })
+    create_journal.complete(state, pending)
+    save_state(state)
+    return True
+
+def attempt_post(blog_post, config, state, persist=True):
+    """Post an article once, queueing a retry instead of sleeping if the failure is transient"""
+    try:
+        success = post_to_dev(blog_post, config, state)
+    except TransientPostingError as e:
+        job = retry_scheduler.schedule(state, blog_post, e, retry_after=e.retry_after)
+        if job:
+            logger.warning(f"Posting failed ({e}); retry {job['attempts']} scheduled for {job['next_attempt_at']}")
+        else:
+            logger.error(f"Posting failed ({e}); giving up after {retry_scheduler.max_attempts} attempts")
+        if persist:
+            save_state(state)
+        return False
+
+    retry_scheduler.clear(state, blog_post)
+    if persist or success:
+        save_state(state)
+    return success
+
+def get_next_blog_post(blog_posts, state, config=None, selector=None, persist=True):
+    """Get the next blog post to publish: category-balanced with a selector, else by the current index"""
     if not blog_posts:
         logger.error("No blog posts found")
         return None
 
+    if config is None:
+        config = load_config()
+
     # Update total posts count if needed
     if state["total_posts"] != len(blog_posts):
         state["total_posts"] = len(blog_posts)
 
+    if selector is not None:
+        # Cycling reposts indefinitely, so only skip posted articles when it is disabled
+        if config["cycle_posts"]:
+            is_posted = lambda blog_post: False
+        else:
+            is_posted = lambda blog_post: state["posted_articles"].contains(path=blog_post["path"])
+        for _, next_post in selector.candidates(state, blog_posts, is_posted):
+            return next_post
+        logger.info("All posts have been published and cycling is disabled")
+        return None
+
     # Get the next post
     if state["current_index"] >= len(blog_posts):
         if config["cycle_posts"]:
@@ -271,65 +356,251 @@ def get_next_blog_post(blog_posts, state):
             logger.info("All posts have been published and cycling is disabled")
             return None
 
-    next_post = blog_posts[state["current_index"]]
-    state["current_index"] += 1
-    save_state(state)
+    # The post at the plan cursor; blog_posts is in plan order (rotation_plan.sync)
+    next_post = rotation_plan.next_post(state, blog_posts)
+    if persist:
+        state_store.update(state, current_index=state["current_index"] + 1, total_posts=state["total_posts"])
+        save_state(state)
+    else:
+        # Left to the caller's next save, so the journal never runs ahead of the in-memory state
+        state["current_index"] += 1
+        state_store.mark_dirty()
 
     return next_post
 
-def post_scheduled_article():
-    """Function to be called by the scheduler to post an article"""
-    logger.info("Running scheduled post")
-
-    # Load the latest state
-    state = load_state()
-    config = load_config()
+def build_selector(config):
+    """Build the category-balanced selector, or None when plain rotation is configured"""
+    if config.get("selection_strategy", "balanced") != "balanced":
+        return None
+    return CategoryBalancedSelector(
+        state_store,
+        category_weights=config.get("category_weights"),
+        recency_weight=config.get("recency_weight", DEFAULT_RECENCY_WEIGHT),
+        age_weight=config.get("age_weight", DEFAULT_AGE_WEIGHT)
+    )
 
-    # Find all blog posts
-    blog_posts = find_all_blog_posts(config["blog_content_dir"])
+def publish_next_article(blog_posts, state, config, persist=True):
+    """Pick the next article and post it; with persist=False the state is only saved after a successful post"""
+    selector = build_selector(config)
 
     # Get the next blog post to publish
-    next_post = get_next_blog_post(blog_posts, state)
-    if next_post:
-        # Post to DEV.to
-        success = post_to_dev(next_post, config, state)
-
-        if success:
-            # Add a random delay before the next post (if this is called multiple times in succession)
-            delay = random.randint(config["post_delay_min"], config["post_delay_max"])
-            logger.info(f"Posted successfully. Next post will be in {delay} seconds if scheduled.")
-            time.sleep(delay)
-        else:
-            logger.error("Failed to post article")
-    else:
+    next_post = get_next_blog_post(blog_posts, state, config, selector, persist=persist)
+    if not next_post:
         logger.error("No blog post available to publish")
+        return False
 
-def setup_schedule(config):
-    """Set up the posting schedule based on configuration"""
-    # Weekday schedule (Monday=0, Sunday=6)
-    for time_str in config["weekday_times"]:
-        schedule.every().monday.at(time_str).do(post_scheduled_article)
-        schedule.every().tuesday.at(time_str).do(post_scheduled_article)
-        schedule.every().wednesday.at(time_str).do(post_scheduled_article)
-        schedule.every().thursday.at(time_str).do(post_scheduled_article)
-        schedule.every().friday.at(time_str).do(post_scheduled_article)
-
-    # Weekend schedule
-    for time_str in config["weekend_times"]:
-        schedule.every().saturday.at(time_str).do(post_scheduled_article)
-        schedule.every().sunday.at(time_str).do(post_scheduled_article)
-
-    logger.info("Schedule set up successfully")
+    # Post to DEV.to
+    success = attempt_post(next_post, config, state, persist=persist)
+    if success:
+        if selector is not None:
+            selector.record_posted(state, blog_posts, next_post)
+            save_state(state)
+        logger.info("Posted successfully")
+    else:
+        logger.error("Failed to post article")
+        # Unless a retry is queued it failed for good: move past it, or every slot picks it again
+        if selector is not None and not retry_scheduler.queued(state, next_post):
+            selector.record_skipped(state, blog_posts, next_post)
+    return success
+
+class PostingService:
+    """
+    Resident posting service: config, state and the content manifest stay in memory.
+
+    Between posts each of them costs a stat to check: the config and state
+    files are reloaded only when their mtime or size changes. The content
+    manifest is kept live by a ContentWatcher (inotify, or polling), so
+    posting never walks the content tree and new posts are eligible within
+    seconds; with watch_content off it is refreshed at post time instead,
+    relisting only directories whose mtime changed. State changes are
+    journaled as they happen, but the state file is only rewritten after a
+    successful post.
+    """
+
+    def __init__(self):
+        """Initialize the PostingService class."""
+        self.config_file = ReloadingFile(CONFIG_FILE, load_config)
+        self.state_file = ReloadingFile(state_store.state_file, state_store.load)
+        self.manifest = None
+        self.watcher = None
+        self.blog_posts = []
+        self._synced = None
+        self._posts_version = None
+        self._http_settings = None
+        # Share one pooled keep-alive connection and one rate-limit budget across all DEV.to calls
+        self.config()
+
+    def config(self):
+        """Get the configuration, reloading it if the file changed"""
+        if self.config_file.loaded and self.config_file.changed():
+            logger.info(f"{CONFIG_FILE} changed, reloading")
+        config = self.config_file.get()
+        self.configure_http(config)
+        return config
 
-def run_scheduler():
-    """Run the scheduler continuously"""
-    logger.info("Starting scheduler")
+    def configure_http(self, config):
+        """Configure the shared session, replacing it only when http_pool_size or rate_limits changed"""
+        settings = (config.get("http_pool_size", DEFAULT_POOL_SIZE), config.get("rate_limits"))
+        if settings != self._http_settings:
+            configure_session(pool_size=settings[0], rate_limits=settings[1])
+            self._http_settings = settings
+
+    def state(self):
+        """Get the posting state, reloading it if the file was changed by another process"""
+        if self.state_file.loaded and self.state_file.changed():
+            logger.info(f"{self.state_file.path} changed, reloading")
+        return self.state_file.get()
+
+    def refresh_posts(self, state, config):
+        """Get the blog posts in rotation order, relisting only changed content directories"""
+        blog_dir = config["blog_content_dir"]
+        watch = config.get("watch_content", True)
+        if self.manifest is None or self.manifest.blog_dir != blog_dir or (self.watcher is not None) != watch:
+            self.stop()
+            self.manifest = ContentManifest(blog_dir, manifest_file=MANIFEST_FILE)
+            if watch:
+                self.watcher = ContentWatcher(self.manifest, poll_interval=config.get("content_poll_interval", DEFAULT_POLL_INTERVAL))
+                backend = self.watcher.start()
+                logger.info(f"Watching {blog_dir} for changes ({backend})")
+            else:
+                self.manifest.load()
+            self._posts_version = None
+
+        if self.watcher is not None:
+            version, posts = self.watcher.posts()
+        else:
+            if self.manifest.refresh():
+                self.manifest.save()
+                self._posts_version = None
+            version, posts = 0, None
+
+        # Re-sync the rotation plan when the content changed or the state was reloaded
+        if version != self._posts_version or self._synced is not state:
+            if posts is None:
+                posts = self.manifest.posts()
+            self.blog_posts = rotation_plan.sync(state, posts)
+            self._synced = state
+            self._posts_version = version
+            logger.info(f"Found {len(self.blog_posts)} blog posts")
+        return self.blog_posts
+
+    def stop(self):
+        """Stop watching the content directory"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def persist(self, state):
+        """Write the state file and remember its new mtime so the write is not taken for an outside edit"""
+        save_state(state)
+        self.state_file.mark()
+
+    def next_retry_at(self):
+        """Get the time the next queued retry becomes due, or None"""
+        return retry_scheduler.next_due_at(self.state())
+
+    def retry_due_articles(self):
+        """Retry queued articles whose retry time has passed"""
+        try:
+            with state_store.lock.exclusive(timeout=RUN_LOCK_TIMEOUT):
+                # Inside the lock, so changes made by another run are reloaded first
+                state = self.state()
+                config = self.config()
+                for job in retry_scheduler.due(state):
+                    logger.info(f"Retrying {job['post']['path']} (attempt {job['attempts'] + 1})")
+                    if attempt_post(job["post"], config, state, persist=False):
+                        self.persist(state)
+                    elif not retry_scheduler.queued(state, job["post"]):
+                        # Dropped after its last attempt: move the selector past it
+                        selector = build_selector(config)
+                        if selector is not None:
+                            selector.record_skipped(state, self.refresh_posts(state, config), job["post"])
+        except LockTimeout as e:
+            logger.warning(f"Skipping retries, another posting run holds the state lock: {e}")
+
+    def post_scheduled_article(self):
+        """Post the next article from the in-memory state"""
+        logger.info("Running scheduled post")
+        try:
+            with state_store.lock.exclusive(timeout=RUN_LOCK_TIMEOUT):
+                state = self.state()
+                config = self.config()
+                blog_posts = self.refresh_posts(state, config)
+                if publish_next_article(blog_posts, state, config, persist=False):
+                    self.persist(state)
+        except LockTimeout as e:
+            logger.warning(f"Skipping this slot, another posting run holds the state lock: {e}")
+
+def build_timetable(config):
+    """Build the posting timetable; the random post delay is an offset on each slot, not a sleep after posting"""
+    return PostingTimetable(
+        config["weekday_times"],
+        config["weekend_times"],
+        jitter_min=config.get("post_delay_min", 0),
+        jitter_max=config.get("post_delay_max", 0)
+    )
+
+def configure_logging():
+    """Log to dev_posting.log and stdout; done when the service starts, not on import"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("dev_posting.log"),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+def run_scheduler(config):
+    """Sleep until the next posting slot or due retry instead of polling every minute"""
+    service = PostingService()
+    # Start watching the content now so the first post does not have to scan it
+    service.refresh_posts(service.state(), service.config())
+    timetable = build_timetable(config)
+    slot, run_at = timetable.next_run(datetime.now())
+    if slot is None:
+        logger.error("No valid weekday_times or weekend_times configured")
+        return
+
+    logger.info(f"Starting scheduler. Next post at {run_at:%Y-%m-%d %H:%M:%S} (slot {slot:%H:%M})")
 
     while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+        retry_at = service.next_retry_at()
+        wake_at = min(run_at, datetime.now() + timedelta(seconds=RELOAD_CHECK_INTERVAL))
+        sleep_until(wake_at if retry_at is None else min(wake_at, retry_at))
+
+        # A changed timetable takes effect without waiting for the old slot
+        if service.config_file.changed():
+            config = service.config()
+            reloaded = build_timetable(config)
+            if (reloaded.weekday_times, reloaded.weekend_times) != (timetable.weekday_times, timetable.weekend_times):
+                timetable = reloaded
+                slot, run_at = timetable.next_run(datetime.now())
+                if slot is None:
+                    logger.error("No valid weekday_times or weekend_times configured")
+                    return
+                logger.info(f"Timetable changed. Next post at {run_at:%Y-%m-%d %H:%M:%S} (slot {slot:%H:%M})")
+                continue
+            timetable = reloaded
+
+        if retry_at is not None and datetime.now() >= retry_at:
+            service.retry_due_articles()
+
+        if datetime.now() >= run_at:
+            service.post_scheduled_article()
+            # Schedule from the current time: slots missed while posting or
+            # suspended are skipped rather than run back to back
+            slot, run_at = timetable.next_run(datetime.now())
+            logger.info(f"Next post at {run_at:%Y-%m-%d %H:%M:%S} (slot {slot:%H:%M})")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Post blog articles to DEV.to on the configured timetable")
+    # A profiled service writes its profile when stopped (Ctrl+C or SIGTERM)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    configure_logging()
+
     if not API_KEY:
         logger.error("DEV_TO_API_KEY environment variable not set. Please set it before running this script.")
         sys.exit(1)
@@ -337,8 +608,6 @@ if __name__ == "__main__":
     # Load configuration
     config = load_config()
 
-    # Set up the schedule
-    setup_schedule(config)
-
     # Run the scheduler
-    run_scheduler()
+    with profiled(args.profile, args.profile_dir, name="dev_poster_profile"):
+        run_scheduler(config)
@@ -4,7 +4,6 @@ Module for managing blog content.
 import os
 import json
 from datetime import datetime
-from devto.api import DevToAPI
 
 
 class ContentManager:
@@ -20,10 +19,25 @@ class ContentManager:
             content_dir (str, optional): The directory to store content. Defaults to "content".
         """
         self.content_dir = content_dir
-        self.devto_api = DevToAPI()
+        self._devto_api = None
 
-        # Create the content directory if it doesn't exist
-        os.makedirs(self.content_dir, exist_ok=True)
+    @property
+    def devto_api(self):
+        """
+        The Dev.to API client, created on first use so listing drafts needs neither requests nor an API key.
+
+        Returns:
+            DevToAPI: The API client.
+        """
+        if self._devto_api is None:
+            from devto.api import DevToAPI
+            self._devto_api = DevToAPI()
+        return self._devto_api
+
+    def _ensure_directories(self):
+        """
+        Create the content directories if they don't exist.
+        """
         os.makedirs(os.path.join(self.content_dir, "drafts"), exist_ok=True)
         os.makedirs(os.path.join(self.content_dir, "published"), exist_ok=True)
 
@@ -77,6 +91,7 @@ class ContentManager:
         }
 
         # Determine the directory to save the post
+        self._ensure_directories()
         save_dir = os.path.join(self.content_dir, "published" if publish else "drafts")
 
         # Create a filename based on the title
@@ -101,6 +116,7 @@ class ContentManager:
             dict: The response from the Dev.to API.
         """
         # Find the post locally
+        self._ensure_directories()
         draft_dir = os.path.join(self.content_dir, "drafts")
         published_dir = os.path.join(self.content_dir, "published")
 
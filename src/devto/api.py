@@ -5,12 +5,13 @@ import os
 import requests
 from dotenv import load_dotenv
 
+from devto.session import api_base_url, get_session
+
 # Load environment variables
 load_dotenv()
 
 # Constants
 API_KEY = os.getenv("DEVTO_API_KEY")
-BASE_URL = "https://dev.to/api"
 
 
 class DevToAPI:
@@ -18,17 +19,22 @@ class DevToAPI:
     Class for interacting with the Dev.to API.
     """
 
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, session=None, base_url=None):
         """
         Initialize the DevToAPI class.
 
         Args:
             api_key (str, optional): The Dev.to API key. Defaults to None.
+            session (requests.Session, optional): The HTTP session to use. Defaults to the shared pooled session.
+            base_url (str, optional): The Dev.to API base URL. Defaults to DEV_API_BASE_URL or the public API.
         """
         self.api_key = api_key or API_KEY
         if not self.api_key:
             raise ValueError("Dev.to API key is required")
 
+        self.session = session or get_session()
+        self.base_url = (base_url or api_base_url()).rstrip("/")
+
         self.headers = {
             "api-key": self.api_key,
             "Content-Type": "application/json",
@@ -51,8 +57,33 @@ class DevToAPI:
             params["username"] = username
 
         try:
-            response = requests.get(
-                f"{BASE_URL}/articles", headers=self.headers, params=params
+            response = self.session.get(
+                f"{self.base_url}/articles", headers=self.headers, params=params
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            print(f"Dev.to API Error: {e}")
+            print(f"Response: {response.text}")
+            # Return a dummy response to avoid breaking the flow
+            return {"error": str(e), "status": response.status_code}
+
+    def get_my_articles(self, page=1, per_page=30):
+        """
+        Get the published articles of the authenticated user.
+
+        Args:
+            page (int, optional): The page number. Defaults to 1.
+            per_page (int, optional): The number of articles per page. Defaults to 30.
+
+        Returns:
+            list: The response from the API.
+        """
+        params = {"page": page, "per_page": per_page}
+
+        try:
+            response = self.session.get(
+                f"{self.base_url}/articles/me", headers=self.headers, params=params
             )
             response.raise_for_status()
             return response.json()
@@ -91,8 +122,8 @@ class DevToAPI:
             data["article"]["series"] = series
 
         try:
-            response = requests.post(
-                f"{BASE_URL}/articles", headers=self.headers, json=data
+            response = self.session.post(
+                f"{self.base_url}/articles", headers=self.headers, json=data
             )
             response.raise_for_status()
             return response.json()
@@ -135,8 +166,8 @@ class DevToAPI:
             data["article"]["series"] = series
 
         try:
-            response = requests.put(
-                f"{BASE_URL}/articles/{article_id}", headers=self.headers, json=data
+            response = self.session.put(
+                f"{self.base_url}/articles/{article_id}", headers=self.headers, json=data
             )
             response.raise_for_status()
             return response.json()
@@ -157,8 +188,8 @@ class DevToAPI:
             dict: The response from the API.
         """
         try:
-            response = requests.get(
-                f"{BASE_URL}/articles/{article_id}", headers=self.headers
+            response = self.session.get(
+                f"{self.base_url}/articles/{article_id}", headers=self.headers
             )
             response.raise_for_status()
             return response.json()
@@ -0,0 +1,175 @@
+"""
+Module for interacting with the Dev.to API from asyncio code.
+"""
+import asyncio
+
+from devto.api import DevToAPI
+
+# Constants
+DEFAULT_CONCURRENCY = 4
+
+
+class AsyncDevToAPI:
+    """
+    Asyncio counterpart of DevToAPI with a bound on concurrent requests.
+
+    Each call runs the matching DevToAPI method in a worker thread over the
+    shared pooled session, so independent reads (page fetches, per-article
+    lookups) overlap while at most `concurrency` requests are in flight.
+    Keep the session pool size at least as large as the concurrency.
+    """
+
+    def __init__(self, api_key=None, concurrency=DEFAULT_CONCURRENCY, session=None, base_url=None):
+        """
+        Initialize the AsyncDevToAPI class.
+
+        Args:
+            api_key (str, optional): The Dev.to API key. Defaults to None.
+            concurrency (int, optional): The maximum number of requests in flight. Defaults to DEFAULT_CONCURRENCY.
+            session (requests.Session, optional): The HTTP session to use. Defaults to the shared pooled session.
+            base_url (str, optional): The Dev.to API base URL. Defaults to DEV_API_BASE_URL or the public API.
+        """
+        self.api = DevToAPI(api_key=api_key, session=session, base_url=base_url)
+        self.concurrency = concurrency
+        self._semaphore = None
+
+    async def _call(self, method, *args, **kwargs):
+        """
+        Run a blocking DevToAPI method in a thread once a concurrency slot is free.
+        """
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def get_articles(self, username=None, page=1, per_page=30):
+        """
+        Get articles from Dev.to.
+
+        Args:
+            username (str, optional): The username to filter by. Defaults to None.
+            page (int, optional): The page number. Defaults to 1.
+            per_page (int, optional): The number of articles per page. Defaults to 30.
+
+        Returns:
+            dict: The response from the API.
+        """
+        return await self._call(self.api.get_articles, username=username, page=page, per_page=per_page)
+
+    async def get_my_articles(self, page=1, per_page=30):
+        """
+        Get the published articles of the authenticated user.
+
+        Args:
+            page (int, optional): The page number. Defaults to 1.
+            per_page (int, optional): The number of articles per page. Defaults to 30.
+
+        Returns:
+            list: The response from the API.
+        """
+        return await self._call(self.api.get_my_articles, page=page, per_page=per_page)
+
+    async def create_article(self, title, body_markdown, published=False, tags=None, series=None):
+        """
+        Create an article on Dev.to.
+
+        Args:
+            title (str): The title of the article.
+            body_markdown (str): The body of the article in markdown format.
+            published (bool, optional): Whether to publish the article. Defaults to False.
+            tags (list, optional): A list of tags for the article. Defaults to None.
+            series (str, optional): The series the article belongs to. Defaults to None.
+
+        Returns:
+            dict: The response from the API.
+        """
+        return await self._call(
+            self.api.create_article,
+            title=title,
+            body_markdown=body_markdown,
+            published=published,
+            tags=tags,
+            series=series
+        )
+
+    async def update_article(self, article_id, title=None, body_markdown=None, published=None, tags=None, series=None):
+        """
+        Update an article on Dev.to.
+
+        Args:
+            article_id (int): The ID of the article to update.
+            title (str, optional): The new title of the article. Defaults to None.
+            body_markdown (str, optional): The new body of the article in markdown format. Defaults to None.
+            published (bool, optional): Whether to publish the article. Defaults to None.
+            tags (list, optional): A list of tags for the article. Defaults to None.
+            series (str, optional): The series the article belongs to. Defaults to None.
+
+        Returns:
+            dict: The response from the API.
+        """
+        return await self._call(
+            self.api.update_article,
+            article_id,
+            title=title,
+            body_markdown=body_markdown,
+            published=published,
+            tags=tags,
+            series=series
+        )
+
+    async def get_article(self, article_id):
+        """
+        Get an article from Dev.to.
+
+        Args:
+            article_id (int): The ID of the article to get.
+
+        Returns:
+            dict: The response from the API.
+        """
+        return await self._call(self.api.get_article, article_id)
+
+    async def get_all_my_articles(self, per_page=100):
+        """
+        Get every published article of the authenticated user.
+
+        Pages are requested in parallel windows of `concurrency` pages until a
+        short or empty page (or an error) marks the end of the listing.
+
+        Args:
+            per_page (int, optional): The number of articles per page. Defaults to 100.
+
+        Returns:
+            list: The articles, newest first.
+        """
+        articles = []
+        first_page = 1
+        while True:
+            pages = range(first_page, first_page + self.concurrency)
+            results = await asyncio.gather(
+                *(self.get_my_articles(page=page, per_page=per_page) for page in pages)
+            )
+
+            for result in results:
+                if not isinstance(result, list):
+                    # Error response: keep what we have
+                    return articles
+                articles.extend(result)
+                if len(result) < per_page:
+                    return articles
+
+            first_page += self.concurrency
+
+    async def get_articles_by_ids(self, article_ids):
+        """
+        Get several articles from Dev.to in parallel.
+
+        Args:
+            article_ids (list): The IDs of the articles to get.
+
+        Returns:
+            list: The responses from the API, in the order of article_ids.
+        """
+        return await asyncio.gather(*(self.get_article(article_id) for article_id in article_ids))
@@ -0,0 +1,631 @@
+"""
+Module for an offline, in-memory stand-in for the Dev.to API.
+
+Run it with `python -m devto.emulator` (from src/) and point the posting
+scripts at it with DEV_API_BASE_URL=http://127.0.0.1:3000/api. Nothing is
+stored on disk and no request leaves the machine.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 3000
+API_PREFIX = "/api"
+CONTROL_PREFIX = "/__emulator"
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 1000
+MAX_TAGS = 4
+DEFAULT_RETRY_AFTER = 1          # seconds announced on injected 429s
+SERVER_ERRORS = (500, 502, 503)
+CANONICAL_URL_TAKEN = "Canonical url has already been taken"
+
+
+def _now():
+    """
+    The current UTC time as an ISO timestamp, the way Dev.to writes it.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _slugify(title, article_id):
+    """
+    Build the slug of an article from its title and id.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") or "article"
+    return f"{slug[:80]}-{article_id:x}"
+
+
+def _tag_list(tags):
+    """
+    Normalize tags given as a list or a comma-separated string.
+    """
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return [str(tag).strip().lower() for tag in tags or [] if str(tag).strip()]
+
+
+class EmulatorError(Exception):
+    """
+    An API error answered with a status code and a Dev.to-style JSON body.
+    """
+
+    def __init__(self, status, message, headers=None):
+        """
+        Initialize the EmulatorError class.
+
+        Args:
+            status (int): The HTTP status code.
+            message (str): The error message.
+            headers (dict, optional): Extra response headers. Defaults to None.
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class WindowLimiter:
+    """
+    Fixed-window request limit per API key: `requests` per `per_seconds` seconds.
+    """
+
+    def __init__(self, requests, per_seconds, clock=time.monotonic):
+        """
+        Initialize the WindowLimiter class.
+
+        Args:
+            requests (int): Requests allowed per window.
+            per_seconds (float): The window length in seconds.
+            clock (callable, optional): Monotonic clock. Defaults to time.monotonic.
+        """
+        self.requests = requests
+        self.per_seconds = per_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.windows = {}   # api key -> (window start, count)
+
+    def check(self, key):
+        """
+        Count a request against its key's window.
+
+        Args:
+            key (str): The API key.
+
+        Returns:
+            float: 0 if the request is allowed, else the seconds until the window resets.
+        """
+        now = self.clock()
+        with self.lock:
+            start, count = self.windows.get(key, (now, 0))
+            if now - start >= self.per_seconds:
+                start, count = now, 0
+            if count >= self.requests:
+                return max(0.001, self.per_seconds - (now - start))
+            self.windows[key] = (start, count + 1)
+            return 0
+
+
+class DevToEmulator:
+    """
+    In-memory Dev.to API serving the endpoints the posting scripts use.
+
+    Implements POST/GET /api/articles, GET /api/articles/me (and its
+    /published, /unpublished and /all variants), GET/PUT /api/articles/{id}
+    and GET /api/users/me. Every API key is its own user. Canonical URLs
+    are unique across articles, as on Dev.to, and a clash is answered with
+    the same 422 the real API gives.
+
+    Faults are injected per request: a fixed latency plus random jitter,
+    429s with a Retry-After header (at random with throttle_rate, or when a
+    key exceeds rate_limits), 5xx responses with error_rate, and, with
+    lost_response_rate, creates that succeed but answer with a 5xx as a
+    timed-out gateway would. GET /__emulator/stats reports what was served
+    and POST /__emulator/reset clears the articles and counters.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, latency=0.0, jitter=0.0, error_rate=0.0,
+                 throttle_rate=0.0, retry_after=DEFAULT_RETRY_AFTER, rate_limits=None,
+                 lost_response_rate=0.0, seed=None):
+        """
+        Initialize the DevToEmulator class.
+
+        Args:
+            host (str, optional): The interface to listen on. Defaults to DEFAULT_HOST.
+            port (int, optional): The port to listen on; 0 picks a free one. Defaults to DEFAULT_PORT.
+            latency (float, optional): Seconds added to every response. Defaults to 0.
+            jitter (float, optional): Up to this many more seconds, at random. Defaults to 0.
+            error_rate (float, optional): Share of API requests answered with a 5xx. Defaults to 0.
+            throttle_rate (float, optional): Share of API requests answered with a 429. Defaults to 0.
+            retry_after (float, optional): Retry-After seconds sent with injected 429s. Defaults to DEFAULT_RETRY_AFTER.
+            rate_limits (dict, optional): "read"/"write" to {"requests": int, "per_seconds": float}, enforced per API key. Defaults to no limits.
+            lost_response_rate (float, optional): Share of creates that are stored but answered with a 5xx. Defaults to 0.
+            seed (int, optional): Seed for the fault injection, for repeatable runs. Defaults to None.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.lost_response_rate = lost_response_rate
+        self.random = random.Random(seed)
+        self.limiters = {
+            kind: WindowLimiter(int(budget["requests"]), float(budget["per_seconds"]))
+            for kind, budget in (rate_limits or {}).items()
+        }
+        self.lock = threading.Lock()
+        self.server = None
+        self._thread = None
+        self.reset()
+
+    @property
+    def base_url(self):
+        """
+        The API base URL to set as DEV_API_BASE_URL.
+        """
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    def reset(self):
+        """
+        Drop every article, user and counter.
+        """
+        with self.lock:
+            self.articles = {}
+            self.users = {}
+            self.canonical_urls = {}
+            self.next_id = 1
+            self._listings = {}
+            self.stats = {"requests": 0, "created": 0, "by_status": {}, "by_route": {}}
+
+    def seed(self, api_key, articles):
+        """
+        Store existing articles for an account without going through the API, e.g. its posting history.
+
+        Args:
+            api_key (str): The API key of the account.
+            articles (list): Article fields as sent to POST /api/articles, optionally with published_at.
+
+        Returns:
+            list: The ids of the stored articles.
+        """
+        user = self._user(api_key)
+        ids = []
+        with self.lock:
+            for fields in articles:
+                fields = dict({"title": ""}, **fields)
+                ids.append(self._store(user, fields, self._validate(fields))["id"])
+        return ids
+
+    def start(self):
+        """
+        Start serving in a daemon thread.
+
+        Returns:
+            str: The API base URL.
+        """
+        self.server = ThreadingHTTPServer((self.host, self.port), _handler_for(self))
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="devto-emulator", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """
+        Stop serving and close the listening socket.
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle(self, method, path, query, headers, body):
+        """
+        Answer one API request.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path, without the query string.
+            query (dict): The query parameters (first value of each).
+            headers (Message): The request headers.
+            body (bytes): The request body.
+
+        Returns:
+            tuple: (status, payload, headers); payload is JSON-serializable or None.
+        """
+        if path.startswith(CONTROL_PREFIX):
+            return self._control(method, path[len(CONTROL_PREFIX):])
+
+        route = None
+        try:
+            if not path.startswith(f"{API_PREFIX}/"):
+                raise EmulatorError(404, "Not Found")
+            route, handler, params = self._route(method, path[len(API_PREFIX):])
+            user = self._user(headers.get("api-key"), required=route != "GET /articles")
+            self._inject_faults(method, headers.get("api-key") or "anonymous")
+
+            data = {}
+            if body:
+                try:
+                    data = json.loads(body)
+                except ValueError:
+                    raise EmulatorError(400, "Invalid JSON body")
+            status, payload, extra = handler(user, query, data, *params)
+
+            etag = None
+            if method == "GET" and status == 200:
+                digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+                etag = f'W/"{digest}"'
+                if headers.get("If-None-Match") == etag:
+                    status, payload = 304, None
+                extra = dict(extra, ETag=etag)
+        except EmulatorError as e:
+            status, payload, extra = e.status, {"error": e.message, "status": e.status}, e.headers
+
+        self._count(route or "unknown", status)
+        return status, payload, extra
+
+    def _route(self, method, path):
+        """
+        Find the handler of a request.
+
+        Returns:
+            tuple: (route name, handler, path parameters).
+        """
+        path = path.rstrip("/")
+        routes = [
+            ("GET", "/articles", r"/articles", self._list_published),
+            ("POST", "/articles", r"/articles", self._create),
+            ("GET", "/articles/me", r"/articles/me(?:/(published|unpublished|all))?", self._list_mine),
+            ("GET", "/articles/{id}", r"/articles/(\d+)", self._get),
+            ("PUT", "/articles/{id}", r"/articles/(\d+)", self._update),
+            ("GET", "/users/me", r"/users/me", self._me),
+        ]
+        path_matched = False
+        for route_method, name, pattern, handler in routes:
+            match = re.fullmatch(pattern, path)
+            if not match:
+                continue
+            path_matched = True
+            if route_method == method:
+                return f"{method} {name}", handler, match.groups()
+        if path_matched:
+            raise EmulatorError(405, "Method Not Allowed")
+        raise EmulatorError(404, "Not Found")
+
+    def _user(self, api_key, required=True):
+        """
+        Get (or create) the user of an API key.
+        """
+        if not api_key:
+            if required:
+                raise EmulatorError(401, "unauthorized")
+            return None
+        with self.lock:
+            if api_key not in self.users:
+                user_id = len(self.users) + 1
+                self.users[api_key] = {
+                    "type_of": "user",
+                    "id": user_id,
+                    "username": f"emulated_user_{user_id}",
+                    "name": f"Emulated User {user_id}",
+                    "joined_at": _now(),
+                }
+            return self.users[api_key]
+
+    def _inject_faults(self, method, key):
+        """
+        Sleep for the configured latency, then raise the injected 429 or 5xx, if any.
+        """
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        limiter = self.limiters.get("read" if method == "GET" else "write")
+        wait = limiter.check(key) if limiter else 0
+        if wait:
+            seconds = max(1, int(wait + 0.999))
+            raise EmulatorError(429, f"Rate limit reached, try again in {seconds} seconds",
+                                {"Retry-After": str(seconds)})
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            seconds = max(1, int(self.retry_after + 0.999))
+            raise EmulatorError(429, f"Rate limit reached, try again in {seconds} seconds",
+                                {"Retry-After": str(seconds)})
+        if self.error_rate and self.random.random() < self.error_rate:
+            status = self.random.choice(SERVER_ERRORS)
+            raise EmulatorError(status, "Injected server error")
+
+    def _count(self, route, status):
+        """
+        Record a served request in the stats.
+        """
+        with self.lock:
+            self.stats["requests"] += 1
+            by_status = self.stats["by_status"]
+            by_status[str(status)] = by_status.get(str(status), 0) + 1
+            by_route = self.stats["by_route"]
+            by_route[route] = by_route.get(route, 0) + 1
+
+    def _control(self, method, path):
+        """
+        Answer the emulator's own stats and reset endpoints.
+        """
+        if method == "GET" and path == "/stats":
+            with self.lock:
+                stats = json.loads(json.dumps(self.stats))
+                stats["articles"] = len(self.articles)
+            return 200, stats, {}
+        if method == "POST" and path == "/reset":
+            self.reset()
+            return 204, None, {}
+        return 404, {"error": "Not Found", "status": 404}, {}
+
+    def _view(self, article):
+        """
+        Render a stored article the way the API returns it.
+        """
+        view = dict(article)
+        view["tags"] = ", ".join(article["tag_list"])
+        view["user"] = {key: article["user"][key] for key in ("name", "username")}
+        return view
+
+    def _page(self, articles, query):
+        """
+        Slice a list of articles by the page and per_page query parameters.
+        """
+        try:
+            page = max(1, int(query.get("page", 1)))
+            per_page = min(MAX_PER_PAGE, max(1, int(query.get("per_page", DEFAULT_PER_PAGE))))
+        except ValueError:
+            raise EmulatorError(400, "page and per_page must be integers")
+        start = (page - 1) * per_page
+        return [self._view(article) for article in articles[start:start + per_page]]
+
+    def _newest_first(self, articles):
+        """
+        Order articles as Dev.to lists them: newest published first.
+        """
+        return sorted(articles, key=lambda article: (article["published_at"] or "", article["id"]), reverse=True)
+
+    def _listing(self, key, build):
+        """
+        Get a sorted listing, building it once per change to the articles; the caller holds the lock.
+        """
+        if key not in self._listings:
+            self._listings[key] = build()
+        return self._listings[key]
+
+    def _list_published(self, user, query, data):
+        username = query.get("username")
+
+        def build():
+            articles = [article for article in self.articles.values() if article["published"]]
+            if username:
+                articles = [article for article in articles if article["user"]["username"] == username]
+            return self._newest_first(articles)
+
+        with self.lock:
+            return 200, self._page(self._listing(("published", username), build), query), {}
+
+    def _list_mine(self, user, query, data, scope=None):
+        def build():
+            mine = [article for article in self.articles.values() if article["user"]["id"] == user["id"]]
+            drafts = sorted((article for article in mine if not article["published"]),
+                            key=lambda article: article["id"], reverse=True)
+            published = self._newest_first(article for article in mine if article["published"])
+            if scope == "unpublished":
+                return drafts
+            if scope == "all":
+                # Drafts come first, then published articles newest first
+                return drafts + published
+            return published
+
+        with self.lock:
+            return 200, self._page(self._listing((user["id"], scope), build), query), {}
+
+    def _get(self, user, query, data, article_id):
+        with self.lock:
+            article = self.articles.get(int(article_id))
+            if article is None or (not article["published"] and article["user"]["id"] != user["id"]):
+                raise EmulatorError(404, "not found")
+            return 200, self._view(article), {}
+
+    def _me(self, user, query, data):
+        return 200, dict(user), {}
+
+    def _validate(self, fields, article_id=None):
+        """
+        Check an article payload and return its canonical URL, if one was given.
+        """
+        if "title" in fields and not str(fields["title"] or "").strip():
+            raise EmulatorError(422, "Title can't be blank")
+        if len(_tag_list(fields.get("tags"))) > MAX_TAGS:
+            raise EmulatorError(422, f"Tag list exceed the maximum of {MAX_TAGS} tags")
+        canonical_url = fields.get("canonical_url")
+        owner = self.canonical_urls.get(canonical_url) if canonical_url else None
+        if owner is not None and owner != article_id:
+            raise EmulatorError(422, CANONICAL_URL_TAKEN)
+        return canonical_url
+
+    def _create(self, user, query, data):
+        fields = data.get("article")
+        if not isinstance(fields, dict):
+            raise EmulatorError(422, "param is missing or the value is empty: article")
+        fields = dict({"title": ""}, **fields)
+
+        with self.lock:
+            article = self._store(user, fields, self._validate(fields))
+            self.stats["created"] += 1
+            view = self._view(article)
+
+        if self.lost_response_rate and self.random.random() < self.lost_response_rate:
+            # The article exists, but the client never hears about it
+            raise EmulatorError(504, "Gateway Timeout")
+        return 201, view, {"Location": f"{API_PREFIX}/articles/{article['id']}"}
+
+    def _store(self, user, fields, canonical_url):
+        """
+        Store a new article; the caller holds the lock and has validated the fields.
+        """
+        article_id = self.next_id
+        self.next_id += 1
+        slug = _slugify(fields["title"], article_id)
+        published = bool(fields.get("published"))
+        url = f"http://{self.host}:{self.port}/{user['username']}/{slug}"
+        article = {
+            "type_of": "article",
+            "id": article_id,
+            "title": fields["title"],
+            "description": fields.get("description") or "",
+            "body_markdown": fields.get("body_markdown") or "",
+            "slug": slug,
+            "path": f"/{user['username']}/{slug}",
+            "url": url,
+            "canonical_url": canonical_url or url,
+            "published": published,
+            "published_at": (fields.get("published_at") or _now()) if published else None,
+            "created_at": _now(),
+            "tag_list": _tag_list(fields.get("tags")),
+            "series": fields.get("series"),
+            "user": user,
+        }
+        self.articles[article_id] = article
+        if canonical_url:
+            self.canonical_urls[canonical_url] = article_id
+        self._listings = {}
+        return article
+
+    def _update(self, user, query, data, article_id):
+        fields = data.get("article")
+        if not isinstance(fields, dict):
+            raise EmulatorError(422, "param is missing or the value is empty: article")
+
+        with self.lock:
+            article = self.articles.get(int(article_id))
+            if article is None or article["user"]["id"] != user["id"]:
+                raise EmulatorError(404, "not found")
+            canonical_url = self._validate(fields, article["id"])
+
+            for key in ("title", "description", "body_markdown", "series"):
+                if key in fields:
+                    article[key] = fields[key]
+            if "tags" in fields:
+                article["tag_list"] = _tag_list(fields["tags"])
+            if canonical_url and canonical_url != article["canonical_url"]:
+                self.canonical_urls.pop(article["canonical_url"], None)
+                self.canonical_urls[canonical_url] = article["id"]
+                article["canonical_url"] = canonical_url
+            if "published" in fields:
+                published = bool(fields["published"])
+                if published and not article["published"]:
+                    article["published_at"] = _now()
+                article["published"] = published
+            article["edited_at"] = _now()
+            self._listings = {}
+            return 200, self._view(article), {}
+
+
+def _handler_for(emulator):
+    """
+    Build the request handler class serving an emulator.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the real API behind the pooled session
+
+        def _serve(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+
+            status, payload, headers = emulator.handle(self.command, url.path, query, self.headers, body)
+            data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            if payload is not None:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+        def log_message(self, format, *args):
+            # Keep the console for the client's own output
+            pass
+
+    return Handler
+
+
+def main():
+    """
+    Run the emulator in the foreground.
+    """
+    parser = argparse.ArgumentParser(description="Offline, in-memory stand-in for the Dev.to API")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="The interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="The port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 5xx")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    parser.add_argument("--retry-after", type=float, default=DEFAULT_RETRY_AFTER, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--lost-response-rate", type=float, default=0.0, help="Share of creates stored but answered with a 5xx")
+    parser.add_argument("--read-limit", type=int, help="Reads allowed per key every --limit-window seconds")
+    parser.add_argument("--write-limit", type=int, help="Writes allowed per key every --limit-window seconds")
+    parser.add_argument("--limit-window", type=float, default=30.0, help="Rate limit window in seconds")
+    parser.add_argument("--seed", type=int, help="Seed for repeatable fault injection")
+    args = parser.parse_args()
+
+    rate_limits = {}
+    if args.read_limit:
+        rate_limits["read"] = {"requests": args.read_limit, "per_seconds": args.limit_window}
+    if args.write_limit:
+        rate_limits["write"] = {"requests": args.write_limit, "per_seconds": args.limit_window}
+
+    emulator = DevToEmulator(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        rate_limits=rate_limits,
+        lost_response_rate=args.lost_response_rate,
+        seed=args.seed,
+    )
+    base_url = emulator.start()
+    print(f"Dev.to emulator listening; export DEV_API_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Module for caching the inventory of articles on a Dev.to account.
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+import requests
+
+from devto.async_api import DEFAULT_CONCURRENCY, AsyncDevToAPI
+from devto.session import api_base_url, get_session
+
+# Constants
+INVENTORY_FILE = "devto_inventory.json"
+DEFAULT_TTL = 60 * 60  # seconds before the cached inventory is revalidated
+PER_PAGE = 100
+RECENT_PER_PAGE = 30
+RECENT_MAX_PAGES = 3
+CLOCK_SKEW = 10 * 60  # seconds of slack between our clock and Dev.to's
+
+
+class ArticleInventory:
+    """
+    Snapshot of the articles published by the authenticated Dev.to account.
+
+    The snapshot is fetched once, indexed by canonical URL and title, and
+    persisted together with the ETag of the first page so that later runs
+    only pull the pages that contain articles they have not seen yet.
+    Pages after the first are fetched in parallel windows through
+    AsyncDevToAPI, at most `concurrency` at a time.
+    """
+
+    def __init__(self, api_key, cache_file=INVENTORY_FILE, ttl=DEFAULT_TTL, base_url=None, session=None,
+                 concurrency=DEFAULT_CONCURRENCY):
+        """
+        Initialize the ArticleInventory class.
+
+        Args:
+            api_key (str): The Dev.to API key.
+            cache_file (str, optional): Where the snapshot is persisted. Defaults to INVENTORY_FILE.
+            ttl (int, optional): Seconds a snapshot is trusted without revalidation. Defaults to DEFAULT_TTL.
+            base_url (str, optional): The Dev.to API base URL. Defaults to DEV_API_BASE_URL or the public API.
+            session (requests.Session, optional): The HTTP session to use. Defaults to the shared pooled session.
+            concurrency (int, optional): The maximum number of pages fetched at once. Defaults to DEFAULT_CONCURRENCY.
+        """
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.base_url = (base_url or api_base_url()).rstrip("/")
+        self.session = session or get_session()
+        self.etag = None
+        self.fetched_at = 0
+        self.articles = []
+        self._ids = set()
+        self._by_canonical_url = {}
+        self._by_title = {}
+
+    def load(self):
+        """
+        Load the persisted snapshot, if there is one.
+
+        Returns:
+            bool: True if a snapshot was loaded.
+        """
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Ignoring unreadable Dev.to inventory cache: {e}")
+            return False
+
+        self.etag = data.get("etag")
+        self.fetched_at = data.get("fetched_at", 0)
+        self._reset()
+        for article in data.get("articles", []):
+            self.add(article)
+        return True
+
+    def save(self):
+        """
+        Persist the snapshot so the next run can revalidate it instead of refetching it.
+        """
+        if not self.cache_file:
+            return
+
+        data = {
+            "etag": self.etag,
+            "fetched_at": self.fetched_at,
+            "articles": self.articles,
+        }
+        tmp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Error saving Dev.to inventory cache: {e}")
+
+    def is_fresh(self):
+        """
+        Check whether the snapshot is recent enough to be used without revalidation.
+
+        Returns:
+            bool: True if the snapshot is within its TTL.
+        """
+        return bool(self.fetched_at) and time.time() - self.fetched_at < self.ttl
+
+    def refresh(self, force=False):
+        """
+        Bring the snapshot up to date with the account.
+
+        A fresh snapshot is used as-is. A stale one is revalidated with the ETag
+        of the first page, and only the pages holding unseen articles are pulled.
+        Articles are listed newest first, so paging stops at the first known ID.
+        The first page is fetched on its own; if more are needed, they are
+        fetched `concurrency` at a time, so a window may pull a few pages past
+        the end.
+
+        If any page fails, the snapshot, its ETag and its fetch time are left
+        as they were, so a partial listing never replaces it or passes for a
+        complete one.
+
+        Args:
+            force (bool, optional): Discard the snapshot and fetch every page. Defaults to False.
+
+        Returns:
+            int: The number of new articles added to the snapshot.
+
+        Raises:
+            requests.exceptions.RequestException: If a page could not be fetched.
+        """
+        if not force and self.is_fresh():
+            return 0
+
+        # With force the snapshot is only replaced once every page has been fetched
+        known_ids = set() if force else self._ids
+        etag = None if force else self.etag
+        headers = {"api-key": self.api_key}
+        if etag and self.articles:
+            headers["If-None-Match"] = etag
+        new_articles = []
+
+        response = self.session.get(
+            f"{self.base_url}/articles/me",
+            headers=headers,
+            params={"per_page": PER_PAGE, "page": 1},
+            timeout=10
+        )
+        if response.status_code != 304:
+            if response.status_code != 200:
+                raise requests.exceptions.HTTPError(
+                    f"Dev.to inventory fetch failed at page 1: {response.status_code}", response=response
+                )
+            etag = response.headers.get("ETag")
+            if not self._collect(response.json(), known_ids, new_articles):
+                asyncio.run(self._fetch_pages(2, known_ids, new_articles))
+
+        if force:
+            self._reset()
+        # Keep the snapshot ordered newest first, like the API
+        for article in reversed(new_articles):
+            self.add(article, newest=True)
+        self.etag = etag
+        self.fetched_at = time.time()
+        return len(new_articles)
+
+    async def _fetch_pages(self, first_page, known_ids, new_articles):
+        """
+        Fetch pages from first_page on in parallel windows until one ends the listing.
+
+        Raises:
+            requests.exceptions.RequestException: If a page could not be fetched.
+        """
+        client = AsyncDevToAPI(api_key=self.api_key, concurrency=self.concurrency, session=self.session,
+                               base_url=self.base_url)
+        page = first_page
+        while True:
+            pages = range(page, page + self.concurrency)
+            batches = await asyncio.gather(*(client.get_my_articles(page=p, per_page=PER_PAGE) for p in pages))
+            # Pages are taken in order, so nothing past the end of the listing is kept
+            for p, batch in zip(pages, batches):
+                if not isinstance(batch, list):
+                    raise requests.exceptions.HTTPError(
+                        f"Dev.to inventory fetch failed at page {p}: {batch.get('status')}"
+                    )
+                if self._collect(batch, known_ids, new_articles):
+                    return
+            page += self.concurrency
+
+    def _collect(self, batch, known_ids, new_articles):
+        """
+        Add the unseen articles of a page to new_articles.
+
+        Returns:
+            bool: True if the page ends the listing (short, empty or reaching a known article).
+        """
+        reached_known = False
+        for article in batch:
+            if article.get("id") in known_ids:
+                reached_known = True
+                continue
+            new_articles.append(article)
+        return reached_known or len(batch) < PER_PAGE
+
+    def add(self, article, newest=False):
+        """
+        Add an article to the snapshot and its indexes.
+
+        Args:
+            article (dict): The article as returned by the Dev.to API.
+            newest (bool, optional): Insert at the front of the snapshot. Defaults to False.
+        """
+        article_id = article.get("id")
+        if article_id is not None and article_id in self._ids:
+            return
+
+        entry = {
+            "id": article_id,
+            "title": article.get("title"),
+            "canonical_url": article.get("canonical_url"),
+            "published_at": article.get("published_at"),
+            "url": article.get("url"),
+        }
+        if newest:
+            self.articles.insert(0, entry)
+        else:
+            self.articles.append(entry)
+
+        if article_id is not None:
+            self._ids.add(article_id)
+        # Each index keeps the newest article for its key
+        for index, key in ((self._by_canonical_url, entry["canonical_url"]), (self._by_title, entry["title"])):
+            if key and (newest or key not in index):
+                index[key] = entry
+
+    def find(self, title=None, canonical_url=None, since=None):
+        """
+        Find an article by canonical URL or title.
+
+        Args:
+            title (str, optional): The article title. Defaults to None.
+            canonical_url (str, optional): The canonical URL. Defaults to None.
+            since (str, optional): ISO time; articles published before it do not match. Drafts always match. Defaults to None.
+
+        Returns:
+            dict: The matching article, or None.
+        """
+        cutoff = _epoch(since)
+        for index, key in ((self._by_canonical_url, canonical_url), (self._by_title, title)):
+            # The indexes keep the newest article for each key
+            article = index.get(key) if key else None
+            if article is None:
+                continue
+            published = _epoch(article.get("published_at"))
+            if cutoff is None or published is None or published >= cutoff:
+                return article
+        return None
+
+    def _reset(self):
+        """
+        Drop every cached article and index entry.
+        """
+        self.articles = []
+        self._ids = set()
+        self._by_canonical_url = {}
+        self._by_title = {}
+
+
+def _epoch(timestamp):
+    """
+    Convert an ISO timestamp to epoch seconds (None if missing or invalid).
+    """
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def find_recent_article(api_key, title=None, canonical_url=None, since=None, base_url=None,
+                        session=None, per_page=RECENT_PER_PAGE, max_pages=RECENT_MAX_PAGES):
+    """
+    Look for an article among the account's most recent ones.
+
+    This is the targeted check after a create whose outcome is unknown (a
+    timeout): the article, if it was created, is among the newest, so only
+    the first page or two are fetched instead of the whole account.
+
+    Args:
+        api_key (str): The Dev.to API key.
+        title (str, optional): The article title. Defaults to None.
+        canonical_url (str, optional): The canonical URL. Defaults to None.
+        since (str, optional): ISO time the create was sent; older articles end the search. Defaults to None.
+        base_url (str, optional): The Dev.to API base URL. Defaults to DEV_API_BASE_URL or the public API.
+        session (requests.Session, optional): The HTTP session to use. Defaults to the shared pooled session.
+        per_page (int, optional): Articles per page. Defaults to RECENT_PER_PAGE.
+        max_pages (int, optional): Pages to check at most. Defaults to RECENT_MAX_PAGES.
+
+    Returns:
+        dict: The matching article, or None if it is not there.
+
+    Raises:
+        requests.exceptions.RequestException: If the account could not be checked.
+    """
+    session = session or get_session()
+    base_url = (base_url or api_base_url()).rstrip("/")
+    cutoff = _epoch(since)
+    if cutoff is not None:
+        cutoff -= CLOCK_SKEW
+
+    for page in range(1, max_pages + 1):
+        response = session.get(
+            f"{base_url}/articles/me/all",
+            headers={"api-key": api_key},
+            params={"per_page": per_page, "page": page},
+            timeout=10
+        )
+        response.raise_for_status()
+        batch = response.json()
+
+        older = 0
+        for article in batch:
+            if canonical_url and article.get("canonical_url") == canonical_url:
+                return article
+            if title and article.get("title") == title:
+                return article
+            published = _epoch(article.get("published_at"))
+            if cutoff is not None and published is not None and published < cutoff:
+                older += 1
+
+        # Drafts come first, then published articles newest first
+        if len(batch) < per_page or (batch and older == len(batch)):
+            break
+    return None
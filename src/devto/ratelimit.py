@@ -0,0 +1,250 @@
+"""
+Module for proactive, token-bucket rate limiting of Dev.to API calls.
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Constants
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+DEFAULT_BUDGETS = {
+    "read": {"requests": 30, "per_seconds": 30},
+    "write": {"requests": 10, "per_seconds": 30},
+}
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+
+    Args:
+        value (str): The header value.
+
+    Returns:
+        float: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_number(headers, names):
+    """
+    Read the first numeric header among several spellings.
+    """
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket: `requests` tokens refilled every `per_seconds` seconds.
+
+    Callers reserve a token and sleep until it is theirs, so concurrent
+    callers queue up fairly instead of all waking at the same moment.
+    """
+
+    def __init__(self, requests, per_seconds, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the TokenBucket class.
+
+        Args:
+            requests (int): The burst size and number of requests allowed per window.
+            per_seconds (float): The window length in seconds.
+            clock (callable, optional): Monotonic clock. Defaults to time.monotonic.
+            sleep (callable, optional): Sleep function. Defaults to time.sleep.
+        """
+        self.capacity = float(requests)
+        self.per_seconds = float(per_seconds)
+        self.rate = self.capacity / self.per_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """
+        Take tokens from the bucket, going into debt if necessary.
+
+        Args:
+            tokens (int, optional): The number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: How long the caller must wait before using the tokens.
+        """
+        with self._lock:
+            now = self.clock()
+            if now > self.updated:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= tokens
+            deficit = -self.tokens if self.tokens < 0 else 0
+            return max(now, self.updated) + deficit / self.rate - now
+
+    def acquire(self, tokens=1):
+        """
+        Wait until tokens are available and take them.
+
+        Args:
+            tokens (int, optional): The number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self.sleep(wait)
+            with self._lock:
+                self.waited += wait
+        return max(wait, 0.0)
+
+    def pause(self, seconds):
+        """
+        Stop handing out tokens for a while, e.g. after a 429 or an exhausted quota.
+
+        Args:
+            seconds (float): How long to pause.
+        """
+        with self._lock:
+            now = self.clock()
+            self.updated = max(self.updated, now + seconds)
+            # Allow a single request as soon as the pause ends, not a burst
+            self.tokens = min(self.tokens, 1.0)
+
+    def limit(self, remaining):
+        """
+        Never hold more tokens than the server says are left.
+
+        Args:
+            remaining (float): The remaining quota reported by the server.
+        """
+        with self._lock:
+            self.tokens = min(self.tokens, remaining)
+
+
+class RateLimiter:
+    """
+    A set of token buckets shared by every Dev.to caller in the process.
+
+    Requests are classified as reads (GET/HEAD/OPTIONS) or writes. Budgets
+    are keyed "read" and "write", and a key such as "write:/api/articles"
+    gives a path prefix its own bucket. Buckets adapt to Retry-After and
+    rate-limit headers on every response.
+    """
+
+    def __init__(self, budgets=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the RateLimiter class.
+
+        Args:
+            budgets (dict, optional): Bucket name to {"requests": int, "per_seconds": float}. Defaults to DEFAULT_BUDGETS.
+            clock (callable, optional): Monotonic clock. Defaults to time.monotonic.
+            sleep (callable, optional): Sleep function. Defaults to time.sleep.
+        """
+        merged = dict(DEFAULT_BUDGETS)
+        merged.update(budgets or {})
+
+        self.buckets = {}
+        for name, budget in merged.items():
+            try:
+                requests = int(budget["requests"])
+                per_seconds = float(budget["per_seconds"])
+                if requests < 1 or per_seconds <= 0:
+                    raise ValueError("budget must be positive")
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Ignoring invalid rate limit budget '{name}': {e}")
+                continue
+            self.buckets[name] = TokenBucket(requests, per_seconds, clock=clock, sleep=sleep)
+
+        # Fall back to the defaults if the configured read/write budgets were invalid
+        for name, budget in DEFAULT_BUDGETS.items():
+            if name not in self.buckets:
+                self.buckets[name] = TokenBucket(budget["requests"], budget["per_seconds"], clock=clock, sleep=sleep)
+
+    def bucket_for(self, method, url):
+        """
+        Find the bucket governing a request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+
+        Returns:
+            TokenBucket: The most specific matching bucket.
+        """
+        kind = "read" if method.upper() in READ_METHODS else "write"
+        path = urlparse(url).path
+
+        best_name = kind
+        best_length = -1
+        for name in self.buckets:
+            if not name.startswith(f"{kind}:"):
+                continue
+            prefix = name[len(kind) + 1:]
+            if path.startswith(prefix) and len(prefix) > best_length:
+                best_name = name
+                best_length = len(prefix)
+        return self.buckets[best_name]
+
+    def acquire(self, method, url):
+        """
+        Wait for the budget of a request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        return self.bucket_for(method, url).acquire()
+
+    def observe(self, method, url, response):
+        """
+        Adapt the matching bucket to the rate-limit information in a response.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+            response (requests.Response): The response.
+        """
+        bucket = self.bucket_for(method, url)
+        headers = response.headers
+
+        remaining = _header_number(headers, ("X-RateLimit-Remaining", "RateLimit-Remaining"))
+        if remaining is not None:
+            bucket.limit(remaining)
+            if remaining <= 0:
+                reset = _header_number(headers, ("X-RateLimit-Reset", "RateLimit-Reset"))
+                if reset is not None:
+                    # Either an epoch timestamp or a delay in seconds
+                    delay = reset - time.time() if reset > 1e9 else reset
+                    if delay > 0:
+                        bucket.pause(delay)
+
+        if response.status_code == 429:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            bucket.pause(retry_after if retry_after is not None else bucket.per_seconds / bucket.capacity)
+
+    @property
+    def waited(self):
+        """
+        Total seconds callers have spent waiting on any bucket.
+        """
+        return sum(bucket.waited for bucket in self.buckets.values())
@@ -0,0 +1,225 @@
+"""
+Module for the shared, pooled HTTP session used for every Dev.to call.
+"""
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from devto.ratelimit import RateLimiter
+
+# Constants
+DEFAULT_POOL_SIZE = 10
+DEFAULT_BASE_URL = "https://dev.to/api"
+BASE_URL_ENV = "DEV_API_BASE_URL"  # points every client at another server, e.g. the local emulator
+
+_session = None
+_pool_size = DEFAULT_POOL_SIZE
+_rate_limiter = None
+
+
+class RequestStats:
+    """
+    Thread-safe counters of the requests sent through the shared session.
+
+    They outlive configure_session(), so a run's totals cover every session it used.
+    """
+
+    def __init__(self):
+        """
+        Initialize the RequestStats class.
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Zero every counter.
+        """
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.bytes_sent = 0
+            self.bytes_received = 0
+            self.seconds = 0.0
+            self.rate_limit_wait = 0.0
+            self.statuses = {}
+
+    def record(self, request, response=None, seconds=0.0, waited=0.0):
+        """
+        Count one request.
+
+        Args:
+            request (requests.PreparedRequest): The request sent.
+            response (requests.Response, optional): Its response; None if it failed. Defaults to None.
+            seconds (float, optional): Seconds spent on the request itself. Defaults to 0.
+            waited (float, optional): Seconds spent waiting for the rate limiter first. Defaults to 0.
+        """
+        body = request.body or b""
+        sent = len(body.encode("utf-8") if isinstance(body, str) else body)
+        received = 0
+        if response is not None:
+            try:
+                received = int(response.headers.get("Content-Length") or 0)
+            except ValueError:
+                received = 0
+
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += sent
+            self.bytes_received += received
+            self.seconds += seconds
+            self.rate_limit_wait += waited
+            if response is None:
+                self.errors += 1
+            else:
+                status = str(response.status_code)
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def snapshot(self):
+        """
+        Get the counters.
+
+        Returns:
+            dict: requests, errors, bytes_sent, bytes_received, seconds, rate_limit_wait and statuses.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "bytes_sent": self.bytes_sent,
+                "bytes_received": self.bytes_received,
+                "seconds": self.seconds,
+                "rate_limit_wait": self.rate_limit_wait,
+                "statuses": dict(self.statuses),
+            }
+
+
+_request_stats = RequestStats()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTP adapter that waits for the shared rate limiter before each request
+    and feeds every response back to it.
+    """
+
+    def __init__(self, rate_limiter, stats=None, **kwargs):
+        """
+        Initialize the RateLimitedAdapter class.
+
+        Args:
+            rate_limiter (RateLimiter): The limiter shared by all callers.
+            stats (RequestStats, optional): Where requests are counted. Defaults to the process-wide stats.
+            **kwargs: Passed on to HTTPAdapter.
+        """
+        self.rate_limiter = rate_limiter
+        self.stats = stats or _request_stats
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        waited = self.rate_limiter.acquire(request.method, request.url)
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self.stats.record(request, seconds=time.perf_counter() - start, waited=waited)
+            raise
+        self.stats.record(request, response, seconds=time.perf_counter() - start, waited=waited)
+        self.rate_limiter.observe(request.method, request.url, response)
+        return response
+
+
+def api_base_url():
+    """
+    Get the Dev.to API base URL: DEV_API_BASE_URL if it is set, otherwise the public API.
+
+    Returns:
+        str: The base URL, without a trailing slash.
+    """
+    return (os.environ.get(BASE_URL_ENV) or DEFAULT_BASE_URL).rstrip("/")
+
+
+def _build_session(pool_size, rate_limiter):
+    """
+    Build a requests session whose adapters keep connections alive in a pool.
+
+    Args:
+        pool_size (int): The number of connections kept per host.
+        rate_limiter (RateLimiter): The limiter applied to every request.
+
+    Returns:
+        requests.Session: The new session.
+    """
+    session = requests.Session()
+    adapter = RateLimitedAdapter(rate_limiter, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def configure_session(pool_size=DEFAULT_POOL_SIZE, rate_limits=None):
+    """
+    Configure the shared session, replacing it if it already exists.
+
+    Args:
+        pool_size (int, optional): The number of connections kept per host. Defaults to DEFAULT_POOL_SIZE.
+        rate_limits (dict, optional): Token-bucket budgets for the rate limiter. Defaults to DEFAULT_BUDGETS.
+    """
+    global _pool_size, _rate_limiter
+    _pool_size = pool_size
+    _rate_limiter = RateLimiter(rate_limits)
+    close_session()
+
+
+def get_rate_limiter():
+    """
+    Get the process-wide rate limiter, creating it with the default budgets on first use.
+
+    Returns:
+        RateLimiter: The shared rate limiter.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def get_request_stats():
+    """
+    Get the counters of every request sent through the shared session.
+
+    Returns:
+        RequestStats: The process-wide request stats.
+    """
+    return _request_stats
+
+
+def get_session():
+    """
+    Get the process-wide session, creating it on first use.
+
+    Every Dev.to request made through it reuses a kept-alive connection
+    instead of opening a new TCP and TLS connection each time, and draws
+    from the shared rate-limit budget.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        _session = _build_session(_pool_size, get_rate_limiter())
+    return _session
+
+
+def close_session():
+    """
+    Close the shared session and its pooled connections.
+    """
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
@@ -0,0 +1,119 @@
+"""
+Module for making article creation idempotent across timeouts and retries.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+
+# Constants
+PENDING_CREATE_TTL = 7 * 24 * 60 * 60   # seconds before an unresolved create record is dropped
+
+
+def article_fingerprint(article):
+    """
+    Fingerprint an article payload: the same title, body, tags, series and canonical URL give the same fingerprint.
+
+    Args:
+        article (dict): The payload sent to DEV.to ({"article": {...}}).
+
+    Returns:
+        str: A hex SHA-256 digest.
+    """
+    body = article.get("article", article)
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CreateJournal:
+    """
+    Write-ahead records of article creates, kept in state["pending_creates"].
+
+    begin() journals the create (fingerprint, path, title, canonical URL and
+    send time) through the state store before the POST goes out, and
+    complete() removes it once the outcome is known. A record that is still
+    there on the next attempt means the earlier POST may or may not have
+    created the article (a timeout or a 5xx), so the caller checks the
+    account's newest articles for it before sending again.
+    """
+
+    def __init__(self, store, ttl=PENDING_CREATE_TTL, clock=None):
+        """
+        Initialize the CreateJournal class.
+
+        Args:
+            store (JsonStateStore): The state store used to journal the records.
+            ttl (float, optional): Seconds an unresolved record is kept. Defaults to PENDING_CREATE_TTL.
+            clock (callable, optional): Returns the current aware datetime. Defaults to UTC now.
+        """
+        self.store = store
+        self.ttl = ttl
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def find(self, state, fingerprint, path=None):
+        """
+        Find the unresolved create of an article, by fingerprint or, if its content changed since, by path.
+
+        Args:
+            state (dict): The posting state.
+            fingerprint (str): The article fingerprint.
+            path (str, optional): The post path. Defaults to None.
+
+        Returns:
+            dict: The pending record, or None.
+        """
+        pending = state.get("pending_creates") or {}
+        if fingerprint in pending:
+            return pending[fingerprint]
+        if path:
+            key = path.replace("\\", "/")
+            for record in pending.values():
+                if record.get("path") == key:
+                    return record
+        return None
+
+    def begin(self, state, fingerprint, blog_post, title, canonical_url):
+        """
+        Journal a create before it is sent.
+
+        Args:
+            state (dict): The posting state.
+            fingerprint (str): The article fingerprint.
+            blog_post (dict): The post being created.
+            title (str): The article title.
+            canonical_url (str): The canonical URL sent, if any.
+
+        Returns:
+            dict: The pending record.
+        """
+        now = self.clock()
+        cutoff = (now - timedelta(seconds=self.ttl)).isoformat()
+        path = blog_post["path"].replace("\\", "/")
+        # Drop expired records and any older record of the same post
+        pending = {
+            key: record for key, record in (state.get("pending_creates") or {}).items()
+            if record["sent_at"] >= cutoff and record.get("path") != path
+        }
+        record = {
+            "fingerprint": fingerprint,
+            "path": path,
+            "title": title,
+            "canonical_url": canonical_url,
+            "sent_at": now.isoformat(),
+        }
+        pending[fingerprint] = record
+        self.store.update(state, pending_creates=pending)
+        return record
+
+    def complete(self, state, record):
+        """
+        Remove a create record once its outcome is known.
+
+        Args:
+            state (dict): The posting state.
+            record (dict): The pending record, as returned by begin() or find().
+        """
+        pending = state.get("pending_creates") or {}
+        if record and record["fingerprint"] in pending:
+            pending = dict(pending)
+            del pending[record["fingerprint"]]
+            self.store.update(state, pending_creates=pending)
@@ -0,0 +1,354 @@
+"""
+Module for cross-process locks on the shared posting files.
+"""
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Constants
+LOCK_SUFFIX = ".lock"
+BREAK_SUFFIX = ".break"             # guard file that stale-lock breakers take turns on
+DEFAULT_LOCK_TIMEOUT = 30           # seconds a writer waits before giving up
+DEFAULT_STALE_AFTER = 30 * 60       # seconds without a heartbeat after which an exclusive lock is considered abandoned
+DEFAULT_POLL_INTERVAL = 0.1         # seconds between attempts while waiting
+HEARTBEAT_INTERVAL = 60             # seconds between refreshes of the holder record by a re-entering holder
+
+
+class LockTimeout(Exception):
+    """
+    The lock could not be acquired within the timeout.
+    """
+
+    def __init__(self, message, holder=None):
+        """
+        Initialize the LockTimeout class.
+
+        Args:
+            message (str): What could not be locked.
+            holder (dict, optional): The recorded owner of the lock (pid, host, acquired_at). Defaults to None.
+        """
+        super().__init__(message)
+        self.holder = holder
+
+
+# Locks held by this process, by lock file path: flock conflicts between two
+# descriptors of the same process, so nested acquisitions share one descriptor.
+# The thread locks make the threads of the process take turns on a path, so
+# only the thread holding one re-enters its entry
+_held = {}
+_thread_locks = {}
+_held_guard = threading.Lock()
+
+
+class FileLock:
+    """
+    A readers/writer lock on a lock file, shared between processes.
+
+    Readers take shared locks and writers exclusive ones (flock on POSIX;
+    Windows has no shared file locks, so there every lock is exclusive).
+    Locks are re-entrant within a thread: a run that holds the exclusive
+    lock can save state without waiting for itself. Other threads of the
+    same process wait their turn, as other processes do. The kernel drops
+    the lock of a process that dies. An exclusive holder refreshes its
+    record at most every HEARTBEAT_INTERVAL seconds when it re-enters the
+    lock, which it does whenever it journals or saves state. A lock whose
+    record has not been refreshed for stale_after seconds (a hung run) is
+    broken by replacing the lock file, one breaker at a time.
+    """
+
+    def __init__(self, path, timeout=DEFAULT_LOCK_TIMEOUT, stale_after=DEFAULT_STALE_AFTER,
+                 poll_interval=DEFAULT_POLL_INTERVAL):
+        """
+        Initialize the FileLock class.
+
+        Args:
+            path (str): The lock file.
+            timeout (float, optional): Default seconds to wait for the lock. Defaults to DEFAULT_LOCK_TIMEOUT.
+            stale_after (float, optional): Seconds without a heartbeat after which an exclusive holder is considered hung. Defaults to DEFAULT_STALE_AFTER.
+            poll_interval (float, optional): Seconds between attempts while waiting. Defaults to DEFAULT_POLL_INTERVAL.
+        """
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+
+    @contextmanager
+    def shared(self, timeout=None, required=True):
+        """
+        Hold a shared (reader) lock.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to the lock's timeout.
+            required (bool, optional): Raise LockTimeout on timeout; otherwise continue unlocked. Defaults to True.
+
+        Yields:
+            bool: True if the lock is held.
+        """
+        with self._locked(False, timeout, required) as held:
+            yield held
+
+    @contextmanager
+    def exclusive(self, timeout=None, required=True):
+        """
+        Hold an exclusive (writer) lock.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to the lock's timeout.
+            required (bool, optional): Raise LockTimeout on timeout; otherwise continue unlocked. Defaults to True.
+
+        Yields:
+            bool: True if the lock is held.
+        """
+        with self._locked(True, timeout, required) as held:
+            yield held
+
+    def holder(self):
+        """
+        Read the recorded owner of the last exclusive lock.
+
+        Returns:
+            dict: pid, host, acquired_at and since (epoch seconds of the last heartbeat), or None.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.loads(f.read().lstrip("\0") or "null")
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def _locked(self, exclusive, timeout, required):
+        """
+        Acquire (or re-enter) the lock, yield, and release it.
+        """
+        held = self._acquire(exclusive, self.timeout if timeout is None else timeout, required)
+        try:
+            yield held
+        finally:
+            if held:
+                self._release()
+
+    def _acquire(self, exclusive, timeout, required):
+        """
+        Acquire the lock, waiting up to timeout seconds.
+
+        Returns:
+            bool: True if the lock is held, False if it timed out and is not required.
+        """
+        deadline = time.monotonic() + timeout
+        # Take this process's turn first; the thread already holding it re-enters
+        thread_lock = _thread_lock(self.path)
+        if not thread_lock.acquire(timeout=max(timeout, 0)):
+            if not required:
+                return False
+            raise LockTimeout(f"Timed out after {timeout}s waiting for {self.path} in this process",
+                              holder=self.holder())
+        try:
+            held = self._acquire_file(exclusive, deadline, timeout, required)
+        except BaseException:
+            thread_lock.release()
+            raise
+        if not held:
+            thread_lock.release()
+        return held
+
+    def _acquire_file(self, exclusive, deadline, timeout, required):
+        """
+        Lock (or re-enter) the lock file once this thread has its process's turn.
+
+        Returns:
+            bool: True if the lock is held, False if it timed out and is not required.
+        """
+        with _held_guard:
+            entry = _held.get(self.path)
+            if entry and (entry["exclusive"] or not exclusive):
+                entry["count"] += 1
+                if entry["exclusive"] and time.time() - entry["since"] >= HEARTBEAT_INTERVAL:
+                    self._write_holder(entry)
+                return True
+
+        while True:
+            fd = entry["fd"] if entry else os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if _try_lock(fd, exclusive):
+                if entry:
+                    # Upgraded a shared lock held by this thread
+                    entry["exclusive"] = True
+                    entry["count"] += 1
+                    self._write_holder(entry)
+                    return True
+                if self._same_file(fd):
+                    entry = {"fd": fd, "exclusive": exclusive, "count": 1}
+                    with _held_guard:
+                        _held[self.path] = entry
+                    if exclusive:
+                        self._write_holder(entry)
+                    return True
+                # The lock file was replaced while we waited (stale-lock recovery): start over
+                _unlock(fd)
+            if not entry:
+                os.close(fd)
+
+            if time.monotonic() >= deadline:
+                if self._break_if_stale():
+                    continue
+                if not required:
+                    return False
+                raise LockTimeout(f"Timed out after {timeout}s waiting for {self.path}", holder=self.holder())
+            time.sleep(self.poll_interval)
+
+    def _release(self):
+        """
+        Leave one level of the lock, unlocking when the outermost level is left.
+        """
+        try:
+            with _held_guard:
+                entry = _held[self.path]
+                entry["count"] -= 1
+                if entry["count"]:
+                    return
+                del _held[self.path]
+            if entry["exclusive"]:
+                # Clear the owner record so an idle lock file never looks stale
+                os.ftruncate(entry["fd"], 0 if fcntl else 1)
+            _unlock(entry["fd"])
+            os.close(entry["fd"])
+        finally:
+            _thread_lock(self.path).release()
+
+    def _same_file(self, fd):
+        """
+        Check that a locked descriptor still refers to the file at the lock path.
+        """
+        try:
+            current = os.stat(self.path)
+        except OSError:
+            return False
+        opened = os.fstat(fd)
+        return (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino)
+
+    def _write_holder(self, entry):
+        """
+        Record this process as the exclusive holder, or refresh the record's heartbeat.
+        """
+        fd = entry["fd"]
+        entry.setdefault("acquired_at", datetime.now().isoformat())
+        entry["since"] = time.time()
+        info = {
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "acquired_at": entry["acquired_at"],
+            "since": entry["since"],
+        }
+        data = json.dumps(info).encode("utf-8")
+        if fcntl is None:
+            # msvcrt locks the first byte; keep the record after it
+            os.lseek(fd, 1, os.SEEK_SET)
+            os.write(fd, data)
+            return
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, data, 0)
+
+    def _break_if_stale(self):
+        """
+        Replace the lock file if its exclusive holder has not refreshed its record for stale_after seconds.
+
+        Breakers take turns on a guard file and check the holder again while
+        they hold it. Only a breaker removes the lock file, so the file checked
+        under the guard is the one removed; a waiter that saw the same stale
+        holder finds the replacement (and its new holder) instead of removing
+        a lock someone has just acquired.
+
+        Returns:
+            bool: True if the lock was broken and acquisition should be retried.
+        """
+        if not self._is_stale(self.holder()):
+            return False
+
+        guard = os.open(f"{self.path}{BREAK_SUFFIX}", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if not _try_lock(guard, True):
+                # Another waiter is breaking it
+                return False
+            try:
+                holder = self.holder()
+                if not self._is_stale(holder):
+                    return False
+                print(f"Breaking stale lock {self.path} held by pid {holder.get('pid')} on "
+                      f"{holder.get('host')} since {holder.get('acquired_at')}")
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    return False
+                return True
+            finally:
+                _unlock(guard)
+        finally:
+            os.close(guard)
+
+    def _is_stale(self, holder):
+        """
+        Check whether a recorded exclusive holder has gone stale_after seconds without a heartbeat.
+        """
+        if not holder or not self.stale_after:
+            return False
+        return time.time() - holder.get("since", time.time()) >= self.stale_after
+
+
+def _thread_lock(path):
+    """
+    Get the lock the threads of this process take turns on for a lock file.
+    """
+    with _held_guard:
+        return _thread_locks.setdefault(path, threading.RLock())
+
+
+def _try_lock(fd, exclusive):
+    """
+    Try once to lock a descriptor without blocking.
+    """
+    if fcntl is None:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    try:
+        fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _unlock(fd):
+    """
+    Unlock a descriptor.
+    """
+    if fcntl is None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def state_lock(state_file, **kwargs):
+    """
+    Get the lock guarding a state file (its path plus LOCK_SUFFIX).
+
+    Args:
+        state_file (str): The state file.
+        **kwargs: FileLock options.
+
+    Returns:
+        FileLock: The lock.
+    """
+    return FileLock(f"{state_file}{LOCK_SUFFIX}", **kwargs)
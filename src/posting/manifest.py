@@ -0,0 +1,343 @@
+"""
+Module for the persistent manifest of blog posts under blog_content.
+"""
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+
+from posting.metadata import parse_metadata
+from posting.state import write_json_atomic
+
+# Constants
+MANIFEST_FILE = "blog_content_manifest.json"
+MANIFEST_VERSION = 2
+POST_FILENAME = "blog_post.md"
+HASH_CHUNK_SIZE = 64 * 1024
+GIT_TIMEOUT = 60  # seconds
+
+
+def read_post_metadata(post_path):
+    """
+    Stream a blog post once to get its metadata and content hash.
+
+    The lines up to the title are decoded for the metadata reader; the rest
+    of the file is only hashed, in chunks, without being held in memory.
+
+    Args:
+        post_path (str): The path to the blog_post.md file.
+
+    Returns:
+        dict: The title, tags, series, canonical_url, content hash, size and mtime of the post.
+    """
+    digest = hashlib.sha256()
+    with open(post_path, "rb") as f:
+        def decoded_lines():
+            for raw_line in f:
+                digest.update(raw_line)
+                yield raw_line.decode("utf-8", errors="replace")
+
+        metadata = parse_metadata(decoded_lines())
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        stat = os.fstat(f.fileno())
+
+    return {
+        **metadata,
+        "hash": digest.hexdigest(),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+    }
+
+
+def git_blob_ids(blog_dir):
+    """
+    Get the git blob ID of every committed, unmodified file under a directory.
+
+    A blob ID names the file's content, so it identifies an unchanged post
+    even when a fresh checkout has given every file a new mtime. Files with
+    uncommitted changes are left out, as is everything when git or the
+    repository is not there.
+
+    Args:
+        blog_dir (str): The blog content directory.
+
+    Returns:
+        dict: Path (joined onto blog_dir) to blob ID.
+    """
+    def git(*args):
+        result = subprocess.run(
+            ["git", "-C", blog_dir, *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=GIT_TIMEOUT
+        )
+        if result.returncode != 0:
+            raise OSError(f"git {args[0]} exited with {result.returncode}")
+        return [entry.decode("utf-8", errors="surrogateescape") for entry in result.stdout.split(b"\0") if entry]
+
+    try:
+        # "<mode> <blob> <stage>\t<path>", with paths relative to blog_dir
+        staged = git("ls-files", "-s", "-z")
+        modified = set(git("diff", "--name-only", "-z", "--relative"))
+    except (OSError, subprocess.SubprocessError):
+        return {}
+
+    blob_ids = {}
+    for entry in staged:
+        info, _, path = entry.partition("\t")
+        if path not in modified:
+            blob_ids[os.path.join(blog_dir, path.replace("/", os.sep))] = info.split()[1]
+    return blob_ids
+
+
+class ContentManifest:
+    """
+    Manifest of every blog post with its category, topic, metadata and content hash.
+
+    The manifest remembers the mtime and listing of every directory it has
+    scanned. A refresh stats each known directory and only lists the ones
+    whose mtime changed, so an unchanged tree costs one stat per directory
+    and no file reads. Posts are kept in os.walk order. Edits made in place
+    (which leave the directory mtime alone) are picked up by refresh(full=True).
+
+    A post whose size or mtime changed is only read again if its git blob ID
+    changed too, when the content is in a git checkout. A fresh checkout,
+    e.g. on a CI runner, resets every mtime; with the manifest of an earlier
+    run, the posts are then matched by blob ID from one git call instead of
+    being read and hashed.
+    """
+
+    def __init__(self, blog_dir, manifest_file=MANIFEST_FILE):
+        """
+        Initialize the ContentManifest class.
+
+        Args:
+            blog_dir (str): The blog content directory.
+            manifest_file (str, optional): Where the manifest is persisted. Defaults to MANIFEST_FILE.
+        """
+        self.blog_dir = blog_dir
+        self.manifest_file = manifest_file
+        self._dirs = {}
+        self._posts = {}
+        self._blob_ids = None
+        self.stat_calls = 0
+        self.file_reads = 0
+
+    def load(self):
+        """
+        Load the persisted manifest, if it exists and matches this content directory.
+
+        Returns:
+            bool: True if a manifest was loaded.
+        """
+        if not self.manifest_file or not os.path.exists(self.manifest_file):
+            return False
+
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Ignoring unreadable content manifest: {e}")
+            return False
+
+        if data.get("version") != MANIFEST_VERSION or data.get("blog_dir") != self.blog_dir:
+            return False
+
+        self._dirs = data.get("dirs", {})
+        self._posts = {post["path"]: post for post in data.get("posts", [])}
+        return True
+
+    def save(self):
+        """
+        Persist the manifest atomically.
+        """
+        if not self.manifest_file:
+            return
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "blog_dir": self.blog_dir,
+            "dirs": self._dirs,
+            "posts": list(self._posts.values()),
+        }
+        try:
+            write_json_atomic(self.manifest_file, data)
+        except OSError as e:
+            print(f"Error saving content manifest: {e}")
+
+    def refresh(self, full=False):
+        """
+        Bring the manifest up to date with the content directory.
+
+        Args:
+            full (bool, optional): Ignore recorded mtimes and rescan everything. Defaults to False.
+
+        Returns:
+            bool: True if the manifest changed.
+        """
+        self.stat_calls = 0
+        self.file_reads = 0
+        # Blob IDs are looked up once per refresh, and only if a post looks changed
+        self._blob_ids = None
+        if full:
+            self._dirs = {}
+
+        if not os.path.isdir(self.blog_dir):
+            changed = bool(self._posts or self._dirs)
+            self._dirs = {}
+            self._posts = {}
+            return changed
+
+        changed = False
+        dirs = {}
+        posts = {}
+        stack = [self.blog_dir]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            self.stat_calls += 1
+
+            known = self._dirs.get(directory)
+            if known and known["mtime"] == mtime:
+                listing = known
+                listing_changed = False
+            else:
+                listing = self._list_directory(directory, mtime)
+                listing_changed = True
+                changed = True
+            dirs[directory] = listing
+
+            if listing["has_post"]:
+                post_path = os.path.join(directory, POST_FILENAME)
+                post = self._posts.get(post_path)
+                if post is None or listing_changed:
+                    updated = self._scan_post(post_path, post)
+                    if updated is not post:
+                        changed = True
+                    post = updated
+                if post is not None:
+                    posts[post_path] = post
+
+            # Depth-first, in listing order, to match os.walk
+            stack.extend(os.path.join(directory, name) for name in reversed(listing["subdirs"]))
+
+        if list(posts) != list(self._posts):
+            changed = True
+        self._dirs = dirs
+        self._posts = posts
+        return changed
+
+    def refresh_post(self, post_path):
+        """
+        Rescan a single known post after an in-place edit.
+
+        Args:
+            post_path (str): The path to the blog_post.md file.
+
+        Returns:
+            bool: True if the post's entry changed.
+        """
+        previous = self._posts.get(post_path)
+        if previous is None:
+            return False
+        try:
+            updated = self._scan_post(post_path, previous)
+        except OSError:
+            # Removed or being replaced; the directory listing will catch up
+            return False
+        if updated is previous:
+            return False
+        if updated is None:
+            del self._posts[post_path]
+        else:
+            self._posts[post_path] = updated
+        return True
+
+    def directories(self):
+        """
+        Get every directory the manifest has scanned.
+
+        Returns:
+            list: Directory paths, including the content directory itself.
+        """
+        return list(self._dirs)
+
+    def posts(self):
+        """
+        Get the blog posts in the manifest.
+
+        Returns:
+            list: One dict per post with path, category, topic, title, tags, series, canonical_url, hash, size, mtime and git blob ID (None outside git).
+        """
+        return [dict(post) for post in self._posts.values()]
+
+    def _list_directory(self, directory, mtime):
+        """
+        List a directory whose mtime changed.
+        """
+        subdirs = []
+        has_post = False
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif entry.name == POST_FILENAME:
+                    has_post = True
+        return {"mtime": mtime, "subdirs": subdirs, "has_post": has_post}
+
+    def _scan_post(self, post_path, previous=None):
+        """
+        Build the manifest entry for a post, reading it only if its size or mtime changed.
+
+        Returns:
+            dict: The (possibly unchanged) entry, or None if the post is outside the expected layout.
+        """
+        path_parts = Path(post_path).parts
+        if len(path_parts) < 3:
+            return None
+
+        stat = os.stat(post_path)
+        self.stat_calls += 1
+        if previous and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime_ns:
+            return previous
+
+        if self._blob_ids is None:
+            self._blob_ids = git_blob_ids(self.blog_dir)
+        blob = self._blob_ids.get(post_path)
+        if previous and blob and previous.get("blob") == blob:
+            return dict(previous, size=stat.st_size, mtime=stat.st_mtime_ns)
+
+        metadata = read_post_metadata(post_path)
+        self.file_reads += 1
+        if previous and previous["hash"] == metadata["hash"]:
+            previous = dict(previous, size=metadata["size"], mtime=metadata["mtime"], blob=blob)
+            return previous
+
+        return {
+            "path": post_path,
+            "category": path_parts[-3],  # e.g., 10_ocr_text_recognition
+            "topic": path_parts[-2],     # e.g., 01_ocr_technology
+            **metadata,
+            "blob": blob,
+        }
+
+
+def find_blog_posts(blog_dir, manifest_file=MANIFEST_FILE):
+    """
+    Find all blog posts through the persisted manifest, refreshing it incrementally.
+
+    Args:
+        blog_dir (str): The blog content directory.
+        manifest_file (str, optional): Where the manifest is persisted. Defaults to MANIFEST_FILE.
+
+    Returns:
+        list: One dict per post with path, category, topic, title, tags, series, canonical_url, hash, size, mtime and git blob ID (None outside git).
+    """
+    manifest = ContentManifest(blog_dir, manifest_file=manifest_file)
+    manifest.load()
+    if manifest.refresh():
+        manifest.save()
+    return manifest.posts()
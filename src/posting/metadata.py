@@ -0,0 +1,111 @@
+"""
+Module for reading blog post metadata without loading the whole post.
+"""
+import io
+
+# Constants
+DEFAULT_TITLE = "RevisePDF Blog Post"
+FRONT_MATTER_DELIMITER = "---"
+FRONT_MATTER_END = ("---", "...")
+METADATA_KEYS = ("title", "tags", "series", "canonical_url")
+
+
+def _unquote(value):
+    """
+    Strip matching single or double quotes around a front matter value.
+    """
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+        return value[1:-1]
+    return value
+
+
+def _parse_tags(value):
+    """
+    Parse tags given as "a, b", "[a, b]" or a single tag.
+    """
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        value = value[1:-1]
+    return [_unquote(tag) for tag in value.split(",") if _unquote(tag)]
+
+
+def parse_metadata(lines, default_title=DEFAULT_TITLE):
+    """
+    Read the metadata of a post from its lines, consuming as few of them as possible.
+
+    A leading YAML front matter block ("---" ... "---") is read for its
+    title, tags, series and canonical_url. Only flat "key: value" pairs and
+    "- item" lists are understood, which covers DEV.to style front matter.
+    Reading stops at the end of the front matter if it has a title, and
+    otherwise at the first H1 ("# Title") line.
+
+    Args:
+        lines (iterable): The lines of the post, e.g. an open file.
+        default_title (str, optional): The title used if none is found. Defaults to DEFAULT_TITLE.
+
+    Returns:
+        dict: The title, tags (list), series and canonical_url (None if absent).
+    """
+    metadata = {"title": None, "tags": [], "series": None, "canonical_url": None}
+    lines = iter(lines)
+
+    first_line = next(lines, None)
+    if first_line is not None and first_line.strip() == FRONT_MATTER_DELIMITER:
+        list_key = None
+        for line in lines:
+            stripped = line.strip()
+            if stripped in FRONT_MATTER_END:
+                break
+
+            # "- item" continuation of a block list such as "tags:"
+            if list_key and stripped.startswith("- "):
+                item = _unquote(stripped[2:])
+                if item:
+                    metadata[list_key].append(item)
+                continue
+            list_key = None
+
+            key, separator, value = stripped.partition(":")
+            key = key.strip().lower()
+            if not separator or key not in METADATA_KEYS:
+                continue
+
+            if key == "tags":
+                metadata["tags"] = _parse_tags(value)
+                if not value.strip():
+                    list_key = "tags"
+            else:
+                metadata[key] = _unquote(value) or None
+
+        if metadata["title"]:
+            return metadata
+        first_line = None
+
+    if first_line is not None and first_line.startswith("# "):
+        metadata["title"] = first_line[2:].strip()
+        return metadata
+
+    for line in lines:
+        if line.startswith("# "):
+            metadata["title"] = line[2:].strip()
+            return metadata
+
+    metadata["title"] = default_title
+    return metadata
+
+
+def content_metadata(content, default_title=DEFAULT_TITLE):
+    """
+    Read the metadata of a post whose content is already in memory.
+
+    Args:
+        content (str): The markdown content.
+        default_title (str, optional): The title used if none is found. Defaults to DEFAULT_TITLE.
+
+    Returns:
+        dict: The title, tags (list), series and canonical_url (None if absent).
+    """
+    # Iterating a StringIO yields lines lazily, so the scan stops at the title
+    # instead of splitting the whole post first
+    return parse_metadata(io.StringIO(content), default_title=default_title)
@@ -0,0 +1,220 @@
+"""
+Module for timing the phases of a posting run and reporting its metrics.
+"""
+import functools
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from devto.session import get_request_stats
+from posting.state import write_json_atomic
+
+# Constants
+METRICS_FILE = "dev_posting_metrics.json"
+METRICS_PREFIX = "devto_posting"
+
+
+class RunMetrics:
+    """
+    Wall-clock phase spans, event counters and API totals of one posting run.
+
+    span(name) times a block and timed(name) a function. A phase that is
+    entered several times, from several threads, or inside another phase
+    (dedup runs inside selection) adds up its seconds and calls. The API
+    totals are the requests sent through the shared session since the
+    metrics were created, and sleeping is the rate-limiter wait plus any
+    waits reported with add_sleep().
+    """
+
+    def __init__(self, request_stats=None, prefix=METRICS_PREFIX, clock=time.perf_counter):
+        """
+        Initialize the RunMetrics class.
+
+        Args:
+            request_stats (RequestStats, optional): The request counters. Defaults to the shared session's.
+            prefix (str, optional): The Prometheus metric name prefix. Defaults to METRICS_PREFIX.
+            clock (callable, optional): Monotonic clock. Defaults to time.perf_counter.
+        """
+        self.request_stats = request_stats or get_request_stats()
+        self.prefix = prefix
+        self.clock = clock
+        self.started_at = datetime.now()
+        self.phases = {}
+        self.counters = {}
+        self.sleeps = {}
+        self._start = clock()
+        self._http_start = self.request_stats.snapshot()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time a block as a phase.
+
+        Args:
+            name (str): The phase name.
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            with self._lock:
+                phase = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+                phase["seconds"] += elapsed
+                phase["calls"] += 1
+
+    def timed(self, name):
+        """
+        Decorate a function so every call is timed as a phase.
+
+        Args:
+            name (str): The phase name.
+
+        Returns:
+            callable: The decorator.
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, value=1):
+        """
+        Add to an event counter.
+
+        Args:
+            name (str): The counter name.
+            value (int, optional): The amount to add. Defaults to 1.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_sleep(self, seconds, reason):
+        """
+        Report time spent waiting outside the API calls, e.g. for the state lock.
+
+        Args:
+            seconds (float): The seconds waited.
+            reason (str): What was waited for.
+        """
+        with self._lock:
+            self.sleeps[reason] = self.sleeps.get(reason, 0.0) + seconds
+
+    def report(self, exit_code=None):
+        """
+        Build the metrics report of the run so far.
+
+        Args:
+            exit_code (int, optional): The exit code of the run, if it has ended. Defaults to None.
+
+        Returns:
+            dict: started_at, finished_at, duration, exit_code, phases, counters, http and sleep.
+        """
+        current = self.request_stats.snapshot()
+        start = self._http_start
+        http = {key: current[key] - start[key] for key in current if key != "statuses"}
+        http["statuses"] = {
+            status: count - start["statuses"].get(status, 0)
+            for status, count in current["statuses"].items()
+            if count - start["statuses"].get(status, 0)
+        }
+
+        with self._lock:
+            sleep = dict(self.sleeps, rate_limit=http["rate_limit_wait"])
+            return {
+                "started_at": self.started_at.isoformat(),
+                "finished_at": datetime.now().isoformat(),
+                "duration": self.clock() - self._start,
+                "exit_code": exit_code,
+                "phases": {name: dict(phase) for name, phase in self.phases.items()},
+                "counters": dict(self.counters),
+                "http": http,
+                "sleep": {"total": sum(sleep.values()), **sleep},
+            }
+
+    def write_json(self, path=METRICS_FILE, exit_code=None):
+        """
+        Write the report as JSON.
+
+        Args:
+            path (str, optional): The metrics file. Defaults to METRICS_FILE.
+            exit_code (int, optional): The exit code of the run. Defaults to None.
+
+        Returns:
+            dict: The report written.
+        """
+        report = self.report(exit_code)
+        write_json_atomic(path, report, indent=2)
+        return report
+
+    def write_prometheus(self, path, exit_code=None, report=None):
+        """
+        Write the report in the Prometheus textfile-collector format.
+
+        Args:
+            path (str): The .prom file, usually in node_exporter's textfile directory.
+            exit_code (int, optional): The exit code of the run. Defaults to None.
+            report (dict, optional): A report already built. Defaults to a new one.
+        """
+        report = report or self.report(exit_code)
+        lines = []
+
+        def metric(name, help_text, samples):
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+                lines.append(f"{full_name}{{{label_text}}} {value}" if label_text else f"{full_name} {value}")
+
+        metric("run_timestamp_seconds", "Unix time the last run finished.", [({}, round(time.time(), 3))])
+        metric("run_duration_seconds", "Wall-clock seconds of the last run.", [({}, round(report["duration"], 6))])
+        if report["exit_code"] is not None:
+            metric("run_exit_code", "Exit code of the last run.", [({}, report["exit_code"])])
+        metric("phase_seconds", "Wall-clock seconds spent in each phase of the last run.",
+               [({"phase": name}, round(phase["seconds"], 6)) for name, phase in sorted(report["phases"].items())])
+        metric("phase_calls", "Times each phase was entered in the last run.",
+               [({"phase": name}, phase["calls"]) for name, phase in sorted(report["phases"].items())])
+        if report["counters"]:
+            metric("events", "Events counted in the last run.",
+                   [({"event": name}, value) for name, value in sorted(report["counters"].items())])
+
+        http = report["http"]
+        metric("api_requests", "DEV.to API requests sent in the last run.", [({}, http["requests"])])
+        metric("api_errors", "DEV.to API requests that got no response in the last run.", [({}, http["errors"])])
+        metric("api_bytes_sent", "Request body bytes sent to DEV.to in the last run.", [({}, http["bytes_sent"])])
+        metric("api_bytes_received", "Response body bytes received from DEV.to in the last run.", [({}, http["bytes_received"])])
+        metric("api_seconds", "Seconds spent in DEV.to API requests in the last run.", [({}, round(http["seconds"], 6))])
+        if http["statuses"]:
+            metric("api_responses", "DEV.to API responses by status code in the last run.",
+                   [({"status": status}, count) for status, count in sorted(http["statuses"].items())])
+        metric("sleep_seconds", "Seconds spent waiting (rate limiter, locks) in the last run.",
+               [({"reason": reason}, round(seconds, 6)) for reason, seconds in sorted(report["sleep"].items())
+                if reason != "total"])
+
+        # Written atomically so the collector never reads a partial file
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".prom", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _escape(value):
+    """
+    Escape a Prometheus label value.
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,60 @@
+"""
+Module for preparing a batch of posts concurrently ahead of posting them.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+# Constants
+DEFAULT_WORKERS = 4
+
+
+class PreparationPipeline:
+    """
+    Runs the per-post preparation (reading, title extraction, validation,
+    tag resolution, payload building) for a batch of posts in a worker pool.
+
+    Results are yielded in the order the posts were given, so the caller can
+    send each one through the rate-limited session while the posts after it
+    are still being prepared.
+    """
+
+    def __init__(self, prepare, workers=DEFAULT_WORKERS):
+        """
+        Initialize the PreparationPipeline class.
+
+        Args:
+            prepare (callable): Takes a blog post dict and returns its prepared form.
+            workers (int, optional): The number of worker threads. Defaults to DEFAULT_WORKERS.
+        """
+        self.prepare = prepare
+        self.workers = max(1, workers)
+
+    def run(self, blog_posts):
+        """
+        Prepare the posts concurrently.
+
+        Preparation errors are returned rather than raised, so one bad post
+        does not stop the batch. Posts not yet consumed when the caller stops
+        iterating are cancelled.
+
+        Args:
+            blog_posts (list): The blog posts to prepare.
+
+        Yields:
+            tuple: (blog_post, prepared, error), where exactly one of prepared and error is None.
+        """
+        if not blog_posts:
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.workers, len(blog_posts)),
+            thread_name_prefix="prepare"
+        )
+        try:
+            futures = [executor.submit(self.prepare, blog_post) for blog_post in blog_posts]
+            for blog_post, future in zip(blog_posts, futures):
+                try:
+                    yield blog_post, future.result(), None
+                except Exception as e:
+                    yield blog_post, None, e
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
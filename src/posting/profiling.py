@@ -0,0 +1,362 @@
+"""
+Module for profiling a command run: CPU (cProfile), sampled stacks, or memory (tracemalloc).
+"""
+import io
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# cProfile, pstats, subprocess and tracemalloc are imported by the profilers
+# that use them, so an unprofiled run does not pay for them at startup
+
+# Constants
+PROFILE_MODES = ("cpu", "sample", "memory")
+DEFAULT_PROFILE_MODE = "cpu"
+DEFAULT_TOP = 25
+SAMPLE_INTERVAL = 0.005         # seconds between stack samples (200 Hz)
+PYSPY_START_DELAY = 0.5         # seconds py-spy gets to attach before we fall back
+MEMORY_CHECK_INTERVAL = 0.05    # seconds between checks for a new memory peak
+MEMORY_PEAK_GROWTH = 1.05       # take a new snapshot once the peak grows by 5%
+TRACEMALLOC_FRAMES = 25
+
+
+def add_profile_arguments(parser, default_dir="."):
+    """
+    Add --profile and --profile-dir to a command-line parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+        default_dir (str, optional): Where profiles are written by default. Defaults to the working directory.
+    """
+    parser.add_argument(
+        "--profile", nargs="?", const=DEFAULT_PROFILE_MODE, choices=PROFILE_MODES,
+        help="Profile the run: cpu (cProfile, the default), sample (collapsed stacks) or memory (tracemalloc)"
+    )
+    parser.add_argument("--profile-dir", default=default_dir, help="Where the profile is written")
+
+
+@contextmanager
+def profiled(mode, output_dir=".", name="profile", top=DEFAULT_TOP):
+    """
+    Profile the enclosed block and write the result when it ends, even on an error or SIGTERM.
+
+    cpu writes <name>.pstats (for pstats, snakeviz, gprof2dot) and a text
+    summary <name>.txt of the functions with the most cumulative time.
+    sample writes <name>.folded, one "frame;frame;frame count" line per
+    stack, for flamegraph.pl or speedscope; py-spy is used when it is on
+    the PATH and can attach, otherwise a sampling thread. memory writes
+    <name>.memory.txt with the peak traced memory and the allocations by
+    call site at that peak, and the snapshot itself as <name>.tracemalloc.
+
+    Args:
+        mode (str): One of PROFILE_MODES, or None to run unprofiled.
+        output_dir (str, optional): Where the output is written. Defaults to the working directory.
+        name (str, optional): The output file name prefix. Defaults to "profile".
+        top (int, optional): Entries in the text reports. Defaults to DEFAULT_TOP.
+    """
+    if not mode:
+        yield
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of {', '.join(PROFILE_MODES)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, name)
+    profiler = {"cpu": _CpuProfiler, "sample": _StackSampler, "memory": _MemoryProfiler}[mode](base, top)
+
+    # A service stopped by systemd or Task Scheduler still writes its profile
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+    profiler.start()
+    try:
+        yield
+    finally:
+        try:
+            for path in profiler.stop():
+                print(f"Profile written to {path}")
+        except Exception as e:
+            print(f"Error writing the {mode} profile: {e}")
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+
+def _exit_on_sigterm(signum, frame):
+    """
+    Turn SIGTERM into SystemExit so the profile is written on the way out.
+    """
+    raise SystemExit(128 + signum)
+
+
+class _CpuProfiler:
+    """
+    Deterministic profile of every function call through cProfile.
+    """
+
+    def __init__(self, base, top):
+        """
+        Initialize the _CpuProfiler class.
+
+        Args:
+            base (str): The output path without extension.
+            top (int): Functions listed in the text summary.
+        """
+        import cProfile
+
+        self.base = base
+        self.top = top
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        """
+        Start profiling.
+        """
+        self.profile.enable()
+
+    def stop(self):
+        """
+        Stop profiling and write the stats and the summary.
+
+        Returns:
+            list: The files written.
+        """
+        import pstats
+
+        self.profile.disable()
+        stats_path = f"{self.base}.pstats"
+        self.profile.dump_stats(stats_path)
+
+        summary = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=summary)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        stats.sort_stats("tottime").print_stats(self.top)
+        text_path = f"{self.base}.txt"
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        return [stats_path, text_path]
+
+
+class _StackSampler:
+    """
+    Sampled call stacks in collapsed format, from py-spy or a sampling thread.
+    """
+
+    def __init__(self, base, top, interval=SAMPLE_INTERVAL):
+        """
+        Initialize the _StackSampler class.
+
+        Args:
+            base (str): The output path without extension.
+            top (int): Functions listed in the text summary.
+            interval (float, optional): Seconds between samples. Defaults to SAMPLE_INTERVAL.
+        """
+        self.path = f"{base}.folded"
+        self.summary_path = f"{base}.txt"
+        self.top = top
+        self.interval = interval
+        self.stacks = {}
+        self._process = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """
+        Start sampling, through py-spy if possible.
+        """
+        import shutil
+
+        if shutil.which("py-spy") and self._start_pyspy():
+            return
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def _start_pyspy(self):
+        """
+        Attach py-spy to this process; False if it is not allowed to (e.g. ptrace restrictions).
+        """
+        import subprocess
+
+        command = [
+            "py-spy", "record", "--pid", str(os.getpid()), "--format", "raw",
+            "--rate", str(int(1 / self.interval)), "--output", self.path, "--threads",
+        ]
+        try:
+            self._process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except OSError:
+            return False
+        time.sleep(PYSPY_START_DELAY)
+        if self._process.poll() is not None:
+            error = self._process.stderr.read().decode("utf-8", errors="replace").strip()
+            print(f"py-spy could not attach ({error or self._process.returncode}); sampling in-process instead")
+            self._process = None
+            return False
+        return True
+
+    def _sample(self):
+        """
+        Sampling loop: record the stack of every other thread each interval.
+        """
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def stop(self):
+        """
+        Stop sampling and write the collapsed stacks and a summary of the hottest functions.
+
+        Returns:
+            list: The files written.
+        """
+        if self._process is not None:
+            import subprocess
+
+            # py-spy writes its output when interrupted
+            self._process.send_signal(signal.SIGINT)
+            try:
+                self._process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        else:
+            self._stop.set()
+            self._thread.join()
+            with open(self.path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                    f.write(f"{stack} {count}\n")
+
+        self._write_summary()
+        return [self.path, self.summary_path]
+
+    def _write_summary(self):
+        """
+        Summarize the collapsed stacks: samples per function on top of the stack (self) and anywhere in it (total).
+        """
+        own = {}
+        total = {}
+        samples = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if not stack or not count.isdigit():
+                    continue
+                count = int(count)
+                samples += count
+                frames = stack.split(";")
+                own[frames[-1]] = own.get(frames[-1], 0) + count
+                for frame in set(frames):
+                    total[frame] = total.get(frame, 0) + count
+
+        lines = [f"{samples} samples", "", f"Top {self.top} by self samples:"]
+        for frame, count in sorted(own.items(), key=lambda item: -item[1])[:self.top]:
+            lines.append(f"{count:>8} {count / samples:6.1%}  {frame}")
+        lines += ["", f"Top {self.top} by total samples:"]
+        for frame, count in sorted(total.items(), key=lambda item: -item[1])[:self.top]:
+            lines.append(f"{count:>8} {count / samples:6.1%}  {frame}")
+        with open(self.summary_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class _MemoryProfiler:
+    """
+    Peak traced memory and the allocations by call site near that peak, through tracemalloc.
+    """
+
+    def __init__(self, base, top):
+        """
+        Initialize the _MemoryProfiler class.
+
+        Args:
+            base (str): The output path without extension.
+            top (int): Call sites listed in the report.
+        """
+        self.base = base
+        self.top = top
+        self.peak = 0
+        self.snapshot = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """
+        Start tracing allocations and watching for the peak.
+        """
+        import tracemalloc
+
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._thread = threading.Thread(target=self._watch, name="memory-peak", daemon=True)
+        self._thread.start()
+
+    def _watch(self):
+        """
+        Take a snapshot whenever the traced peak has grown, so the last one is close to the peak.
+        """
+        while not self._stop.wait(MEMORY_CHECK_INTERVAL):
+            self._snapshot_if_peak()
+
+    def _snapshot_if_peak(self):
+        """
+        Snapshot the traced allocations if they are MEMORY_PEAK_GROWTH above the last snapshot.
+        """
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        if current >= self.peak * MEMORY_PEAK_GROWTH and current > 0:
+            self.peak = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        """
+        Stop tracing and write the report and the snapshot.
+
+        Returns:
+            list: The files written.
+        """
+        import tracemalloc
+
+        self._stop.set()
+        self._thread.join()
+        self._snapshot_if_peak()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        snapshot = self.snapshot or tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        snapshot_path = f"{self.base}.tracemalloc"
+        snapshot.dump(snapshot_path)
+
+        lines = [
+            f"Peak traced memory: {traced_peak / 1024 / 1024:.2f} MiB",
+            f"Largest snapshot: {self.peak / 1024 / 1024:.2f} MiB",
+            "",
+            f"Top {self.top} call sites at the largest snapshot:",
+        ]
+        for index, stat in enumerate(snapshot.statistics("lineno")[:self.top], 1):
+            frame = stat.traceback[0]
+            lines.append(f"{index:>3}. {frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB in {stat.count} blocks")
+
+        lines += ["", "Tracebacks of the 3 largest:"]
+        for stat in snapshot.statistics("traceback")[:3]:
+            lines.append(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+            lines.extend(f"    {line}" for line in stat.traceback.format(limit=10, most_recent_first=True))
+
+        text_path = f"{self.base}.memory.txt"
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return [text_path, snapshot_path]
@@ -0,0 +1,84 @@
+"""
+Module for keeping file-backed data in memory and reloading it only when the file changes.
+"""
+import os
+
+
+def file_signature(path):
+    """
+    Get the modification time and size of a file.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        tuple: (mtime_ns, size), or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ReloadingFile:
+    """
+    A value loaded from a file and kept in memory until the file changes.
+
+    get() costs one stat while the file's mtime and size are unchanged. A
+    process that writes the file itself calls mark() afterwards, so its own
+    writes are not mistaken for outside edits.
+    """
+
+    def __init__(self, path, loader):
+        """
+        Initialize the ReloadingFile class.
+
+        Args:
+            path (str): The file to watch.
+            loader (callable): Loads and returns the value; called with no arguments.
+        """
+        self.path = path
+        self.loader = loader
+        self.value = None
+        self.loaded = False
+        self.reloads = 0
+        self._signature = None
+
+    def changed(self):
+        """
+        Check whether the file changed since it was last loaded or marked.
+
+        Returns:
+            bool: True if the value is stale (or was never loaded).
+        """
+        return not self.loaded or file_signature(self.path) != self._signature
+
+    def get(self):
+        """
+        Get the value, reloading it first if the file changed.
+
+        Returns:
+            The loaded value.
+        """
+        if self.changed():
+            signature = file_signature(self.path)
+            self.value = self.loader()
+            if self.loaded:
+                self.reloads += 1
+            self.loaded = True
+            # The signature from before the load, so a write during the load triggers another one
+            self._signature = signature
+        return self.value
+
+    def mark(self):
+        """
+        Accept the current file as matching the in-memory value (after writing it ourselves).
+        """
+        self._signature = file_signature(self.path)
+
+    def invalidate(self):
+        """
+        Force a reload at the next get().
+        """
+        self.loaded = False
@@ -0,0 +1,178 @@
+"""
+Module for scheduling posting retries across runs instead of sleeping.
+"""
+from datetime import datetime, timedelta
+
+# Constants
+DEFAULT_BASE_DELAY = 10            # seconds before the first retry
+DEFAULT_MAX_DELAY = 6 * 60 * 60    # cap on the exponential backoff
+DEFAULT_MAX_ATTEMPTS = 15
+
+
+class TransientPostingError(Exception):
+    """
+    A posting failure worth retrying later (rate limit, server error, network error).
+    """
+
+    def __init__(self, message, retry_after=None):
+        """
+        Initialize the TransientPostingError class.
+
+        Args:
+            message (str): What went wrong.
+            retry_after (float, optional): Seconds the server asked us to wait. Defaults to None.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RetryScheduler:
+    """
+    Keeps failed posting jobs in state["retry_queue"] with their next due time.
+
+    A run that fails to post records the job and exits straight away; the
+    next run (cron or a local scheduler loop) picks the job up once it is
+    due. Queue changes are journaled through the state store.
+    """
+
+    def __init__(self, store, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, clock=datetime.now):
+        """
+        Initialize the RetryScheduler class.
+
+        Args:
+            store (JsonStateStore): The state store used to journal queue changes.
+            base_delay (float, optional): Seconds before the first retry. Defaults to DEFAULT_BASE_DELAY.
+            max_delay (float, optional): Cap on the backoff in seconds. Defaults to DEFAULT_MAX_DELAY.
+            max_attempts (int, optional): Attempts before a job is dropped. Defaults to DEFAULT_MAX_ATTEMPTS.
+            clock (callable, optional): Returns the current datetime. Defaults to datetime.now.
+        """
+        self.store = store
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.clock = clock
+
+    def jobs(self, state):
+        """
+        Get every queued job.
+
+        Args:
+            state (dict): The posting state.
+
+        Returns:
+            list: The jobs, soonest first.
+        """
+        queue = state.get("retry_queue") or {}
+        return sorted(queue.values(), key=lambda job: job["next_attempt_at"])
+
+    def due(self, state):
+        """
+        Get the jobs whose retry time has passed.
+
+        Args:
+            state (dict): The posting state.
+
+        Returns:
+            list: The due jobs, soonest first.
+        """
+        now = self.clock().isoformat()
+        return [job for job in self.jobs(state) if job["next_attempt_at"] <= now]
+
+    def next_due_at(self, state):
+        """
+        Get the time the next job becomes due.
+
+        Args:
+            state (dict): The posting state.
+
+        Returns:
+            datetime: The due time of the soonest job, or None if the queue is empty.
+        """
+        jobs = self.jobs(state)
+        return datetime.fromisoformat(jobs[0]["next_attempt_at"]) if jobs else None
+
+    def next_delay(self, attempts, retry_after=None):
+        """
+        Compute the exponential backoff after a given number of failed attempts.
+
+        Args:
+            attempts (int): The number of failed attempts so far.
+            retry_after (float, optional): A server-requested minimum delay. Defaults to None.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = min(self.base_delay * (2 ** (attempts - 1)), self.max_delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def schedule(self, state, blog_post, error, retry_after=None):
+        """
+        Record a failed attempt and schedule the next one.
+
+        Args:
+            state (dict): The posting state.
+            blog_post (dict): The post that failed.
+            error (str): Why it failed.
+            retry_after (float, optional): A server-requested minimum delay. Defaults to None.
+
+        Returns:
+            dict: The scheduled job, or None if the job ran out of attempts and was dropped.
+        """
+        queue = dict(state.get("retry_queue") or {})
+        key = self._key(blog_post)
+        now = self.clock()
+
+        job = dict(queue.get(key) or {
+            "post": {k: blog_post[k] for k in ("path", "category", "topic", "title") if k in blog_post},
+            "attempts": 0,
+            "first_failed_at": now.isoformat(),
+        })
+        job["attempts"] += 1
+        job["last_error"] = str(error)
+
+        if job["attempts"] >= self.max_attempts:
+            queue.pop(key, None)
+            self.store.update(state, retry_queue=queue)
+            return None
+
+        job["next_attempt_at"] = (now + timedelta(seconds=self.next_delay(job["attempts"], retry_after))).isoformat()
+        queue[key] = job
+        self.store.update(state, retry_queue=queue)
+        return job
+
+    def queued(self, state, blog_post):
+        """
+        Check whether a post has a job in the queue.
+
+        Args:
+            state (dict): The posting state.
+            blog_post (dict): The post.
+
+        Returns:
+            bool: True if a retry of the post is scheduled.
+        """
+        return self._key(blog_post) in (state.get("retry_queue") or {})
+
+    def clear(self, state, blog_post):
+        """
+        Remove a post's job from the queue, e.g. after it was posted.
+
+        Args:
+            state (dict): The posting state.
+            blog_post (dict): The post.
+        """
+        queue = state.get("retry_queue") or {}
+        key = self._key(blog_post)
+        if key in queue:
+            queue = dict(queue)
+            del queue[key]
+            self.store.update(state, retry_queue=queue)
+
+    def _key(self, blog_post):
+        """
+        The queue key of a post (its separator-normalized path).
+        """
+        return blog_post["path"].replace("\\", "/")
@@ -0,0 +1,115 @@
+"""
+Module for the persisted, deterministic order in which posts are rotated.
+"""
+import bisect
+
+
+def post_id(blog_post):
+    """
+    Get the stable ID of a post: its category and topic directory names.
+
+    Args:
+        blog_post (dict): The blog post.
+
+    Returns:
+        str: The post ID, e.g. "10_ocr_text_recognition/01_ocr_technology".
+    """
+    return f"{blog_post['category']}/{blog_post['topic']}"
+
+
+class RotationPlan:
+    """
+    The posting order, persisted in state["rotation_plan"] as a sorted list of post IDs.
+
+    state["current_index"] is a cursor into the plan rather than into the
+    os.walk order of the content directory, so it points at the same post
+    on every machine and filesystem. The plan is built once and then
+    updated incrementally: added posts are inserted in order, removed posts
+    are dropped, and the cursor is moved so it keeps pointing at the same
+    upcoming post. state["rotation_version"] changes whenever the plan does.
+    """
+
+    def __init__(self, store):
+        """
+        Initialize the RotationPlan class.
+
+        Args:
+            store (JsonStateStore): The state store used to persist plan changes.
+        """
+        self.store = store
+
+    def sync(self, state, blog_posts):
+        """
+        Bring the plan up to date with the current posts.
+
+        Args:
+            state (dict): The posting state.
+            blog_posts (list): The blog posts, in any order.
+
+        Returns:
+            list: The blog posts in plan order; state["current_index"] indexes this list.
+        """
+        posts_by_id = {post_id(post): post for post in blog_posts}
+        plan = state.get("rotation_plan")
+
+        if plan is None:
+            # First build: carry the cursor over from the previous (os.walk) order
+            cursor = state.get("current_index", 0)
+            cursor_id = post_id(blog_posts[cursor]) if 0 <= cursor < len(blog_posts) else None
+            plan = sorted(posts_by_id)
+            cursor = plan.index(cursor_id) if cursor_id else 0
+            self.store.update(state, rotation_plan=plan, current_index=cursor,
+                              rotation_version=state.get("rotation_version", 0) + 1)
+            print(f"Built rotation plan with {len(plan)} posts")
+        else:
+            previous_plan = plan
+            plan, cursor = self._merge(plan, state.get("current_index", 0), posts_by_id)
+            if plan is not previous_plan:
+                self.store.update(state, rotation_plan=plan, current_index=cursor,
+                                  rotation_version=state.get("rotation_version", 0) + 1)
+
+        return [posts_by_id[pid] for pid in plan]
+
+    def next_post(self, state, ordered_posts):
+        """
+        Get the post at the cursor in O(1).
+
+        Args:
+            state (dict): The posting state.
+            ordered_posts (list): The blog posts in plan order, as returned by sync().
+
+        Returns:
+            dict: The post at the cursor, or None if there are no posts.
+        """
+        if not ordered_posts:
+            return None
+        cursor = state.get("current_index", 0)
+        return ordered_posts[cursor if 0 <= cursor < len(ordered_posts) else 0]
+
+    def _merge(self, plan, cursor, posts_by_id):
+        """
+        Apply added and removed posts to a plan, keeping the cursor on the same upcoming post.
+
+        Returns:
+            tuple: (plan, cursor)
+        """
+        current_ids = set(posts_by_id)
+        planned_ids = set(plan)
+        removed = planned_ids - current_ids
+        added = current_ids - planned_ids
+        if not removed and not added:
+            return plan, cursor
+
+        cursor_id = plan[cursor] if 0 <= cursor < len(plan) else None
+        plan = [pid for pid in plan if pid not in removed]
+        for pid in sorted(added):
+            bisect.insort(plan, pid)
+
+        if cursor_id is not None and plan:
+            # The same post, or the one after it if the upcoming post was removed
+            cursor = bisect.bisect_left(plan, cursor_id) % len(plan)
+        else:
+            cursor = 0
+
+        print(f"Updated rotation plan: {len(added)} added, {len(removed)} removed")
+        return plan, cursor
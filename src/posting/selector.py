@@ -0,0 +1,287 @@
+"""
+Module for category-balanced post selection with a persisted priority queue.
+"""
+import bisect
+import heapq
+import time
+from datetime import datetime
+
+from posting.rotation import post_id
+
+# Constants
+SECONDS_PER_DAY = 86400.0
+DEFAULT_RECENCY_WEIGHT = 1.0
+DEFAULT_AGE_WEIGHT = 0.25
+MIN_CATEGORY_WEIGHT = 0.01
+
+
+def _days(timestamp):
+    """
+    Convert an ISO timestamp to days since the epoch (0.0 if missing or invalid).
+    """
+    if not timestamp:
+        return 0.0
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp() / SECONDS_PER_DAY
+    except ValueError:
+        return 0.0
+
+
+class CategoryBalancedSelector:
+    """
+    Picks posts so that categories are interleaved instead of posted one after another.
+
+    Every category has a priority key; the category with the lowest key posts
+    next, taking the next post of its own rotation (its slice of the sorted
+    rotation plan). The key of a category is the pair
+
+        [pass, recency_weight * last_posted + age_weight * head_last_posted]
+
+    `pass` grows by 1 / category weight every time the category posts
+    (stride scheduling, so a category with weight 2 gets twice the turns)
+    and alone decides the order. The second term, in days, only breaks ties
+    between equal passes: `last_posted` is when the category last posted,
+    and `head_last_posted` is when its next post was last published (never
+    published counts as oldest). All of them only change when a post is
+    made, so the keys stay valid between runs and are kept in a heap
+    persisted in state["category_schedule"]. Picking a post is a heap pop, O(log n) in
+    the number of categories; the category list is only rebuilt when the
+    rotation plan changes.
+    """
+
+    def __init__(self, store, category_weights=None, recency_weight=DEFAULT_RECENCY_WEIGHT,
+                 age_weight=DEFAULT_AGE_WEIGHT, clock=time.time):
+        """
+        Initialize the CategoryBalancedSelector class.
+
+        Args:
+            store (JsonStateStore): The state store used to persist the schedule.
+            category_weights (dict, optional): Category (with or without its number prefix) to weight. Defaults to 1 for every category.
+            recency_weight (float, optional): Weight of the time since the category last posted. Defaults to DEFAULT_RECENCY_WEIGHT.
+            age_weight (float, optional): Weight of the time since the next post was last published. Defaults to DEFAULT_AGE_WEIGHT.
+            clock (callable, optional): Returns the current epoch time in seconds. Defaults to time.time.
+        """
+        self.store = store
+        self.category_weights = category_weights or {}
+        self.recency_weight = float(recency_weight)
+        self.age_weight = float(age_weight)
+        self.clock = clock
+        self._planned_cursors = {}
+
+    def weight(self, category):
+        """
+        Get the weight of a category.
+
+        Args:
+            category (str): The category directory name, e.g. "10_ocr_text_recognition".
+
+        Returns:
+            float: The configured weight, 1.0 by default.
+        """
+        name = category.split("_", 1)[1] if "_" in category else category
+        weight = self.category_weights.get(category, self.category_weights.get(name, 1.0))
+        try:
+            return max(float(weight), MIN_CATEGORY_WEIGHT)
+        except (TypeError, ValueError):
+            return 1.0
+
+    def sync(self, state, ordered_posts):
+        """
+        Make sure the schedule covers the categories of the current rotation plan.
+
+        Args:
+            state (dict): The posting state, with an up to date rotation plan.
+            ordered_posts (list): The blog posts in plan order.
+
+        Returns:
+            dict: The schedule (state["category_schedule"]).
+        """
+        schedule = state.get("category_schedule")
+        version = state.get("rotation_version", 0)
+        # Schedules written before the keys became [pass, tie-break] pairs are rebuilt
+        if (schedule and schedule.get("plan_version") == version
+                and all(isinstance(item[0], list) for item in schedule["heap"])):
+            return schedule
+
+        plan = state.get("rotation_plan") or []
+        previous = (schedule or {}).get("categories", {})
+        # New categories join at the current minimum pass so they neither jump the queue nor starve
+        base_pass = min((entry["pass"] for entry in previous.values()), default=0.0)
+
+        categories = {}
+        for category in sorted({pid.split("/", 1)[0] for pid in plan}):
+            categories[category] = previous.get(category) or {
+                "pass": base_pass,
+                "last_posted": 0.0,
+                "cursor": 0,
+                "version": 0,
+            }
+
+        heap = [
+            [self._key(state, ordered_posts, category, entry), category, entry["version"]]
+            for category, entry in categories.items()
+        ]
+        heapq.heapify(heap)
+
+        schedule = {"plan_version": version, "categories": categories, "heap": heap}
+        self.store.update(state, category_schedule=schedule)
+        return schedule
+
+    def candidates(self, state, ordered_posts, is_posted):
+        """
+        Lazily yield posts in category-balanced order without changing the schedule.
+
+        Each yielded post is treated as posted for the rest of the iteration,
+        so consecutive candidates come from different categories. Call
+        record_posted() for the ones that actually get posted, and
+        record_skipped() for the ones that failed for good.
+
+        Args:
+            state (dict): The posting state.
+            ordered_posts (list): The blog posts in plan order.
+            is_posted (callable): Returns True for a post that must be skipped as already posted.
+
+        Yields:
+            tuple: (index, post), index being the position in ordered_posts.
+        """
+        schedule = self.sync(state, ordered_posts)
+        categories = schedule["categories"]
+        heap = [item for item in schedule["heap"]
+                if item[1] in categories and item[2] == categories[item[1]]["version"]]
+        heapq.heapify(heap)
+
+        plan = state.get("rotation_plan") or []
+        now = self.clock() / SECONDS_PER_DAY
+        simulated = {}
+        self._planned_cursors = {}
+
+        while heap:
+            _, category, version = heapq.heappop(heap)
+            start, count = self._range(plan, category)
+            if not count:
+                continue
+
+            entry = categories[category]
+            local = simulated.setdefault(category, {
+                "cursor": entry["cursor"],
+                "pass": entry["pass"],
+                "last_posted": entry["last_posted"],
+                "scanned": 0,
+            })
+
+            while local["scanned"] < count:
+                index = start + local["cursor"] % count
+                local["cursor"] += 1
+                local["scanned"] += 1
+                blog_post = ordered_posts[index]
+                if is_posted(blog_post):
+                    continue
+
+                self._planned_cursors[post_id(blog_post)] = local["cursor"]
+                yield index, blog_post
+                local["pass"] += 1.0 / self.weight(category)
+                local["last_posted"] = now
+                break
+
+            if local["scanned"] < count:
+                heapq.heappush(heap, [self._key(state, ordered_posts, category, local), category, version])
+
+    def record_posted(self, state, ordered_posts, blog_post):
+        """
+        Update the schedule after a post was published and persist it.
+
+        Args:
+            state (dict): The posting state.
+            ordered_posts (list): The blog posts in plan order.
+            blog_post (dict): The published post.
+        """
+        schedule = state.get("category_schedule")
+        if not schedule or blog_post.get("category") not in schedule["categories"]:
+            return
+
+        category = blog_post["category"]
+        entry = schedule["categories"][category]
+        # Only move the cursor past posts that candidates() walked over; a post
+        # published out of turn (e.g. a retry) must not skip the ones in between
+        pid = post_id(blog_post)
+        if pid in self._planned_cursors:
+            entry["cursor"] = self._planned_cursors.pop(pid)
+        entry["pass"] += 1.0 / self.weight(category)
+        entry["last_posted"] = self.clock() / SECONDS_PER_DAY
+        self._reschedule(state, ordered_posts, schedule, category)
+
+    def record_skipped(self, state, ordered_posts, blog_post):
+        """
+        Move a category's cursor past a post that will not be posted and persist it.
+
+        For a post that failed for good (invalid content, a permanent 4xx, a
+        retry that ran out of attempts): the category keeps its pass, so it
+        stays next in line, but offers its following post instead of the
+        same one again. The post comes round again with the category's
+        rotation.
+
+        Args:
+            state (dict): The posting state.
+            ordered_posts (list): The blog posts in plan order.
+            blog_post (dict): The post that failed.
+        """
+        schedule = state.get("category_schedule")
+        if not schedule or blog_post.get("category") not in schedule["categories"]:
+            return
+
+        category = blog_post["category"]
+        entry = schedule["categories"][category]
+        pid = post_id(blog_post)
+        if pid in self._planned_cursors:
+            entry["cursor"] = self._planned_cursors.pop(pid)
+        else:
+            # A post picked outside candidates() (e.g. a dropped retry) only moves
+            # the cursor when it is the category's next post
+            start, count = self._range(state.get("rotation_plan") or [], category)
+            if not count or post_id(ordered_posts[start + entry["cursor"] % count]) != pid:
+                return
+            entry["cursor"] += 1
+        self._reschedule(state, ordered_posts, schedule, category)
+
+    def _reschedule(self, state, ordered_posts, schedule, category):
+        """
+        Push a category's new key onto the persisted heap after its entry changed, and persist the schedule.
+        """
+        entry = schedule["categories"][category]
+        entry["version"] += 1
+
+        heap = schedule["heap"]
+        heapq.heappush(heap, [self._key(state, ordered_posts, category, entry), category, entry["version"]])
+        if len(heap) > 2 * len(schedule["categories"]) + 16:
+            # Drop superseded entries now and then so the persisted heap stays small
+            heap[:] = [item for item in heap
+                       if item[1] in schedule["categories"] and item[2] == schedule["categories"][item[1]]["version"]]
+            heapq.heapify(heap)
+
+        self.store.update(state, category_schedule=schedule)
+
+    def _range(self, plan, category):
+        """
+        Find the slice of the sorted plan holding a category's posts.
+
+        Returns:
+            tuple: (start, count)
+        """
+        # IDs are "category/topic" and "/" sorts just before "0"
+        start = bisect.bisect_left(plan, f"{category}/")
+        end = bisect.bisect_left(plan, f"{category}0")
+        return start, end - start
+
+    def _key(self, state, ordered_posts, category, entry):
+        """
+        Compute the priority key of a category (lower posts sooner): its pass, then the time tie-break.
+        """
+        plan = state.get("rotation_plan") or []
+        start, count = self._range(plan, category)
+        head_last_posted = 0.0
+        if count:
+            head = ordered_posts[start + entry["cursor"] % count]
+            record = state["posted_articles"].find(path=head.get("path"))
+            if record:
+                head_last_posted = _days(record.get("posted_at"))
+        return [entry["pass"], self.recency_weight * entry["last_posted"] + self.age_weight * head_last_posted]
@@ -0,0 +1,340 @@
+"""
+Module for the posting state stored in an embedded SQLite database.
+"""
+import json
+import os
+import sqlite3
+
+from posting.locking import state_lock
+from posting.state import JsonStateStore, _path_key, default_state
+
+# Constants
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posted_articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT,
+    canonical_url TEXT,
+    dev_id,
+    posted_at TEXT,
+    title TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (path, posted_at)
+);
+CREATE INDEX IF NOT EXISTS idx_posted_articles_path ON posted_articles (path);
+CREATE INDEX IF NOT EXISTS idx_posted_articles_canonical_url ON posted_articles (canonical_url);
+CREATE INDEX IF NOT EXISTS idx_posted_articles_dev_id ON posted_articles (dev_id);
+CREATE INDEX IF NOT EXISTS idx_posted_articles_posted_at ON posted_articles (posted_at);
+CREATE TABLE IF NOT EXISTS state_fields (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+UPSERT_POSTED = """
+INSERT INTO posted_articles (path, canonical_url, dev_id, posted_at, title, data)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (path, posted_at) DO UPDATE SET
+    canonical_url = excluded.canonical_url,
+    dev_id = excluded.dev_id,
+    title = excluded.title,
+    data = excluded.data
+"""
+
+UPSERT_FIELD = """
+INSERT INTO state_fields (name, value) VALUES (?, ?)
+ON CONFLICT (name) DO UPDATE SET value = excluded.value
+"""
+
+
+def _row_values(entry):
+    """
+    Build the column values of a posted article record.
+    """
+    return (
+        _path_key(entry.get("path")) or None,
+        entry.get("canonical_url") or None,
+        entry.get("dev_id") or None,
+        entry.get("posted_at") or None,
+        entry.get("title"),
+        json.dumps(entry),
+    )
+
+
+class SqlitePostedArticles:
+    """
+    The state["posted_articles"] of a SQLite state: an indexed view of the
+    posted_articles table instead of an in-memory list.
+
+    It supports the read operations the posting scripts and health checks
+    use (find, contains, len, iteration and indexing, including negative
+    slices such as [-14:]) as indexed queries. Records are added through
+    the store, never through the view.
+    """
+
+    def __init__(self, conn):
+        """
+        Initialize the SqlitePostedArticles class.
+
+        Args:
+            conn (sqlite3.Connection): The state database connection.
+        """
+        self.conn = conn
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM posted_articles").fetchone()[0]
+
+    def __iter__(self):
+        for (data,) in self.conn.execute("SELECT data FROM posted_articles ORDER BY id"):
+            yield json.loads(data)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(self)[key] if key.step else self._slice(key.start, key.stop)
+        if key < 0:
+            key += len(self)
+        rows = self._slice(key, key + 1) if key >= 0 else []
+        if not rows:
+            raise IndexError("posted article index out of range")
+        return rows[0]
+
+    def _slice(self, start, stop):
+        """
+        Fetch a contiguous range of records with LIMIT/OFFSET.
+        """
+        length = len(self)
+        start, stop, _ = slice(start, stop).indices(length)
+        if stop <= start:
+            return []
+        rows = self.conn.execute(
+            "SELECT data FROM posted_articles ORDER BY id LIMIT ? OFFSET ?",
+            (stop - start, start)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def find(self, path=None, canonical_url=None, dev_id=None):
+        """
+        Find a posted article by path, canonical URL or Dev.to ID.
+
+        Args:
+            path (str, optional): The post path. Defaults to None.
+            canonical_url (str, optional): The canonical URL. Defaults to None.
+            dev_id (int, optional): The Dev.to article ID. Defaults to None.
+
+        Returns:
+            dict: The first matching record, or None.
+        """
+        for column, value in (("path", _path_key(path)), ("canonical_url", canonical_url), ("dev_id", dev_id)):
+            if not value:
+                continue
+            row = self.conn.execute(
+                f"SELECT data FROM posted_articles WHERE {column} = ? ORDER BY id LIMIT 1",
+                (value,)
+            ).fetchone()
+            if row:
+                return json.loads(row[0])
+        return None
+
+    def contains(self, path=None, canonical_url=None, dev_id=None):
+        """
+        Check whether an article has already been recorded as posted.
+
+        Args:
+            path (str, optional): The post path. Defaults to None.
+            canonical_url (str, optional): The canonical URL. Defaults to None.
+            dev_id (int, optional): The Dev.to article ID. Defaults to None.
+
+        Returns:
+            bool: True if any of the given keys is already recorded.
+        """
+        return self.find(path=path, canonical_url=canonical_url, dev_id=dev_id) is not None
+
+    def posted_since(self, since):
+        """
+        Get the articles posted at or after a given time.
+
+        Args:
+            since (str): An ISO timestamp.
+
+        Returns:
+            list: The matching records, oldest first.
+        """
+        rows = self.conn.execute(
+            "SELECT data FROM posted_articles WHERE posted_at >= ? ORDER BY posted_at",
+            (since,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+
+class SqliteStateStore:
+    """
+    Posting state persisted in an embedded SQLite database.
+
+    Drop-in alternative to JsonStateStore: load() returns the same state
+    dict, with state["posted_articles"] an indexed SqlitePostedArticles view.
+    Every append_posted/update/reset is its own transaction, so nothing is
+    lost between checkpoints; flush() only writes fields changed in place
+    (see mark_dirty) and checkpoints the write-ahead log into the database
+    file. SQLite locks individual writes itself; the state lock (see
+    posting.locking) is there for runs that must not overlap.
+    """
+
+    def __init__(self, state_file, read_only=False):
+        """
+        Initialize the SqliteStateStore class.
+
+        Args:
+            state_file (str): The SQLite database file.
+            read_only (bool, optional): Open the database read-only (health checks). Defaults to False.
+        """
+        self.state_file = state_file
+        self.read_only = read_only
+        self.lock = state_lock(state_file)
+        self.dirty = False
+        self.loaded_from = None
+        self._conn = None
+
+    @property
+    def conn(self):
+        """
+        The database connection, opened (and the schema created) on first use.
+        """
+        if self._conn is None:
+            if self.read_only:
+                self._conn = sqlite3.connect(f"file:{os.path.abspath(self.state_file)}?mode=ro", uri=True)
+            else:
+                self._conn = sqlite3.connect(self.state_file)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def load(self):
+        """
+        Load the scalar state fields and attach the posted articles view.
+
+        Returns:
+            dict: The posting state.
+        """
+        existed = os.path.exists(self.state_file)
+        state = default_state()
+        for name, value in self.conn.execute("SELECT name, value FROM state_fields"):
+            state[name] = json.loads(value)
+        state["posted_articles"] = SqlitePostedArticles(self.conn)
+
+        self.loaded_from = self.state_file if existed else None
+        self.dirty = not existed
+        return state
+
+    def append_posted(self, state, entry):
+        """
+        Record (upsert) a posted article in one transaction.
+
+        Args:
+            state (dict): The posting state.
+            entry (dict): The posted article record.
+        """
+        with self.conn:
+            self.conn.execute(UPSERT_POSTED, _row_values(entry))
+
+    def update(self, state, **fields):
+        """
+        Set top-level state fields in one transaction.
+
+        Args:
+            state (dict): The posting state.
+            **fields: The fields to set.
+        """
+        state.update(fields)
+        with self.conn:
+            self._write_fields(fields)
+
+    def reset(self, state, **fields):
+        """
+        Clear the posting history and set fields in one transaction.
+
+        Args:
+            state (dict): The posting state.
+            **fields: The fields to set after clearing.
+        """
+        state.update(fields)
+        with self.conn:
+            self.conn.execute("DELETE FROM posted_articles")
+            self._write_fields(fields)
+
+    def mark_dirty(self):
+        """
+        Note an in-place change that should be written at the next flush.
+        """
+        self.dirty = True
+
+    def flush(self, state, force=False):
+        """
+        Write in-place field changes and checkpoint the write-ahead log.
+
+        Args:
+            state (dict): The posting state.
+            force (bool, optional): Write even if nothing changed. Defaults to False.
+
+        Returns:
+            bool: True if the fields were written.
+        """
+        if not (self.dirty or force):
+            return False
+
+        with self.conn:
+            self._write_fields({name: value for name, value in state.items() if name != "posted_articles"})
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.dirty = False
+        return True
+
+    def import_state(self, state):
+        """
+        Replace the database contents with a loaded (JSON) state in one transaction.
+
+        Args:
+            state (dict): The posting state to import.
+
+        Returns:
+            int: The number of posted article records imported.
+        """
+        entries = list(state.get("posted_articles") or [])
+        with self.conn:
+            self.conn.execute("DELETE FROM posted_articles")
+            self.conn.execute("DELETE FROM state_fields")
+            self.conn.executemany(UPSERT_POSTED, (_row_values(entry) for entry in entries))
+            self._write_fields({name: value for name, value in state.items() if name != "posted_articles"})
+        return len(entries)
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _write_fields(self, fields):
+        """
+        Upsert top-level fields as JSON values (inside the caller's transaction).
+        """
+        self.conn.executemany(UPSERT_FIELD, ((name, json.dumps(value)) for name, value in fields.items()))
+
+
+def import_json_state(json_file, db_file, backup_file=None, journal_file=None):
+    """
+    Import an existing JSON state (snapshot, backup and journal) into a SQLite database.
+
+    Args:
+        json_file (str): The JSON state file.
+        db_file (str): The SQLite database file.
+        backup_file (str, optional): The JSON backup file. Defaults to None.
+        journal_file (str, optional): The JSON journal file. Defaults to the snapshot name with a .journal suffix.
+
+    Returns:
+        int: The number of posted article records imported.
+    """
+    state = JsonStateStore(json_file, backup_file=backup_file, journal_file=journal_file).load()
+    store = SqliteStateStore(db_file)
+    try:
+        return store.import_state(state)
+    finally:
+        store.close()
@@ -0,0 +1,442 @@
+"""
+Module for the posting state shared by the DEV.to posting scripts.
+"""
+import json
+import os
+import tempfile
+
+from posting.locking import state_lock
+
+# Constants
+STATE_BACKEND_ENV = "DEV_STATE_BACKEND"
+STATE_BACKENDS = ("json", "sqlite")
+DEFAULT_STATE_BACKEND = "json"
+
+
+def _path_key(path):
+    """
+    Normalize a post path so Windows and POSIX separators index the same post.
+
+    Args:
+        path (str): The post path as stored in the state.
+
+    Returns:
+        str: The normalized path.
+    """
+    return path.replace("\\", "/") if path else path
+
+
+class PostedArticles(list):
+    """
+    The list stored under state["posted_articles"], with hash indexes.
+
+    It serializes exactly like a plain list, but keeps indexes on path,
+    canonical URL and Dev.to ID in sync with every append so that
+    duplicate checks take O(1) regardless of the posting history size.
+    """
+
+    def __init__(self, entries=()):
+        """
+        Initialize the PostedArticles class.
+
+        Args:
+            entries (iterable, optional): Existing posted article records. Defaults to ().
+        """
+        super().__init__(entries)
+        self._reindex()
+
+    def append(self, entry):
+        super().append(entry)
+        self._index(entry)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def __iadd__(self, entries):
+        self.extend(entries)
+        return self
+
+    def insert(self, position, entry):
+        super().insert(position, entry)
+        self._index(entry)
+
+    def clear(self):
+        super().clear()
+        self._reindex()
+
+    def remove(self, entry):
+        super().remove(entry)
+        self._reindex()
+
+    def pop(self, *args):
+        entry = super().pop(*args)
+        self._reindex()
+        return entry
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._reindex()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._reindex()
+
+    def find(self, path=None, canonical_url=None, dev_id=None):
+        """
+        Find a posted article by path, canonical URL or Dev.to ID.
+
+        Args:
+            path (str, optional): The post path. Defaults to None.
+            canonical_url (str, optional): The canonical URL. Defaults to None.
+            dev_id (int, optional): The Dev.to article ID. Defaults to None.
+
+        Returns:
+            dict: The first matching record, or None.
+        """
+        if path and _path_key(path) in self._by_path:
+            return self._by_path[_path_key(path)]
+        if canonical_url and canonical_url in self._by_canonical_url:
+            return self._by_canonical_url[canonical_url]
+        if dev_id and dev_id in self._by_dev_id:
+            return self._by_dev_id[dev_id]
+        return None
+
+    def contains(self, path=None, canonical_url=None, dev_id=None):
+        """
+        Check whether an article has already been recorded as posted.
+
+        Args:
+            path (str, optional): The post path. Defaults to None.
+            canonical_url (str, optional): The canonical URL. Defaults to None.
+            dev_id (int, optional): The Dev.to article ID. Defaults to None.
+
+        Returns:
+            bool: True if any of the given keys is already recorded.
+        """
+        return self.find(path=path, canonical_url=canonical_url, dev_id=dev_id) is not None
+
+    def posted_since(self, since):
+        """
+        Get the articles posted at or after a given time.
+
+        Unlike the SQLite backend there is no index on posted_at, so this scans the records.
+
+        Args:
+            since (str): An ISO timestamp.
+
+        Returns:
+            list: The matching records, oldest first.
+        """
+        recent = [entry for entry in self if (entry.get("posted_at") or "") >= since]
+        return sorted(recent, key=lambda entry: entry["posted_at"])
+
+    def _index(self, entry):
+        """
+        Add a single record to the indexes.
+        """
+        if entry.get("path"):
+            self._by_path.setdefault(_path_key(entry["path"]), entry)
+        if entry.get("canonical_url"):
+            self._by_canonical_url.setdefault(entry["canonical_url"], entry)
+        if entry.get("dev_id"):
+            self._by_dev_id.setdefault(entry["dev_id"], entry)
+
+    def _reindex(self):
+        """
+        Rebuild every index from the current records.
+        """
+        self._by_path = {}
+        self._by_canonical_url = {}
+        self._by_dev_id = {}
+        for entry in self:
+            self._index(entry)
+
+
+def index_state(state):
+    """
+    Wrap the posted articles of a loaded state in an indexed PostedArticles list.
+
+    Args:
+        state (dict): The posting state as loaded from JSON.
+
+    Returns:
+        dict: The same state, with state["posted_articles"] indexed.
+    """
+    if not isinstance(state.get("posted_articles"), PostedArticles):
+        state["posted_articles"] = PostedArticles(state.get("posted_articles") or [])
+    return state
+
+
+def default_state():
+    """
+    Build an empty posting state.
+
+    Returns:
+        dict: A fresh, indexed posting state.
+    """
+    return index_state({
+        "last_post_time": "",
+        "posted_articles": [],
+        "current_index": 0,
+        "total_posts": 0
+    })
+
+
+def write_json_atomic(path, data, indent=None):
+    """
+    Write JSON to a temporary file and rename it over the target.
+
+    Readers therefore see either the previous file or the new one, never a
+    partially written file.
+
+    Args:
+        path (str): The destination file.
+        data: The JSON-serializable data.
+        indent (int, optional): JSON indentation. Defaults to None.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class JsonStateStore:
+    """
+    Posting state persisted as a JSON snapshot plus an append-only journal.
+
+    Changes are journaled as they happen (one small line each) and the
+    snapshot is only rewritten when flush() is called at a checkpoint, by
+    atomic rename. Loading replays the journal on top of the snapshot, so
+    an interrupted run loses nothing that was journaled.
+
+    Writes hold the exclusive state lock and loads try for a shared one
+    without waiting: the snapshot is replaced atomically and journal replay
+    is idempotent, so a reader that finds a writer busy reads unlocked
+    rather than block it.
+    """
+
+    def __init__(self, state_file, backup_file=None, journal_file=None):
+        """
+        Initialize the JsonStateStore class.
+
+        Args:
+            state_file (str): The JSON snapshot file.
+            backup_file (str, optional): A copy of the snapshot written at each flush. Defaults to None.
+            journal_file (str, optional): The journal file. Defaults to the snapshot name with a .journal suffix.
+        """
+        self.state_file = state_file
+        self.backup_file = backup_file
+        self.journal_file = journal_file or f"{os.path.splitext(state_file)[0]}.journal"
+        self.lock = state_lock(state_file)
+        self.dirty = False
+        self.loaded_from = None
+
+    def load(self):
+        """
+        Load the snapshot (falling back to the backup) and replay the journal.
+
+        Returns:
+            dict: The indexed posting state.
+        """
+        with self.lock.shared(timeout=0, required=False):
+            return self._load()
+
+    def _load(self):
+        """
+        Load the state without locking.
+        """
+        state = None
+        for path in (self.state_file, self.backup_file):
+            if not path or not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                self.loaded_from = path
+                break
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Error loading state file {path}: {e}")
+
+        if state is None:
+            state = default_state()
+            self.loaded_from = None
+            self.dirty = True
+        else:
+            index_state(state)
+            # Recovered from the backup: rewrite the primary at the next flush
+            self.dirty = self.loaded_from != self.state_file
+
+        replayed = self._replay(state)
+        if replayed:
+            print(f"Replayed {replayed} journaled state changes")
+            self.dirty = True
+        return state
+
+    def append_posted(self, state, entry):
+        """
+        Record a posted article and journal it immediately.
+
+        Args:
+            state (dict): The posting state.
+            entry (dict): The posted article record.
+        """
+        state["posted_articles"].append(entry)
+        self._journal({"op": "posted", "entry": entry})
+
+    def update(self, state, **fields):
+        """
+        Set top-level state fields and journal the change.
+
+        Args:
+            state (dict): The posting state.
+            **fields: The fields to set.
+        """
+        state.update(fields)
+        self._journal({"op": "set", "fields": fields})
+
+    def reset(self, state, **fields):
+        """
+        Clear the posting history, set fields and journal the reset.
+
+        Args:
+            state (dict): The posting state.
+            **fields: The fields to set after clearing.
+        """
+        state["posted_articles"].clear()
+        state.update(fields)
+        self._journal({"op": "reset", "fields": fields})
+
+    def mark_dirty(self):
+        """
+        Note an in-place change that should be written at the next flush.
+        """
+        self.dirty = True
+
+    def flush(self, state, force=False):
+        """
+        Write the snapshot (and backup) atomically and truncate the journal.
+
+        Args:
+            state (dict): The posting state.
+            force (bool, optional): Write even if nothing changed. Defaults to False.
+
+        Returns:
+            bool: True if the snapshot was written.
+        """
+        if not (self.dirty or force or os.path.exists(self.journal_file)):
+            return False
+
+        with self.lock.exclusive():
+            write_json_atomic(self.state_file, state, indent=2)
+            if self.backup_file:
+                write_json_atomic(self.backup_file, state, indent=2)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+        self.dirty = False
+        return True
+
+    def _journal(self, record):
+        """
+        Append a change record to the journal and sync it to disk.
+        """
+        self.dirty = True
+        with self.lock.exclusive(), open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _replay(self, state):
+        """
+        Apply journaled changes on top of a loaded snapshot.
+
+        Replay is idempotent, so a journal that survived a crash between the
+        snapshot rename and the journal truncation is harmless.
+
+        Returns:
+            int: The number of records applied.
+        """
+        if not os.path.exists(self.journal_file):
+            return 0
+
+        applied = 0
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append
+                    break
+
+                op = record.get("op")
+                if op == "posted":
+                    entry = record["entry"]
+                    existing = state["posted_articles"].find(path=entry.get("path"), dev_id=entry.get("dev_id"))
+                    if existing is None or existing.get("posted_at") != entry.get("posted_at"):
+                        state["posted_articles"].append(entry)
+                elif op == "set":
+                    state.update(record.get("fields", {}))
+                elif op == "reset":
+                    state["posted_articles"].clear()
+                    state.update(record.get("fields", {}))
+                else:
+                    continue
+                applied += 1
+        return applied
+
+
+def state_backend(backend=None):
+    """
+    Resolve the state backend name.
+
+    Args:
+        backend (str, optional): An explicit backend. Defaults to the DEV_STATE_BACKEND environment variable, else "json".
+
+    Returns:
+        str: "json" or "sqlite".
+    """
+    backend = (backend or os.environ.get(STATE_BACKEND_ENV) or DEFAULT_STATE_BACKEND).lower()
+    if backend not in STATE_BACKENDS:
+        print(f"Unknown state backend '{backend}', using {DEFAULT_STATE_BACKEND}")
+        backend = DEFAULT_STATE_BACKEND
+    return backend
+
+
+def open_state_store(state_file, backup_file=None, journal_file=None, backend=None, read_only=False):
+    """
+    Open the posting state store for the configured backend.
+
+    The SQLite database lives next to the JSON file with a .db suffix. The
+    first time it is opened, the existing JSON state (snapshot, backup and
+    journal) is imported into it.
+
+    Args:
+        state_file (str): The JSON state file.
+        backup_file (str, optional): The JSON backup file. Defaults to None.
+        journal_file (str, optional): The JSON journal file. Defaults to None.
+        backend (str, optional): "json" or "sqlite". Defaults to state_backend().
+        read_only (bool, optional): Open a SQLite database read-only. Defaults to False.
+
+    Returns:
+        JsonStateStore or SqliteStateStore: The state store.
+    """
+    if state_backend(backend) == "json":
+        return JsonStateStore(state_file, backup_file=backup_file, journal_file=journal_file)
+
+    # Imported here because the SQLite store builds on this module
+    from posting.sqlite_state import SqliteStateStore, import_json_state
+
+    db_file = f"{os.path.splitext(state_file)[0]}.db"
+    if not os.path.exists(db_file) and not read_only:
+        if any(path and os.path.exists(path) for path in (state_file, backup_file)):
+            imported = import_json_state(state_file, db_file, backup_file=backup_file, journal_file=journal_file)
+            print(f"Imported {imported} posted articles from {state_file} into {db_file}")
+    return SqliteStateStore(db_file, read_only=read_only)
@@ -0,0 +1,126 @@
+"""
+Module for computing posting times from the weekday and weekend timetables.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+# Constants
+WEEKEND_DAYS = (5, 6)       # Saturday and Sunday (Monday=0)
+MAX_SLEEP = 60 * 60         # re-check the wall clock at least hourly (suspend, clock changes)
+
+
+def parse_times(times):
+    """
+    Parse "HH:MM" strings.
+
+    Args:
+        times (list): Times of day such as ["13:00", "18:30"].
+
+    Returns:
+        list: Sorted (hour, minute) tuples; invalid entries are skipped.
+    """
+    parsed = set()
+    for value in times or []:
+        try:
+            hour, minute = (int(part) for part in str(value).split(":", 1))
+        except ValueError:
+            print(f"Ignoring invalid time '{value}'")
+            continue
+        if 0 <= hour < 24 and 0 <= minute < 60:
+            parsed.add((hour, minute))
+        else:
+            print(f"Ignoring invalid time '{value}'")
+    return sorted(parsed)
+
+
+class PostingTimetable:
+    """
+    The posting slots of a week: the weekday times Monday to Friday and the
+    weekend times on Saturday and Sunday, in local time.
+
+    Instead of polling a job list every minute, the caller asks for the next
+    run time and sleeps until then. The random post delay is applied as an
+    offset to the slot time when the run is scheduled, so nothing blocks
+    after a post.
+    """
+
+    def __init__(self, weekday_times, weekend_times, jitter_min=0, jitter_max=0, rng=None):
+        """
+        Initialize the PostingTimetable class.
+
+        Args:
+            weekday_times (list): "HH:MM" times for Monday to Friday.
+            weekend_times (list): "HH:MM" times for Saturday and Sunday.
+            jitter_min (float, optional): Minimum offset added to a slot, in seconds. Defaults to 0.
+            jitter_max (float, optional): Maximum offset added to a slot, in seconds. Defaults to 0.
+            rng (random.Random, optional): Source of the offsets. Defaults to the random module.
+        """
+        self.weekday_times = parse_times(weekday_times)
+        self.weekend_times = parse_times(weekend_times)
+        self.jitter_min = max(0, jitter_min)
+        self.jitter_max = max(self.jitter_min, jitter_max)
+        self.rng = rng or random
+
+    def times_for(self, day):
+        """
+        Get the slot times of a date.
+
+        Args:
+            day (date): The date.
+
+        Returns:
+            list: (hour, minute) tuples.
+        """
+        return self.weekend_times if day.weekday() in WEEKEND_DAYS else self.weekday_times
+
+    def next_slot(self, after):
+        """
+        Find the first slot strictly after a given time.
+
+        Args:
+            after (datetime): The reference time.
+
+        Returns:
+            datetime: The next slot, or None if the timetable is empty.
+        """
+        for offset in range(8):
+            day = (after + timedelta(days=offset)).date()
+            for hour, minute in self.times_for(day):
+                slot = datetime(day.year, day.month, day.day, hour, minute)
+                if slot > after:
+                    return slot
+        return None
+
+    def next_run(self, after):
+        """
+        Schedule the next run: the next slot plus a random offset.
+
+        Args:
+            after (datetime): The reference time, normally the previous slot.
+
+        Returns:
+            tuple: (slot, run_at) datetimes, or (None, None) if the timetable is empty.
+        """
+        slot = self.next_slot(after)
+        if slot is None:
+            return None, None
+        offset = self.rng.uniform(self.jitter_min, self.jitter_max)
+        return slot, slot + timedelta(seconds=offset)
+
+
+def sleep_until(when, sleep=time.sleep, clock=datetime.now):
+    """
+    Sleep until a given local time, waking at least every MAX_SLEEP seconds
+    so a suspended machine or a clock change cannot make the sleep overshoot.
+
+    Args:
+        when (datetime): The time to wake up.
+        sleep (callable, optional): Sleep function. Defaults to time.sleep.
+        clock (callable, optional): Returns the current datetime. Defaults to datetime.now.
+    """
+    while True:
+        remaining = (when - clock()).total_seconds()
+        if remaining <= 0:
+            return
+        sleep(min(remaining, MAX_SLEEP))
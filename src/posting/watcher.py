@@ -0,0 +1,312 @@
+"""
+Module for watching the blog content directory and keeping the content manifest live.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from posting.manifest import POST_FILENAME
+
+# Constants
+DEFAULT_POLL_INTERVAL = 30      # seconds between full rescans when inotify is unavailable
+DEBOUNCE_DELAY = 0.5            # seconds to wait for a burst of events (an editor save, a git checkout) to settle
+READ_BUFFER_SIZE = 64 * 1024
+
+# inotify(7) event bits
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+LISTING_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """
+    Minimal inotify(7) binding through ctypes: one descriptor, many directory watches.
+    """
+
+    def __init__(self):
+        """
+        Initialize the Inotify class.
+
+        Raises:
+            OSError: If inotify is not available on this system.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("libc has no inotify support")
+
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.paths = {}     # watch descriptor -> directory
+        self.watches = {}   # directory -> watch descriptor
+
+    def add_watch(self, path):
+        """
+        Watch a directory (re-adding an existing watch is harmless).
+
+        Args:
+            path (str): The directory.
+
+        Returns:
+            bool: True if the directory is watched.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False
+        self.paths[wd] = path
+        self.watches[path] = wd
+        return True
+
+    def remove_watch(self, path):
+        """
+        Stop watching a directory.
+
+        Args:
+            path (str): The directory.
+        """
+        wd = self.watches.pop(path, None)
+        if wd is not None:
+            self.paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout):
+        """
+        Wait for events and read every one that is queued.
+
+        Args:
+            timeout (float): Seconds to wait for the first event; None waits forever.
+
+        Returns:
+            list: (directory, name, mask) tuples; directory is None for a queue overflow.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_BUFFER_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                directory = self.paths.get(wd)
+                if mask & IN_IGNORED:
+                    # The kernel dropped the watch (directory deleted or unmounted)
+                    self.paths.pop(wd, None)
+                    if directory is not None and self.watches.get(directory) == wd:
+                        del self.watches[directory]
+                    continue
+                events.append((directory, name, mask))
+        return events
+
+    def close(self):
+        """
+        Close the inotify descriptor and drop every watch.
+        """
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self.paths = {}
+        self.watches = {}
+
+
+class ContentWatcher:
+    """
+    Keeps a ContentManifest up to date from a background thread.
+
+    On Linux the content directory tree is watched with inotify: added,
+    removed and renamed directories trigger an incremental refresh (only
+    the changed directories are relisted), and a written blog_post.md is
+    rescanned on its own. Elsewhere, or when inotify cannot be set up, the
+    tree is rescanned every poll_interval seconds instead. Readers call
+    posts() and compare version to notice changes; neither touches the disk.
+    """
+
+    def __init__(self, manifest, poll_interval=DEFAULT_POLL_INTERVAL, use_inotify=True):
+        """
+        Initialize the ContentWatcher class.
+
+        Args:
+            manifest (ContentManifest): The manifest to keep up to date.
+            poll_interval (float, optional): Seconds between rescans when polling. Defaults to DEFAULT_POLL_INTERVAL.
+            use_inotify (bool, optional): Try inotify before falling back to polling. Defaults to True.
+        """
+        self.manifest = manifest
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend = None
+        self.version = 0
+        self.lock = threading.Lock()
+        self._inotify = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._posts = []
+        self._rescan_at = None
+
+    def start(self):
+        """
+        Load and refresh the manifest, then start watching in a daemon thread.
+
+        Returns:
+            str: The backend in use, "inotify" or "poll".
+        """
+        self.manifest.load()
+        if self.use_inotify:
+            try:
+                self._inotify = Inotify()
+            except OSError as e:
+                print(f"inotify unavailable ({e}), polling {self.manifest.blog_dir} every {self.poll_interval}s")
+                self._inotify = None
+
+        # Watch before the first scan so nothing created in between is missed
+        if self._inotify is not None:
+            self._inotify.add_watch(self.manifest.blog_dir)
+        self._apply(full=True)
+
+        self.backend = "inotify" if self._inotify is not None else "poll"
+        target = self._watch if self._inotify is not None else self._poll
+        self._thread = threading.Thread(target=target, name="content-watcher", daemon=True)
+        self._thread.start()
+        return self.backend
+
+    def stop(self):
+        """
+        Stop the watcher thread and release the inotify descriptor.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def posts(self):
+        """
+        Get the current blog posts without touching the disk.
+
+        Returns:
+            tuple: (version, posts); version changes whenever the posts do.
+        """
+        with self.lock:
+            return self.version, list(self._posts)
+
+    def _poll(self):
+        """
+        Polling loop: rescan the whole tree every poll_interval seconds.
+        """
+        while not self._stop.wait(self.poll_interval):
+            self._apply(full=True)
+
+    def _watch(self):
+        """
+        inotify loop: collect a burst of events, then apply them in one refresh.
+        """
+        while not self._stop.is_set():
+            # Wake up now and then to notice stop()
+            events = self._inotify.read_events(1.0)
+            if not events:
+                # A refresh that failed is retried here if no event triggers one first
+                if self._rescan_at is not None and time.monotonic() >= self._rescan_at:
+                    self._apply(full=True)
+                continue
+            while True:
+                more = self._inotify.read_events(DEBOUNCE_DELAY)
+                if not more:
+                    break
+                events.extend(more)
+
+            full = False
+            listing_changed = False
+            edited = set()
+            for directory, name, mask in events:
+                if directory is None or mask & IN_Q_OVERFLOW:
+                    # Events were lost; only a full rescan is safe
+                    full = True
+                elif mask & LISTING_EVENTS:
+                    listing_changed = True
+                elif name == POST_FILENAME:
+                    edited.add(os.path.join(directory, name))
+            self._apply(full=full, refresh=listing_changed, edited=edited)
+
+    def _apply(self, full=False, refresh=True, edited=()):
+        """
+        Bring the manifest up to date, persist it and publish the new posts.
+
+        If the tree changes under the scan (a directory or post removed between
+        its stat and its listing), the error is reported and a full rescan is
+        scheduled, so the watcher thread keeps running.
+        """
+        full = full or self._rescan_at is not None
+        try:
+            changed = False
+            if full or refresh:
+                changed = self.manifest.refresh(full=full)
+            for post_path in edited:
+                if self.manifest.refresh_post(post_path):
+                    changed = True
+
+            # Posts created in a new directory before its watch was added are found by one more pass
+            if self._inotify is not None and self._sync_watches():
+                if self.manifest.refresh():
+                    changed = True
+
+            if changed or not self.version:
+                self.manifest.save()
+                posts = self.manifest.posts()
+                with self.lock:
+                    self._posts = posts
+                    self.version += 1
+        except OSError as e:
+            print(f"Error refreshing the content manifest, scheduling a full rescan: {e}")
+            self._rescan_at = time.monotonic() + self.poll_interval
+            return
+        self._rescan_at = None
+
+    def _sync_watches(self):
+        """
+        Watch every directory in the manifest and drop watches on directories that are gone.
+
+        Returns:
+            int: The number of watches added.
+        """
+        directories = set(self.manifest.directories())
+        for path in list(self._inotify.watches):
+            if path not in directories:
+                self._inotify.remove_watch(path)
+        added = 0
+        for path in directories:
+            if path not in self._inotify.watches and self._inotify.add_watch(path):
+                added += 1
+        return added
@@ -37,7 +37,7 @@ def main():
     print(f"Found {len(blog_posts)} blog posts")
 
     # Get the next blog post to publish
-    next_post = get_next_blog_post(blog_posts, state)
+    next_post = get_next_blog_post(blog_posts, state, config)
     if not next_post:
         print("Error: No blog post available to publish")
         sys.exit(1)